@@ -0,0 +1,112 @@
+import logging
+from dataclasses import fields
+from datetime import datetime
+from types import UnionType
+from typing import Any, Callable, Dict, Tuple
+from uuid import UUID
+
+from ...domain.bookings.booking.booking_events import (
+    BookingCancelledEvent,
+    BookingCompletedEvent,
+    BookingConfirmedEvent,
+    BookingRescheduledEvent,
+)
+from ...domain.bookings.payment.booking_payment_events import (
+    BookingPaymentFailedEvent,
+    BookingPaymentPaidEvent,
+    BookingPaymentRefundedEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+# Преобразования строковых значений из JSON-сообщений в исходные типы полей
+_LEGACY_CONVERTERS: Dict[type, Callable[[str], Any]] = {
+    UUID: UUID,
+    datetime: datetime.fromisoformat,
+}
+
+
+class EventDecoder:
+    """
+    Декодер одного класса событий, собираемый один раз при регистрации
+
+    Бинарный сериализатор уже восстанавливает UUID и datetime, поэтому основной путь —
+    прямой вызов конструктора. Список преобразуемых полей для JSON-сообщений
+    вычисляется заранее, а не при каждом декодировании
+    """
+
+    __slots__ = ("event_class", "_legacy_converters")
+
+    def __init__(self, event_class: type):
+        self.event_class = event_class
+        self._legacy_converters: Tuple[Tuple[str, Callable[[str], Any]], ...] = tuple(
+            (field.name, converter)
+            for field in fields(event_class)
+            if (converter := self._find_converter(field.type)) is not None
+        )
+
+    @staticmethod
+    def _find_converter(field_type: Any) -> Callable[[str], Any] | None:
+        """Поиск преобразования для типа поля, включая Optional-типы вида `UUID | None`"""
+        candidates = field_type.__args__ if isinstance(field_type, UnionType) else (field_type,)
+        for candidate in candidates:
+            if candidate in _LEGACY_CONVERTERS:
+                return _LEGACY_CONVERTERS[candidate]
+        return None
+
+    def __call__(self, data: Dict[str, Any]):
+        """Восстановление события из уже типизированных данных"""
+        return self.event_class(**data)
+
+    def from_legacy_json(self, data: Dict[str, Any]):
+        """Восстановление события из JSON-данных, где UUID и datetime переданы строками"""
+        kwargs = dict(data)
+        for name, converter in self._legacy_converters:
+            value = kwargs.get(name)
+            if isinstance(value, str):
+                kwargs[name] = converter(value)
+        return self.event_class(**kwargs)
+
+
+class EventRegistry:
+    """
+    Явный реестр типов доменных событий, передаваемых между процессами
+
+    Ключ — имя класса события (поле `event_type` в сообщении)
+    """
+
+    _decoders: Dict[str, EventDecoder] = {}
+
+    @classmethod
+    def register(cls, event_class: type) -> type:
+        """Регистрация класса события и сборка его декодера"""
+        event_type = event_class.__name__
+        registered = cls._decoders.get(event_type)
+        if registered is not None and registered.event_class is not event_class:
+            raise ValueError(f"Тип события уже зарегистрирован другим классом: {event_type}")
+
+        cls._decoders[event_type] = EventDecoder(event_class)
+        logger.debug(f"✅ Зарегистрирован тип события {event_type}")
+        return event_class
+
+    @classmethod
+    def get_decoder(cls, event_type: str) -> EventDecoder:
+        """Получение декодера по имени типа события (KeyError для неизвестных типов)"""
+        return cls._decoders[event_type]
+
+    @classmethod
+    def decode(cls, event_type: str, data: Dict[str, Any]):
+        """Восстановление объекта события из словаря с данными"""
+        return cls._decoders[event_type](data)
+
+
+for _event_class in (
+    BookingConfirmedEvent,
+    BookingCancelledEvent,
+    BookingCompletedEvent,
+    BookingRescheduledEvent,
+    BookingPaymentPaidEvent,
+    BookingPaymentFailedEvent,
+    BookingPaymentRefundedEvent,
+):
+    EventRegistry.register(_event_class)
@@ -0,0 +1,98 @@
+"""
+Стоимость записи события аналитики: запись в файл на каждое событие против буфера
+
+Также измеряется скорость агрегата count_events по записанным файлам.
+
+Запуск: python -m prod.benchmarks.analytics_sink_benchmark [--events N] [--studios N]
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+from ..infrastructure.analytics.analytics_query import count_events
+from ..infrastructure.analytics.analytics_sink import AnalyticsSink, partition_path
+from ..infrastructure.celery.event_serializer import dumps
+
+
+def _make_events(events_count: int, studios_count: int) -> list:
+    studios = [uuid4() for _ in range(studios_count)]
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "event_type": "BookingConfirmedEvent",
+            "event_id": uuid4(),
+            "occurred_at": now,
+            "data": {
+                "booking_id": uuid4(),
+                "studio_id": studios[i % studios_count],
+                "client_id": uuid4(),
+                "time_range_start": now + timedelta(days=2),
+                "time_range_end": now + timedelta(days=2, hours=2),
+            },
+        }
+        for i in range(events_count)
+    ]
+
+
+def _write_per_event(base_dir: Path, events: list) -> float:
+    """Прежний подход: одна запись в файл партиции на событие"""
+    started = time.perf_counter()
+    for event_data in events:
+        data = event_data["data"]
+        path = partition_path(
+            base_dir, event_data["occurred_at"].strftime("%Y-%m-%d"), str(data["studio_id"]), "bench"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as partition:
+            partition.write(
+                dumps(
+                    [
+                        event_data["event_type"],
+                        event_data["event_id"],
+                        event_data["occurred_at"],
+                        dumps(data),
+                    ]
+                )
+            )
+    return time.perf_counter() - started
+
+
+def _write_buffered(base_dir: Path, events: list, flush_events: int) -> float:
+    sink = AnalyticsSink(str(base_dir), flush_events=flush_events, flush_interval=60)
+    started = time.perf_counter()
+    for event_data in events:
+        sink.record(event_data["event_type"], event_data)
+    sink.flush()
+    return time.perf_counter() - started
+
+
+def run(events_count: int, studios_count: int, flush_events: int) -> None:
+    events = _make_events(events_count, studios_count)
+    today = datetime.now(timezone.utc).date()
+
+    with tempfile.TemporaryDirectory() as per_event_dir, tempfile.TemporaryDirectory() as buffered_dir:
+        per_event = _write_per_event(Path(per_event_dir), events)
+        buffered = _write_buffered(Path(buffered_dir), events, flush_events)
+
+        started = time.perf_counter()
+        counts = count_events(today, today, base_dir=buffered_dir)
+        query = time.perf_counter() - started
+        assert sum(counts.values()) == events_count
+
+    print(f"{'запись':<24}{'мкс/событие':>14}{'событий/с':>14}")
+    for name, elapsed in (("файл на событие", per_event), (f"буфер ({flush_events})", buffered)):
+        print(f"{name:<24}{elapsed * 1_000_000 / events_count:>14.1f}{events_count / elapsed:>14.0f}")
+    print(f"\ncount_events по {events_count} событиям: {query * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--studios", type=int, default=50)
+    parser.add_argument("--flush-events", type=int, default=1000)
+    args = parser.parse_args()
+    run(args.events, args.studios, args.flush_events)
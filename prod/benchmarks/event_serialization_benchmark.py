@@ -0,0 +1,100 @@
+"""
+Сравнение JSON-пути сериализации доменных событий с бинарным сериализатором
+
+Запуск: python -m prod.benchmarks.event_serialization_benchmark [--iterations N]
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from ..domain.bookings.booking.booking_events import BookingConfirmedEvent
+from ..infrastructure.celery import event_serializer
+
+
+def _make_event() -> BookingConfirmedEvent:
+    start = datetime(2025, 11, 25, 15, 0, tzinfo=timezone.utc)
+    return BookingConfirmedEvent(
+        occurred_at=datetime.now(timezone.utc),
+        booking_id=uuid4(),
+        studio_id=uuid4(),
+        client_id=uuid4(),
+        time_range_start=start,
+        time_range_end=start + timedelta(hours=2),
+    )
+
+
+def _json_encode(event) -> bytes:
+    """Прежний путь: строковые UUID и ISO-даты внутри JSON"""
+    data = {
+        key: str(value) if isinstance(value, UUID) else value.isoformat()
+        for key, value in event.__dict__.items()
+    }
+    event_data = {
+        "event_type": event.__class__.__name__,
+        "event_id": data["event_id"],
+        "occurred_at": data["occurred_at"],
+        "data": data,
+    }
+    return json.dumps(event_data).encode("utf-8")
+
+
+def _json_decode(payload: bytes) -> dict:
+    """Прежний путь: разбор JSON и восстановление UUID/datetime из строк"""
+    event_data = json.loads(payload)
+    data = event_data["data"]
+    for key in ("event_id", "booking_id", "studio_id", "client_id"):
+        data[key] = UUID(data[key])
+    for key in ("occurred_at", "time_range_start", "time_range_end"):
+        data[key] = datetime.fromisoformat(data[key])
+    return event_data
+
+
+def _binary_encode(event) -> bytes:
+    event_data = {
+        "event_type": event.__class__.__name__,
+        "event_id": event.event_id,
+        "occurred_at": event.occurred_at,
+        "data": event.__dict__,
+    }
+    return event_serializer.dumps(event_data)
+
+
+def _binary_decode(payload: bytes) -> dict:
+    return event_serializer.loads(payload)
+
+
+def _per_call_us(func, arg, iterations: int) -> float:
+    total = min(timeit.repeat(lambda: func(arg), number=iterations, repeat=5))
+    return total / iterations * 1_000_000
+
+
+def run(iterations: int) -> None:
+    event = _make_event()
+
+    json_payload = _json_encode(event)
+    binary_payload = _binary_encode(event)
+
+    # Оба пути должны восстанавливать одинаковые данные
+    assert _json_decode(json_payload)["data"] == _binary_decode(binary_payload)["data"]
+
+    rows = [
+        ("json", len(json_payload), _json_encode, _json_decode, json_payload),
+        ("event-msgpack", len(binary_payload), _binary_encode, _binary_decode, binary_payload),
+    ]
+
+    print(f"{'формат':<15}{'байт':>8}{'encode, мкс':>14}{'decode, мкс':>14}")
+    for name, size, encode, decode, payload in rows:
+        encode_us = _per_call_us(encode, event, iterations)
+        decode_us = _per_call_us(decode, payload, iterations)
+        print(f"{name:<15}{size:>8}{encode_us:>14.2f}{decode_us:>14.2f}")
+
+    print(f"\nРазмер полезной нагрузки: -{100 - len(binary_payload) * 100 / len(json_payload):.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    run(parser.parse_args().iterations)
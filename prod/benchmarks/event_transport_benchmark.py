@@ -0,0 +1,140 @@
+"""
+Пропускная способность доставки доменных событий: Celery против Redis Streams
+
+Требует локальный redis-server, указанный в .env (REDIS_* и CELERY_BROKER_URL).
+Запускать только на локальном Redis: бенчмарк пишет в брокер и поток событий.
+
+Запуск: python -m prod.benchmarks.event_transport_benchmark [--events N] [--batch-size N]
+"""
+
+import argparse
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from ..application.services.event_bus import EventBus
+from ..domain.bookings.booking.booking_events import BookingConfirmedEvent
+from ..infrastructure.redis_client import create_redis_connection
+
+_BENCH_STREAM = "bench:events:stream"
+_BENCH_GROUP = "bench-event-handlers"
+
+
+class _Counter:
+    """Подписчик EventBus, отмечающий момент обработки последнего события"""
+
+    def __init__(self):
+        self.expected = 0
+        self.handled = 0
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def reset(self, expected: int) -> None:
+        self.expected, self.handled = expected, 0
+        self.done.clear()
+
+    def handle(self, event) -> None:
+        with self._lock:
+            self.handled += 1
+            if self.handled >= self.expected:
+                self.done.set()
+
+
+def _make_event_data() -> dict:
+    start = datetime.now(timezone.utc) + timedelta(days=2)
+    event = BookingConfirmedEvent(
+        occurred_at=datetime.now(timezone.utc),
+        booking_id=uuid4(),
+        studio_id=uuid4(),
+        client_id=uuid4(),
+        time_range_start=start,
+        time_range_end=start + timedelta(hours=2),
+    )
+    return {
+        "event_type": event.__class__.__name__,
+        "event_id": event.event_id,
+        "occurred_at": event.occurred_at,
+        "data": event.__dict__,
+    }
+
+
+def _measure(send, events: list, counter: _Counter, timeout: float) -> float:
+    counter.reset(len(events))
+    started = time.perf_counter()
+    for event_data in events:
+        send(event_data)
+    if not counter.done.wait(timeout):
+        raise TimeoutError(f"Обработано только {counter.handled} из {len(events)} событий")
+    return len(events) / (time.perf_counter() - started)
+
+
+def bench_celery(events: list, counter: _Counter, timeout: float) -> float:
+    from celery.contrib.testing.worker import start_worker
+
+    from ..infrastructure.celery.celery_app import get_celery_app
+    from ..infrastructure.celery.event_publisher import CeleryEventTransport
+    from ..infrastructure.celery.event_routing import all_event_queues
+
+    transport = CeleryEventTransport()
+    with start_worker(
+        get_celery_app(),
+        pool="solo",
+        perform_ping_check=False,
+        queues=all_event_queues(),
+        loglevel="WARNING",
+    ):
+        return _measure(transport.send, events, counter, timeout)
+
+
+def bench_redis_streams(events: list, counter: _Counter, timeout: float, batch_size: int) -> float:
+    from ..infrastructure.events.redis_streams_transport import (
+        RedisStreamsEventConsumer,
+        RedisStreamsEventTransport,
+    )
+
+    connection = create_redis_connection(decode_responses=False)
+    connection.delete(_BENCH_STREAM)
+
+    transport = RedisStreamsEventTransport(connection, stream=_BENCH_STREAM)
+    consumer = RedisStreamsEventConsumer(
+        create_redis_connection(decode_responses=False),
+        stream=_BENCH_STREAM,
+        group=_BENCH_GROUP,
+        batch_size=batch_size,
+        block_ms=100,
+    )
+    consumer.ensure_group()
+    worker = threading.Thread(target=consumer.run_forever, daemon=True)
+    worker.start()
+    try:
+        return _measure(transport.send, events, counter, timeout)
+    finally:
+        consumer.stop()
+        worker.join()
+        connection.delete(_BENCH_STREAM)
+
+
+def run(events_count: int, batch_size: int, timeout: float) -> None:
+    counter = _Counter()
+    EventBus.subscribe(BookingConfirmedEvent, counter.handle)
+    events = [_make_event_data() for _ in range(events_count)]
+
+    results = {
+        "celery": bench_celery(events, counter, timeout),
+        "redis_streams": bench_redis_streams(events, counter, timeout, batch_size),
+    }
+
+    print(f"{'транспорт':<16}{'событий/с':>12}")
+    for name, rate in results.items():
+        print(f"{name:<16}{rate:>12.0f}")
+    print(f"\nRedis Streams быстрее Celery в {results['redis_streams'] / results['celery']:.1f} раз")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+    run(args.events, args.batch_size, args.timeout)
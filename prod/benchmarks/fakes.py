@@ -0,0 +1,263 @@
+"""
+Подмены внешних сервисов для офлайн-бенчмарков: Telegram Bot API и Redis
+"""
+
+import json
+import math
+import os
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple
+
+
+def configure_offline_environment(bot_token: str) -> None:
+    """
+    Брокер Celery в памяти вместо настроек из .env; остальные обязательные поля — заглушки
+
+    Лимиты Telegram и подписка кэша chat_id отключены: им нужен Redis, которого в бенчмарках нет
+    """
+    os.environ["CELERY_BROKER_URL"] = "memory://"
+    os.environ["CELERY_RESULT_BACKEND"] = "cache+memory://"
+    os.environ["EVENT_TRANSPORT"] = "celery"
+    os.environ["TELEGRAM_RATE_LIMIT_ENABLED"] = "false"
+    os.environ["TELEGRAM_CHAT_ID_INVALIDATION_ENABLED"] = "false"
+    os.environ.setdefault("TELEGRAM_BOT_TOKEN", bot_token)
+    os.environ.setdefault("REDIS_HOST", "localhost")
+    os.environ.setdefault("REDIS_PORT", "6379")
+    os.environ.setdefault("REDIS_DB", "0")
+    os.environ.setdefault("REDIS_PASSWORD", "")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+class InMemoryRedisClient:
+    """Словарь с TTL вместо RedisClient (тот же интерфейс get/setex/set_nx/delete/publish)"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[str, float | None]] = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key: str) -> bool:
+        item = self._data.get(key)
+        if item is None:
+            return False
+        if item[1] is not None and item[1] <= time.monotonic():
+            del self._data[key]
+            return False
+        return True
+
+    def set(self, key: str, value: str) -> bool:
+        with self._lock:
+            self._data[key] = (str(value), None)
+        return True
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            return self._data[key][0] if self._alive(key) else None
+
+    def mget(self, keys: List[str]) -> List[str | None]:
+        with self._lock:
+            return [self._data[key][0] if self._alive(key) else None for key in keys]
+
+    def setex(self, key: str, seconds: int, value: str) -> bool:
+        with self._lock:
+            self._data[key] = (str(value), time.monotonic() + seconds)
+        return True
+
+    def set_nx(self, key: str, value: str, seconds: int) -> bool | None:
+        with self._lock:
+            if self._alive(key):
+                return False
+            self._data[key] = (str(value), time.monotonic() + seconds)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def publish(self, channel: str, message: str) -> int:
+        # Подписчиков pub/sub в бенчмарках нет
+        return 0
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Очередь входящих соединений: по умолчанию 5, и сотни параллельных клиентов
+    # получали бы повторную отправку SYN через секунду
+    request_queue_size = 1024
+
+
+class ReceivedMessage(NamedTuple):
+    """Запрос sendMessage, полученный сервером, и код ответа на него"""
+
+    chat_id: int
+    payload: dict
+    status: int
+    received_at: float
+
+
+class FakeTelegramServer:
+    """
+    Локальный HTTP-сервер с методом sendMessage Telegram Bot API
+
+    Для каждого принятого сообщения вызывает on_message(chat_id, payload, received_at),
+    где received_at — time.perf_counter() в момент приёма запроса.
+    latency — задержка ответа в секундах, имитирующая сеть до api.telegram.org.
+
+    Сбои для проверки ретраев и лимитов:
+    - error_rate — доля запросов, на которые отвечается 500;
+    - flood_rate — доля запросов, на которые отвечается 429 с retry_after секунд;
+    - chat_rate_limit / global_rate_limit — сообщений/с в один чат и всего; превышение
+      получает 429 с retry_after до следующего разрешённого сообщения, как у Telegram.
+
+    Все запросы (и отклонённые) сохраняются в received, принятые сообщения — в messages
+    """
+
+    def __init__(
+        self,
+        on_message: Callable[[int, dict, float], None] | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        flood_rate: float = 0.0,
+        retry_after: int = 1,
+        chat_rate_limit: float | None = None,
+        global_rate_limit: float | None = None,
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.on_message = on_message
+        self.latency = latency
+        self.error_rate = error_rate
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+        self.chat_rate_limit = chat_rate_limit
+        self.global_rate_limit = global_rate_limit
+        self.messages: List[dict] = []
+        self.received: List[ReceivedMessage] = []
+        self.responses: Counter = Counter()
+        self._random = random.Random(seed)
+        # Момент (time.monotonic), с которого чат / бот снова принимает сообщения
+        self._chat_free_at: Dict[int, float] = {}
+        self._global_free_at = 0.0
+        self._lock = threading.Lock()
+        self._server = _HTTPServer((host, port), self._make_handler())
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def send_message_url(self, bot_token: str) -> str:
+        return f"{self.url}/bot{bot_token}/sendMessage"
+
+    def start(self) -> "FakeTelegramServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeTelegramServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handle(self, payload: dict) -> Tuple[int, Dict[str, Any]]:
+        """Код и тело ответа на sendMessage; запрос сохраняется в received"""
+        received_at = time.perf_counter()
+        chat_id = payload["chat_id"]
+
+        with self._lock:
+            status, error = self._check(chat_id)
+            self.received.append(ReceivedMessage(chat_id, payload, status, received_at))
+            self.responses[status] += 1
+            if error is not None:
+                return status, error
+            self.messages.append(payload)
+            message_id = len(self.messages)
+
+        if self.on_message is not None:
+            self.on_message(chat_id, payload, received_at)
+        return 200, {
+            "ok": True,
+            "result": {
+                "message_id": message_id,
+                "chat": {"id": chat_id},
+                "date": int(time.time()),
+                "text": payload.get("text", ""),
+            },
+        }
+
+    def _check(self, chat_id: int) -> Tuple[int, Dict[str, Any] | None]:
+        # Вызывается под self._lock
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 500, {"ok": False, "error_code": 500, "description": "Internal Server Error"}
+        if self.flood_rate and self._random.random() < self.flood_rate:
+            return 429, self._too_many_requests(self.retry_after)
+
+        now = time.monotonic()
+        wait = max(self._chat_free_at.get(chat_id, 0.0), self._global_free_at) - now
+        if wait > 0:
+            return 429, self._too_many_requests(math.ceil(wait))
+
+        if self.chat_rate_limit:
+            self._chat_free_at[chat_id] = now + 1 / self.chat_rate_limit
+        if self.global_rate_limit:
+            self._global_free_at = now + 1 / self.global_rate_limit
+        return 200, None
+
+    @staticmethod
+    def _too_many_requests(retry_after: int) -> Dict[str, Any]:
+        return {
+            "ok": False,
+            "error_code": 429,
+            "description": f"Too Many Requests: retry after {retry_after}",
+            "parameters": {"retry_after": retry_after},
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive: клиент с пулом соединений не переподключается на каждый запрос
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Заголовки и тело уходят отдельными write: без TCP_NODELAY ответ на
+                # keep-alive соединении ждёт delayed ACK клиента (~40 мс)
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if not self.path.endswith("/sendMessage"):
+                    self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+                    return
+
+                status, data = server._handle(json.loads(body))
+                if server.latency:
+                    time.sleep(server.latency)
+                self._reply(status, data)
+
+            def _reply(self, status: int, data: dict) -> None:
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
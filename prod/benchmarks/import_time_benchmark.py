@@ -0,0 +1,79 @@
+"""
+Стоимость импорта модулей prod с ленивой инициализацией настроек и Celery
+
+Для каждого модуля `python -X importtime` измеряет накопленное время импорта,
+а отдельный замер показывает стоимость get_settings() + get_celery_app(), которую
+раньше платил каждый импорт (settings = Settings() и celery_app = init_celery()).
+
+Запуск: python -m prod.benchmarks.import_time_benchmark [--repeat N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    "prod.infrastructure.config.settings",
+    "prod.infrastructure.redis_client",
+    "prod.infrastructure.celery.tasks.event_tasks",
+    "prod.infrastructure.celery.event_publisher",
+]
+
+_INIT_SNIPPET = """
+import time
+import {module}
+from prod.infrastructure.config.settings import get_settings
+from prod.infrastructure.celery.celery_app import get_celery_app
+started = time.perf_counter()
+get_settings()
+get_celery_app()
+print((time.perf_counter() - started) * 1_000_000)
+"""
+
+
+def _import_time_us(module: str) -> int:
+    """Накопленное время импорта модуля по выводу -X importtime, мкс"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(result.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"Модуль не найден в выводе importtime: {module}")
+
+
+def _init_time_us(module: str) -> float:
+    """Стоимость ленивой инициализации настроек и Celery после импорта, мкс"""
+    result = subprocess.run(
+        [sys.executable, "-c", _INIT_SNIPPET.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def run(repeat: int) -> None:
+    print(f"{'модуль':<48}{'импорт, мс':>12}{'+ init, мс':>12}{'экономия':>10}")
+    for module in MODULES:
+        import_us = statistics.median(_import_time_us(module) for _ in range(repeat))
+        init_us = statistics.median(_init_time_us(module) for _ in range(repeat))
+        saved = init_us * 100 / (import_us + init_us)
+        print(f"{module:<48}{import_us / 1000:>12.1f}{init_us / 1000:>12.1f}{saved:>9.0f}%")
+
+    print(
+        "\n«+ init» — то, что раньше выполнялось при импорте; теперь это платят только "
+        "процессы, которые публикуют или обрабатывают события"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    run(parser.parse_args().repeat)
@@ -0,0 +1,220 @@
+"""
+Сквозная задержка конвейера уведомлений: от подтверждения брони до запроса в Telegram
+
+Booking.mark_as_confirmed → DistributedEventPublisher → Celery → handle_domain_event
+→ EventBus → TelegramNotifier → локальный сервер Telegram Bot API.
+
+Внешних сервисов не требует: брокер Celery — memory:// (воркер в потоке этого процесса)
+или eager-режим (задача выполняется прямо в publish), Redis — словарь в памяти.
+Задержка события — от вызова mark_as_confirmed до приёма запроса сервером Telegram.
+
+Запуск: python -m prod.benchmarks.pipeline_benchmark [--events N] [--mode worker|eager]
+        [--delivery sync|async] [--rate N] [--telegram-latency SECONDS]
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from uuid import uuid4
+
+from .fakes import FakeTelegramServer, InMemoryRedisClient, configure_offline_environment
+
+_BOT_TOKEN = "123456:pipeline-benchmark-token"
+
+
+class _LatencyRecorder:
+    """Сопоставляет отправку события и приём сообщения по chat_id клиента брони"""
+
+    def __init__(self):
+        self.sent_at: Dict[int, float] = {}
+        self.latencies: List[float] = []
+        self.first_sent: float | None = None
+        self.last_received = 0.0
+        self.expected = 0
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def reset(self, expected: int) -> None:
+        self.sent_at.clear()
+        self.latencies = []
+        self.first_sent = None
+        self.expected = expected
+        self.done.clear()
+
+    def on_sent(self, chat_id: int) -> None:
+        now = time.perf_counter()
+        if self.first_sent is None:
+            self.first_sent = now
+        self.sent_at[chat_id] = now
+
+    def on_message(self, chat_id: int, payload: dict, received_at: float) -> None:
+        with self._lock:
+            sent_at = self.sent_at.pop(chat_id, None)
+            if sent_at is None:
+                return
+            self.latencies.append(received_at - sent_at)
+            self.last_received = received_at
+            if len(self.latencies) >= self.expected:
+                self.done.set()
+
+
+def _make_booking(redis_client: InMemoryRedisClient, chat_id: int):
+    from ..domain.bookings.booking.booking_entity import Booking
+    from ..domain.bookings.booking.booking_enums import BookingServicesTypesEnum
+    from ..domain.bookings.booking.value_object.booking_time_range_vo import BookingTimeRange
+
+    client_id = uuid4()
+    redis_client.set(f"telegram:chat_id:{client_id}", str(chat_id))
+
+    start = datetime.now(timezone.utc) + timedelta(days=2)
+    return Booking(
+        id=uuid4(),
+        studio_id=uuid4(),
+        client_id=client_id,
+        assigned_employee_id=uuid4(),
+        service_type=next(iter(BookingServicesTypesEnum)),
+        time_range=BookingTimeRange(start_time=start, end_time=start + timedelta(hours=2)),
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _drive(publisher, bookings: list, recorder: _LatencyRecorder, rate: float, timeout: float):
+    recorder.reset(len(bookings))
+    interval = 1 / rate if rate else 0.0
+    started = time.perf_counter()
+
+    for i, (chat_id, booking) in enumerate(bookings):
+        if interval:
+            delay = started + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        recorder.on_sent(chat_id)
+        for event in booking.mark_as_confirmed(datetime.now(timezone.utc)):
+            publisher.publish(event)
+
+    if not recorder.done.wait(timeout):
+        delivered = len(recorder.latencies)
+        raise TimeoutError(f"Доставлено только {delivered} из {len(bookings)} событий")
+
+
+def _percentile(values: List[float], q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run(
+    events_count: int,
+    mode: str,
+    delivery: str,
+    rate: float,
+    telegram_latency: float,
+    warmup: int,
+    timeout: float,
+) -> None:
+    configure_offline_environment(_BOT_TOKEN)
+    os.environ["TELEGRAM_DELIVERY_MODE"] = delivery
+
+    from celery.contrib.testing.worker import start_worker
+
+    from ..infrastructure.celery.celery_app import get_celery_app
+    from ..infrastructure.celery.event_publisher import (
+        CeleryEventTransport,
+        DistributedEventPublisher,
+    )
+    from ..infrastructure.celery.event_routing import all_event_queues
+    from ..infrastructure.events.event_deduplicator import EventDeduplicator
+    from ..infrastructure.events.event_dispatch import configure_event_deduplicator
+    from ..infrastructure.events.spill_queue import EventSpillQueue
+    from ..infrastructure.notifications.async_delivery import get_async_delivery
+    from ..infrastructure.notifications.telegram_notifier import TelegramNotifier
+
+    redis_client = InMemoryRedisClient()
+    recorder = _LatencyRecorder()
+    app = get_celery_app()
+    app.conf.task_always_eager = mode == "eager"
+    # memory:// опрашивает очереди раз в секунду — это стало бы основной частью задержки
+    app.conf.broker_transport_options = {"polling_interval": 0.001}
+
+    with (
+        FakeTelegramServer(on_message=recorder.on_message, latency=telegram_latency) as server,
+        tempfile.TemporaryDirectory() as spill_dir,
+    ):
+        notifier = TelegramNotifier(_BOT_TOKEN, redis_client)
+        notifier.base_url = server.send_message_url(_BOT_TOKEN)
+        get_async_delivery().base_url = server.send_message_url(_BOT_TOKEN)
+        configure_event_deduplicator(EventDeduplicator(redis_client))
+
+        transport = CeleryEventTransport()
+        spill_queue = EventSpillQueue(transport, spill_dir, fsync=False)
+        DistributedEventPublisher.configure(transport, spill_queue)
+
+        bookings = [
+            (chat_id, _make_booking(redis_client, chat_id))
+            for chat_id in range(1, warmup + events_count + 1)
+        ]
+
+        def measure() -> None:
+            _drive(DistributedEventPublisher, bookings[:warmup], recorder, 0, timeout)
+            _drive(DistributedEventPublisher, bookings[warmup:], recorder, rate, timeout)
+
+        try:
+            if mode == "worker":
+                with start_worker(
+                    app,
+                    pool="solo",
+                    perform_ping_check=False,
+                    queues=all_event_queues(),
+                    loglevel="WARNING",
+                ):
+                    measure()
+            else:
+                measure()
+        finally:
+            spill_queue.stop()
+
+    latencies = recorder.latencies
+    throughput = len(latencies) / (recorder.last_received - recorder.first_sent)
+    pace = f"{rate:.0f}/с" if rate else "без ограничения"
+    print(f"режим: {mode}, доставка: {delivery}, событий: {len(latencies)}, темп: {pace}")
+    print(f"{'p50, мс':>10}{'p99, мс':>10}{'max, мс':>10}{'событий/с':>12}")
+    print(
+        f"{_percentile(latencies, 50) * 1000:>10.2f}{_percentile(latencies, 99) * 1000:>10.2f}"
+        f"{max(latencies) * 1000:>10.2f}{throughput:>12.0f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--events", type=int, default=2_000)
+    parser.add_argument("--mode", choices=["worker", "eager"], default="worker")
+    parser.add_argument("--delivery", choices=["sync", "async"], default="sync")
+    parser.add_argument("--rate", type=float, default=0, help="Событий в секунду; 0 — без ограничения")
+    parser.add_argument(
+        "--telegram-latency", type=float, default=0.0, help="Задержка ответа Telegram, с"
+    )
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    level = logging.getLevelName(args.log_level)
+    logging.basicConfig(level=level)
+    # Воркер Celery сам выставляет своим логгерам INFO (setup_loggers), поэтому уровень
+    # ограничивается глобально: логирование на каждом шаге заметно влияет на замер
+    logging.disable(level - 1)
+    run(
+        args.events,
+        args.mode,
+        args.delivery,
+        args.rate,
+        args.telegram_latency,
+        args.warmup,
+        args.timeout,
+    )
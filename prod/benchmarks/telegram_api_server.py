@@ -0,0 +1,88 @@
+"""
+Локальный Telegram Bot API (sendMessage) для нагрузочных тестов и проверки сбоев
+
+Приложение и воркеры направляются на него через TELEGRAM_API_URL, реальные чаты
+при этом сообщений не получают:
+
+    python -m prod.benchmarks.telegram_api_server --port 8081 --latency 0.05 --chat-rate 1
+    TELEGRAM_API_URL=http://127.0.0.1:8081 celery -A ... worker
+
+При остановке (Ctrl+C или SIGTERM) печатает число ответов по кодам и самые нагруженные чаты;
+с --record все полученные запросы сохраняются в JSON Lines.
+
+Запуск: python -m prod.benchmarks.telegram_api_server [--host HOST] [--port N]
+        [--latency SECONDS] [--error-rate P] [--flood-rate P] [--retry-after SECONDS]
+        [--chat-rate N] [--global-rate N] [--record PATH]
+"""
+
+import argparse
+import json
+import signal
+import time
+from collections import Counter
+
+from .fakes import FakeTelegramServer
+
+
+def _print_summary(server: FakeTelegramServer) -> None:
+    print(f"запросов: {len(server.received)}, принято сообщений: {len(server.messages)}")
+    for status, count in sorted(server.responses.items()):
+        print(f"  HTTP {status}: {count}")
+
+    chats = Counter(message.chat_id for message in server.received)
+    if chats:
+        print("самые нагруженные чаты:")
+        for chat_id, count in chats.most_common(5):
+            print(f"  {chat_id}: {count}")
+
+
+def _save(server: FakeTelegramServer, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for message in server.received:
+            file.write(json.dumps(message._asdict(), ensure_ascii=False) + "\n")
+    print(f"запросы сохранены: {path}")
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def run(args: argparse.Namespace) -> None:
+    signal.signal(signal.SIGTERM, _interrupt)
+    server = FakeTelegramServer(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        flood_rate=args.flood_rate,
+        retry_after=args.retry_after,
+        chat_rate_limit=args.chat_rate,
+        global_rate_limit=args.global_rate,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    with server:
+        print(f"Telegram Bot API: {server.url} (TELEGRAM_API_URL={server.url}), Ctrl+C — остановка")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+    _print_summary(server)
+    if args.record:
+        _save(server, args.record)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--flood-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--chat-rate", type=float, default=None)
+    parser.add_argument("--global-rate", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", default=None)
+    run(parser.parse_args())
@@ -0,0 +1,83 @@
+"""
+Доставка в Telegram при сбоях API: пропускная способность, повторы и отложенные отправки
+
+Асинхронный движок доставки отправляет сообщения в локальный сервер Telegram Bot API
+с заданными задержкой и долей ошибок. Для каждого сценария печатаются: время,
+сообщений/с, доставлено, отложено (RateLimitExceeded — в проде задача Celery
+перезапускается с countdown), ошибки и запросов к API на одно сообщение.
+
+Общий лимит отправок в Redis отключён, поэтому сценарий с лимитом чата показывает,
+во что обходятся 429 без него.
+
+Запуск: python -m prod.benchmarks.telegram_delivery_benchmark [--messages N] [--chats N]
+        [--latency SECONDS] [--base-delay SECONDS]
+"""
+
+import argparse
+import time
+from typing import Dict, List, Tuple
+
+from ..infrastructure.notifications.async_delivery import AsyncTelegramDelivery
+from ..infrastructure.notifications.rate_limiter import RateLimitExceeded
+from .fakes import FakeTelegramServer, configure_offline_environment
+
+_BOT_TOKEN = "123456:delivery-benchmark-token"
+
+# Название сценария → параметры FakeTelegramServer
+_SCENARIOS: Dict[str, dict] = {
+    "без сбоев": {},
+    "5% ответов 500": {"error_rate": 0.05},
+    "1% ответов 429": {"flood_rate": 0.01},
+    "лимит 1 сообщ./с на чат": {"chat_rate_limit": 1.0},
+}
+
+
+def _run_scenario(
+    server_options: dict, messages: List[Tuple[int, str]], latency: float, base_delay: float
+) -> Tuple[float, Dict[str, int], int]:
+    with FakeTelegramServer(latency=latency, seed=1, **server_options) as server:
+        delivery = AsyncTelegramDelivery(server.send_message_url(_BOT_TOKEN), base_delay=base_delay)
+        delivery.start()
+        try:
+            started = time.perf_counter()
+            results = delivery.send_many(messages)
+            elapsed = time.perf_counter() - started
+        finally:
+            delivery.stop()
+
+    outcomes = {"доставлено": 0, "отложено": 0, "ошибки": 0}
+    for result in results:
+        if isinstance(result, RateLimitExceeded):
+            outcomes["отложено"] += 1
+        elif isinstance(result, BaseException):
+            outcomes["ошибки"] += 1
+        else:
+            outcomes["доставлено"] += 1
+    return elapsed, outcomes, len(server.received)
+
+
+def run(messages: int, chats: int, latency: float, base_delay: float) -> None:
+    configure_offline_environment(_BOT_TOKEN)
+    batch = [(index % chats, f"benchmark {index}") for index in range(messages)]
+
+    print(f"сообщений: {messages}, чатов: {chats}, задержка API: {latency * 1000:.0f} мс")
+    print(
+        f"{'сценарий':<26}{'время, с':>10}{'сообщ./с':>10}{'доставлено':>12}"
+        f"{'отложено':>10}{'ошибки':>8}{'запросов/сообщ.':>17}"
+    )
+    for name, server_options in _SCENARIOS.items():
+        elapsed, outcomes, requests_count = _run_scenario(server_options, batch, latency, base_delay)
+        print(
+            f"{name:<26}{elapsed:>10.2f}{messages / elapsed:>10.0f}{outcomes['доставлено']:>12}"
+            f"{outcomes['отложено']:>10}{outcomes['ошибки']:>8}{requests_count / messages:>17.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1_000)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--base-delay", type=float, default=0.1)
+    args = parser.parse_args()
+    run(args.messages, args.chats, args.latency, args.base_delay)
@@ -0,0 +1,69 @@
+"""
+Задержка отправки сообщения в Telegram: requests.post против пула keep-alive соединений
+
+Сервер Telegram — локальный, без TLS, поэтому разница показывает только экономию
+на TCP-подключении; с api.telegram.org к ней добавляется TLS-рукопожатие (1–2 RTT).
+
+Запуск: python -m prod.benchmarks.telegram_session_benchmark [--messages N] [--threads N]
+"""
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+import requests
+
+from ..infrastructure.notifications.telegram_notifier import TelegramNotifier
+from .fakes import FakeTelegramServer, InMemoryRedisClient, configure_offline_environment
+
+_BOT_TOKEN = "123456:session-benchmark-token"
+
+
+def _measure(send: Callable[[int], None], messages: int, threads: int) -> List[float]:
+    def timed(chat_id: int) -> float:
+        started = time.perf_counter()
+        send(chat_id)
+        return time.perf_counter() - started
+
+    # Прогрев: соединения пула открываются до замера
+    for chat_id in range(threads):
+        send(chat_id)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(timed, range(messages)))
+
+
+def run(messages: int, threads: int) -> None:
+    configure_offline_environment(_BOT_TOKEN)
+    with FakeTelegramServer() as server:
+        url = server.send_message_url(_BOT_TOKEN)
+        notifier = TelegramNotifier(_BOT_TOKEN, InMemoryRedisClient(), pool_size=threads)
+        notifier.base_url = url
+
+        def send_without_pool(chat_id: int) -> None:
+            payload = {"chat_id": chat_id, "text": "benchmark", "parse_mode": "HTML"}
+            requests.post(url, json=payload, timeout=(3.05, 15)).raise_for_status()
+
+        def send_with_pool(chat_id: int) -> None:
+            notifier._send_telegram_message(chat_id, "benchmark")
+
+        results = {
+            "requests.post": _measure(send_without_pool, messages, threads),
+            "пул соединений": _measure(send_with_pool, messages, threads),
+        }
+
+    print(f"сообщений: {messages}, потоков: {threads}")
+    print(f"{'клиент':<18}{'p50, мс':>10}{'p99, мс':>10}")
+    for name, latencies in results.items():
+        quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+        print(f"{name:<18}{quantiles[49] * 1000:>10.2f}{quantiles[98] * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+    run(args.messages, args.threads)
@@ -0,0 +1,100 @@
+"""
+Пропускная способность профилей воркеров (сообщений в секунду) на I/O- и CPU-нагрузке
+
+I/O-задача имитирует HTTP-запрос в Telegram (sleep), CPU-задача — хеширование пароля
+(PBKDF2). Воркеры запускаются отдельными процессами с аргументами из профилей.
+
+Требует локальный redis-server как брокер и result backend
+(CELERY_BROKER_URL и CELERY_RESULT_BACKEND в .env).
+
+Запуск: python -m prod.benchmarks.worker_profiles_benchmark [--tasks N]
+"""
+
+import argparse
+import hashlib
+import os
+import subprocess
+import sys
+import time
+
+from celery import group, shared_task
+
+from ..infrastructure.celery.celery_app import get_celery_app
+from ..infrastructure.celery.worker_profiles import get_worker_profiles
+
+_BENCH_QUEUE = "bench.worker_profiles"
+
+
+@shared_task
+def io_task(latency: float) -> None:
+    time.sleep(latency)
+
+
+@shared_task
+def cpu_task(rounds: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", b"password", b"salt", rounds).hex()
+
+
+def _start_worker(profile) -> subprocess.Popen:
+    argv = profile.worker_argv([_BENCH_QUEUE])
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "celery",
+            "-A",
+            "prod.infrastructure.celery.celery_app",
+            *argv,
+            f"--include={__name__}",
+            "--loglevel=WARNING",
+        ],
+        env=os.environ.copy(),
+    )
+
+
+def _wait_ready(app, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if app.control.ping(timeout=0.5):
+            return
+    raise TimeoutError("Воркер не ответил на ping")
+
+
+def _throughput(app, signature, tasks: int) -> float:
+    started = time.perf_counter()
+    group(signature for _ in range(tasks)).apply_async(queue=_BENCH_QUEUE).get(timeout=600)
+    return tasks / (time.perf_counter() - started)
+
+
+def run(tasks: int, io_latency: float, cpu_rounds: int) -> None:
+    app = get_celery_app()
+    profiles = get_worker_profiles()
+    workloads = {
+        f"I/O ({io_latency * 1000:.0f} мс)": io_task.si(io_latency),
+        f"CPU (PBKDF2 x{cpu_rounds})": cpu_task.si(cpu_rounds),
+    }
+
+    print(f"{'профиль':<16}{'пул':<10}{'слотов':>8}", *(f"{name:>24}" for name in workloads))
+    for name in ("notifications", "cpu"):
+        profile = profiles[name]
+        worker = _start_worker(profile)
+        try:
+            _wait_ready(app)
+            rates = [_throughput(app, signature, tasks) for signature in workloads.values()]
+        finally:
+            worker.terminate()
+            worker.wait()
+
+        print(
+            f"{name:<16}{profile.pool:<10}{profile.concurrency:>8}",
+            *(f"{rate:>18.0f} msg/s" for rate in rates),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--io-latency", type=float, default=0.05)
+    parser.add_argument("--cpu-rounds", type=int, default=50_000)
+    args = parser.parse_args()
+    run(args.tasks, args.io_latency, args.cpu_rounds)
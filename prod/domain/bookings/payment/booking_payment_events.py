@@ -1,13 +1,14 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import UUID, uuid4
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, kw_only=True)
 class DomainEvent:
     """Базовый класс для всех доменных событий"""
 
-    event_id: UUID = uuid4()  # TODO: Можно ли здесь использовать uuid4()?
+    # default_factory: иначе один и тот же uuid4() достанется всем событиям
+    event_id: UUID = field(default_factory=uuid4)
     occurred_at: datetime
 
 
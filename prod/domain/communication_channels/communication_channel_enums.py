@@ -0,0 +1,14 @@
+from enum import StrEnum, unique
+
+
+@unique
+class CommunicationChannelsTypesEnum(StrEnum):
+    """
+    This class represents the different communication channels available for client interaction.
+    These channels allow studio staff to communicate with clients through various platforms.
+    """
+
+    INSTAGRAM = "instagram"
+    TELEGRAM = "telegram"
+    VK = "vk"
+    WHATSAPP = "whatsapp"
@@ -0,0 +1,103 @@
+"""
+Агрегаты по файлам аналитики событий
+
+Запуск: python -m prod.infrastructure.analytics.analytics_query --from 2025-11-01 --to 2025-11-30
+        [--studio STUDIO_ID]
+"""
+
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+from uuid import UUID
+
+from ..celery.event_serializer import iter_loads, loads
+from ..config.settings import get_settings
+from .analytics_sink import ANALYTICS_FILE_SUFFIX
+
+
+@dataclass(frozen=True)
+class AnalyticsRecord:
+    """Запись аналитики; данные события распаковываются только при обращении к data"""
+
+    day: str
+    studio: str
+    event_type: str
+    event_id: UUID
+    occurred_at: datetime
+    packed_data: bytes
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return loads(self.packed_data)
+
+
+def _partition_files(
+    base_dir: Path, start_day: date, end_day: date, studio_id: UUID | str | None
+) -> Iterator[Tuple[str, str, Path]]:
+    """(день, студия, файл) для партиций в диапазоне дней включительно"""
+    pattern = f"{studio_id}.*{ANALYTICS_FILE_SUFFIX}" if studio_id else f"*{ANALYTICS_FILE_SUFFIX}"
+    day = start_day
+    while day <= end_day:
+        day_name = day.isoformat()
+        for path in sorted((base_dir / day_name).glob(pattern)):
+            yield day_name, path.name.split(".", 1)[0], path
+        day += timedelta(days=1)
+
+
+def _iter_raw(path: Path) -> Iterable[list]:
+    with open(path, "rb") as partition:
+        # Недописанная последняя запись (сбой во время сброса) просто не будет прочитана
+        yield from iter_loads(partition)
+
+
+def iter_records(
+    start_day: date,
+    end_day: date,
+    studio_id: UUID | str | None = None,
+    base_dir: str | None = None,
+) -> Iterator[AnalyticsRecord]:
+    """Все записи за дни [start_day, end_day], опционально только одной студии"""
+    base_path = Path(base_dir or get_settings().ANALYTICS_DIR)
+    for day, studio, path in _partition_files(base_path, start_day, end_day, studio_id):
+        for event_type, event_id, occurred_at, packed_data in _iter_raw(path):
+            yield AnalyticsRecord(day, studio, event_type, event_id, occurred_at, packed_data)
+
+
+def count_events(
+    start_day: date,
+    end_day: date,
+    studio_id: UUID | str | None = None,
+    base_dir: str | None = None,
+) -> Counter:
+    """
+    Количество событий по (день, тип события)
+
+    Читаются только партиции нужных дней и студии, данные событий не распаковываются
+    """
+    base_path = Path(base_dir or get_settings().ANALYTICS_DIR)
+    counts: Counter = Counter()
+    for day, _, path in _partition_files(base_path, start_day, end_day, studio_id):
+        counts.update((day, record[0]) for record in _iter_raw(path))
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Количество доменных событий по дням и типам")
+    parser.add_argument("--from", dest="start_day", type=date.fromisoformat, required=True)
+    parser.add_argument("--to", dest="end_day", type=date.fromisoformat, required=True)
+    parser.add_argument("--studio", default=None, help="studio_id; по умолчанию все студии")
+    parser.add_argument("--dir", default=None, help="Каталог аналитики (ANALYTICS_DIR)")
+    args = parser.parse_args()
+
+    counts = count_events(args.start_day, args.end_day, args.studio, args.dir)
+    print(f"{'день':<12}{'событие':<32}{'количество':>12}")
+    for (day, event_type), count in sorted(counts.items()):
+        print(f"{day:<12}{event_type:<32}{count:>12}")
+    print(f"{'всего':<44}{sum(counts.values()):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import atexit
+import logging
+import os
+import socket
+import threading
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from ..celery.event_serializer import dumps
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_FILE_SUFFIX = ".msgpack"
+# Партиция для событий без студии (например, платежи)
+NO_STUDIO_PARTITION = "_"
+
+
+def partition_path(base_dir: Path, day: str, studio: str, writer_id: str) -> Path:
+    """Файл партиции: <base_dir>/<YYYY-MM-DD>/<studio_id>.<writer_id>.msgpack"""
+    return base_dir / day / f"{studio}.{writer_id}{ANALYTICS_FILE_SUFFIX}"
+
+
+class AnalyticsSink:
+    """
+    Буферизованная запись аналитики доменных событий в append-only файлы
+
+    - запись события — одно добавление в буфер в памяти;
+    - буфер сбрасывается каждые flush_events событий или flush_interval секунд;
+    - при сбросе события группируются по дню и студии, и каждая партиция
+      дописывается одним write;
+    - у каждого процесса свои файлы (writer_id), поэтому записи процессов не перемешиваются.
+
+    Запись файла — msgpack-массив [event_type, event_id, occurred_at, data], где data
+    упакована отдельно: агрегаты по типам и времени не распаковывают данные событий
+    """
+
+    def __init__(
+        self,
+        base_dir: str | None = None,
+        flush_events: int | None = None,
+        flush_interval: float | None = None,
+    ):
+        settings = get_settings()
+        self.base_dir = Path(base_dir or settings.ANALYTICS_DIR)
+        self.flush_events = flush_events or settings.ANALYTICS_FLUSH_EVENTS
+        self.flush_interval = flush_interval or settings.ANALYTICS_FLUSH_SECONDS
+        self.writer_id = f"{socket.gethostname()}-{os.getpid()}"
+
+        self._buffer: List[Tuple[str, Dict[str, Any]]] = []
+        self._lock = threading.Lock()
+        # Сбросы выполняются по одному, а буфер забирается под этой же блокировкой:
+        # порядок записей в файле совпадает с порядком record
+        self._flush_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # region Публичный интерфейс
+
+    def record(self, event_type: str, event_data: Dict[str, Any]) -> None:
+        """Добавление события в буфер; при заполнении буфер сбрасывается на диск"""
+        with self._lock:
+            self._buffer.append((event_type, event_data))
+            if len(self._buffer) < self.flush_events:
+                return
+        self.flush()
+
+    def flush(self) -> int:
+        """Принудительный сброс буфера; возвращает количество записанных событий"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            self._write(batch)
+        return len(batch)
+
+    def start(self) -> None:
+        """Запуск фонового потока, сбрасывающего буфер по времени"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="analytics-sink", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """Остановка фонового потока и сброс оставшихся событий"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    # endregion
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception(f"❌ Ошибка при сбросе аналитики на диск: {str(e)}")
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        if not batch:
+            return
+
+        partitions: Dict[Tuple[str, str], List[bytes]] = defaultdict(list)
+        for event_type, event_data in batch:
+            occurred_at: datetime = event_data["occurred_at"]
+            if occurred_at.tzinfo is not None:
+                occurred_at = occurred_at.astimezone(timezone.utc)
+            data = event_data["data"]
+            studio = str(data.get("studio_id") or NO_STUDIO_PARTITION)
+
+            record = dumps([event_type, event_data["event_id"], occurred_at, dumps(data)])
+            partitions[(occurred_at.strftime("%Y-%m-%d"), studio)].append(record)
+
+        for (day, studio), records in partitions.items():
+            path = partition_path(self.base_dir, day, studio, self.writer_id)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "ab") as partition:
+                partition.write(b"".join(records))
+
+        logger.debug(f"📊 Сброшено событий аналитики: {len(batch)}, партиций: {len(partitions)}")
+
+
+_analytics_sink: AnalyticsSink | None = None
+_analytics_sink_lock = threading.Lock()
+
+
+def get_analytics_sink() -> AnalyticsSink:
+    """Буфер аналитики процесса (создаётся и запускается при первом обращении)"""
+    global _analytics_sink
+    with _analytics_sink_lock:
+        if _analytics_sink is None:
+            _analytics_sink = AnalyticsSink()
+            _analytics_sink.start()
+    return _analytics_sink
+
+
+def stop_analytics_sink() -> None:
+    """Сброс и остановка буфера процесса, если он создавался"""
+    if _analytics_sink is not None:
+        _analytics_sink.stop()
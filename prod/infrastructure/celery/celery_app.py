@@ -1,36 +1,48 @@
 import platform
+from functools import lru_cache
 from celery import Celery
-from celery.signals import after_setup_logger, after_setup_task_logger
+from celery.concurrency import get_implementation
+from celery.concurrency.prefork import TaskPool as PreforkTaskPool
+from celery.signals import after_setup_logger, after_setup_task_logger, worker_init, worker_process_init
 import logging
 
-from ..config.settings import settings
+from ..config.settings import get_settings
+from .event_routing import route_domain_event
+from .event_serializer import EVENT_SERIALIZER_NAME, register_event_serializer
+
+
+def get_celery_pool() -> str:
+    """Определение пула воркеров в зависимости от ОС"""
+    if platform.system().lower() == "windows":
+        # используем solo пул для избежания проблем с multiprocessing
+        return "solo"
+    return "prefork"
 
 
 def init_celery() -> Celery:
     """
     Инициализация Celery с продакшен-настройками
     """
+    # Бинарный сериализатор доменных событий должен быть известен и продюсеру, и воркеру
+    register_event_serializer()
+
+    settings = get_settings()
     celery_app = Celery(
         "notifications",
         broker=settings.CELERY_BROKER_URL,
         backend=settings.CELERY_RESULT_BACKEND,
         include=[
-            "prod.tasks.notifications_tasks",
-            "prod.tasks.event_tasks",
+            "prod.infrastructure.celery.tasks.notifications_tasks",
+            "prod.infrastructure.celery.tasks.event_tasks",
+            "prod.infrastructure.celery.tasks.broadcast_tasks",
+            "prod.infrastructure.celery.tasks.reminder_tasks",
         ],
     )
 
-    def get_celery_pool():
-        """Определение пула воркеров в зависимости от ОС"""
-        if platform.system().lower() == "windows":
-            # используем solo пул для избежания проблем с multiprocessing
-            return "solo"
-        return "prefork"
-
     # Продакшен-конфигурация
     celery_app.conf.update(
         task_serializer="json",
-        accept_content=["json"],
+        accept_content=["json", EVENT_SERIALIZER_NAME],
         result_serializer="json",
         timezone="UTC",
         enable_utc=True,
@@ -39,17 +51,49 @@ def init_celery() -> Celery:
         worker_prefetch_multiplier=1,  # Оптимизация для I/O-bound задач
         broker_connection_retry_on_startup=True,
         worker_pool=get_celery_pool(),
-        task_routes={
-            "prod.tasks.notifications_tasks.send_telegram_notification": {"queue": "notifications"},
-            "prod.tasks.event_tasks.handle_domain_event": {"queue": "events"},
+        beat_schedule={
+            # Напоминания о бронированиях: каждый тик забирает только наступившие
+            "dispatch-due-reminders": {
+                "task": "prod.infrastructure.celery.tasks.reminder_tasks.dispatch_due_reminders",
+                "schedule": settings.REMINDER_TICK_SECONDS,
+            },
         },
+        task_routes=(
+            # События распределяются по очередям events.N по хешу studio_id
+            route_domain_event,
+            {
+                "prod.infrastructure.celery.tasks.notifications_tasks.send_telegram_notification": {
+                    "queue": "notifications"
+                },
+            },
+        ),
     )
 
     return celery_app
 
 
-# Инициализация
-celery_app = init_celery()
+@lru_cache(maxsize=1)
+def get_celery_app() -> Celery:
+    """
+    Celery-приложение процесса, создаваемое при первом обращении
+
+    Импорт модулей prod не читает .env и не собирает Celery: это происходит только
+    там, где события действительно публикуются или обрабатываются
+    """
+    celery_app = init_celery()
+    # shared_task-задачи и current_app должны указывать на это приложение
+    celery_app.set_default()
+    return celery_app
+
+
+def __getattr__(name: str):
+    """
+    Ленивые атрибуты модуля: `celery_app` для прежних импортов и `app`,
+    который ищет `celery -A prod.infrastructure.celery.celery_app worker`
+    """
+    if name in ("celery_app", "app"):
+        return get_celery_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @after_setup_logger.connect
@@ -62,3 +106,32 @@ def setup_loggers(logger, *args, **kwargs):
     handler.setFormatter(formatter)
     logger.addHandler(handler)
     logger.setLevel(logging.INFO)
+
+
+def _register_event_handlers() -> None:
+    """Подписка обработчиков уведомлений в EventBus процесса, который выполняет задачи событий"""
+    from ..notifications.event_handlers import register_notification_handlers
+
+    register_notification_handlers()
+
+
+@worker_init.connect
+def register_handlers_on_worker_init(sender=None, **kwargs):
+    """
+    Регистрация обработчиков в процессе воркера для пулов solo, threads и gevent
+
+    Для prefork задачи выполняются в дочерних процессах, а потоки уведомлений
+    не переживают fork, поэтому там регистрация идёт по worker_process_init
+    """
+    pool_cls = sender.pool_cls
+    if isinstance(pool_cls, str):
+        pool_cls = get_implementation(pool_cls)
+    if issubclass(pool_cls, PreforkTaskPool):
+        return
+    _register_event_handlers()
+
+
+@worker_process_init.connect
+def register_handlers_on_worker_process_init(**kwargs):
+    """Регистрация обработчиков в дочернем процессе prefork-пула"""
+    _register_event_handlers()
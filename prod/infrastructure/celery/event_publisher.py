@@ -1,49 +1,117 @@
 import logging
-from celery import current_app
-from ...tasks.event_tasks import handle_domain_event
+from typing import Any, Dict, Protocol
+
+from ...application.services.event_bus import EventBus
+from ..config.settings import get_settings
+from .celery_app import get_celery_app
+from ..events.spill_queue import EventSpillQueue
+from .tasks.event_tasks import handle_domain_event
 
 logger = logging.getLogger(__name__)
 
 
+class EventTransport(Protocol):
+    """Транспорт, доставляющий сериализуемые данные события в другие процессы"""
+
+    def is_available(self) -> bool: ...
+
+    def send(self, event_data: Dict[str, Any]) -> None: ...
+
+
+class CeleryEventTransport:
+    """Доставка событий через Celery-задачу handle_domain_event"""
+
+    def __init__(self):
+        # Celery-приложение собирается только при создании транспорта
+        self.app = get_celery_app()
+
+    def is_available(self) -> bool:
+        # Проверяем соединение с брокером: сообщения в очереди дождутся воркеров
+        try:
+            with self.app.connection_for_write() as connection:
+                connection.ensure_connection(max_retries=1)
+            return True
+        except Exception:
+            return False
+
+    def send(self, event_data: Dict[str, Any]) -> None:
+        # Без встроенных повторов kombu: при недоступном брокере событие сразу уходит в буфер
+        handle_domain_event.apply_async((event_data,), retry=False)
+
+
+def create_event_transport(name: str) -> EventTransport:
+    """Создание транспорта по имени из настроек (EVENT_TRANSPORT)"""
+    if name == "celery":
+        return CeleryEventTransport()
+    if name == "redis_streams":
+        from ..events.redis_streams_transport import RedisStreamsEventTransport
+
+        return RedisStreamsEventTransport()
+    raise ValueError(f"Неизвестный транспорт событий: {name}")
+
+
 class DistributedEventPublisher:
     """
     Распределенный публикатор событий для межпроцессного взаимодействия
-    Использует Celery для доставки событий между процессами
+    Доставляет события между процессами через подключаемый транспорт (Celery по умолчанию).
+    Если транспорт недоступен, события копятся в локальном буфере (EventSpillQueue)
+    и отправляются фоновым потоком после его восстановления
     """
 
-    @staticmethod
-    def publish(event):
+    _transport: EventTransport | None = None
+    _spill_queue: EventSpillQueue | None = None
+
+    @classmethod
+    def configure(cls, transport: EventTransport, spill_queue: EventSpillQueue | None = None) -> None:
+        """Явная установка транспорта событий и буфера на время его недоступности"""
+        if cls._spill_queue is not None:
+            cls._spill_queue.stop()
+
+        cls._transport = transport
+        cls._spill_queue = spill_queue or EventSpillQueue(transport)
+        cls._spill_queue.start()
+        logger.info(f"🔧 Транспорт событий: {transport.__class__.__name__}")
+
+    @classmethod
+    def get_transport(cls) -> EventTransport:
+        """Текущий транспорт событий; по умолчанию создаётся по настройке EVENT_TRANSPORT"""
+        if cls._transport is None:
+            cls.configure(create_event_transport(get_settings().EVENT_TRANSPORT))
+        return cls._transport
+
+    @classmethod
+    def publish(cls, event):
         """
-        Публикация события во все процессы через Celery
+        Публикация события во все процессы через транспорт событий
 
         :param event: Объект доменного события
         """
         logger.info(f"🌐 Публикация события во все процессы: {event.__class__.__name__}")
         logger.debug(f"📦 Данные события: {event.__dict__}")
 
-        # Преобразование события в словарь для сериализации
+        # UUID и datetime передаются как есть: их упаковывает бинарный сериализатор событий
         event_data = {
             "event_type": event.__class__.__name__,
-            "event_id": str(event.event_id),
-            "occurred_at": event.occurred_at.isoformat(),
+            "event_id": event.event_id,
+            "occurred_at": event.occurred_at,
             "data": event.__dict__,
         }
 
-        # Отправка задачи в Celery для асинхронной обработки во всех воркерах
+        transport = cls.get_transport()
+
+        # Пока в буфере есть неотправленные события, новые встают за ними — порядок сохраняется
+        if not cls._spill_queue.has_backlog:
+            try:
+                transport.send(event_data)
+                logger.info(f"✅ Событие отправлено в транспорт: {event.__class__.__name__}")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Транспорт событий недоступен, событие буферизуется: {str(e)}")
+
         try:
-            # Проверяем, доступен ли Celery (если нет, логируем ошибку)
-            if current_app.control.inspect().stats():
-                handle_domain_event.delay(event_data)
-                logger.info(f"✅ Событие отправлено в очередь Celery: {event.__class__.__name__}")
-            else:
-                logger.warning("⚠️ Celery недоступен, событие будет обработано локально")
-                # Локальная обработка при отсутствии Celery
-                from .event_bus import EventBus
-
-                EventBus.publish(event)
+            cls._spill_queue.put(event_data)
+            logger.info(f"📼 Событие помещено в локальный буфер: {event.__class__.__name__}")
         except Exception as e:
-            logger.exception(f"❌ Ошибка при отправке события в Celery: {str(e)}")
-            # Резервная обработка события
-            from .event_bus import EventBus
-
+            logger.exception(f"❌ Ошибка при буферизации события: {str(e)}")
+            # Резервная обработка события в текущем процессе
             EventBus.publish(event)
@@ -0,0 +1,64 @@
+"""
+Распределение доменных событий по N очередям по хешу studio_id
+
+События одной студии всегда попадают в одну очередь (порядок внутри студии сохраняется,
+если очередь читает один воркер с concurrency=1), а «горячая» студия занимает
+только свою очередь и не задерживает остальные.
+
+Подсказка для запуска воркера на части очередей:
+    python -m prod.infrastructure.celery.event_routing --worker 0 --workers 2
+"""
+
+import argparse
+from typing import Any, Dict, List
+from uuid import UUID
+
+from ..config.settings import get_settings
+
+EVENTS_QUEUE_PREFIX = "events"
+HANDLE_DOMAIN_EVENT_TASK = "prod.infrastructure.celery.tasks.event_tasks.handle_domain_event"
+
+
+def event_queue_name(index: int) -> str:
+    return f"{EVENTS_QUEUE_PREFIX}.{index}"
+
+
+def all_event_queues(queue_count: int | None = None) -> List[str]:
+    """Имена всех очередей событий"""
+    return [event_queue_name(i) for i in range(queue_count or get_settings().EVENTS_QUEUE_COUNT)]
+
+
+def _shard_key(value: Any) -> int:
+    """Стабильный между процессами ключ шардирования (hash() для строк рандомизирован)"""
+    if isinstance(value, str):
+        value = UUID(value)
+    return value.int
+
+
+def event_queue_for(event_data: Dict[str, Any], queue_count: int | None = None) -> str:
+    """
+    Очередь для события: по studio_id, а для событий без студии (платежи) — по event_id
+    """
+    queue_count = queue_count or get_settings().EVENTS_QUEUE_COUNT
+    key = event_data["data"].get("studio_id") or event_data["event_id"]
+    return event_queue_name(_shard_key(key) % queue_count)
+
+
+def route_domain_event(name, args, kwargs, options, task=None, **kw):
+    """Celery-роутер (task_routes) для handle_domain_event"""
+    if name != HANDLE_DOMAIN_EVENT_TASK or not args:
+        return None
+    return {"queue": event_queue_for(args[0])}
+
+
+def worker_event_queues(worker_index: int, workers_count: int) -> List[str]:
+    """Очереди событий для воркера с номером worker_index из workers_count (по кругу)"""
+    return all_event_queues()[worker_index::workers_count]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Очереди событий для воркера Celery (-Q)")
+    parser.add_argument("--worker", type=int, default=0, help="Номер воркера, с нуля")
+    parser.add_argument("--workers", type=int, default=1, help="Всего воркеров событий")
+    args = parser.parse_args()
+    print(",".join(worker_event_queues(args.worker, args.workers)))
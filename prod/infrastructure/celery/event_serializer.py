@@ -0,0 +1,83 @@
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Iterator
+from uuid import UUID
+
+import msgpack
+from kombu.serialization import register
+
+# Имя сериализатора, под которым он регистрируется в kombu/Celery
+EVENT_SERIALIZER_NAME = "event-msgpack"
+EVENT_CONTENT_TYPE = "application/x-event-msgpack"
+
+# Коды ext-типов msgpack. Datetime с часовым поясом упаковывается встроенным
+# Timestamp (ext -1) и распаковывается в C без вызова _ext_hook; код 2 остаётся
+# для чтения сообщений, записанных до этого
+_EXT_UUID = 1
+_EXT_DATETIME_UTC = 2
+_EXT_DATETIME_NAIVE = 3
+
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_EPOCH_NAIVE = datetime(1970, 1, 1)
+
+# Микросекунды с начала эпохи, 8 байт big-endian
+_MICROSECONDS = struct.Struct(">q")
+
+
+def _default(obj: Any) -> msgpack.ExtType:
+    """Упаковка типов, которые msgpack не умеет сериализовать сам"""
+    if isinstance(obj, UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+
+    # Сюда попадают только datetime без часового пояса: остальные упаковывает msgpack
+    if isinstance(obj, datetime):
+        delta = obj - _EPOCH_NAIVE
+        microseconds = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+        return msgpack.ExtType(_EXT_DATETIME_NAIVE, _MICROSECONDS.pack(microseconds))
+
+    raise TypeError(f"Тип не поддерживается сериализатором событий: {type(obj).__name__}")
+
+
+def _ext_hook(code: int, payload: bytes) -> Any:
+    """Восстановление ext-типов при распаковке"""
+    if code == _EXT_UUID:
+        return UUID(bytes=payload)
+
+    if code == _EXT_DATETIME_UTC:
+        return _EPOCH_UTC + timedelta(microseconds=_MICROSECONDS.unpack(payload)[0])
+
+    if code == _EXT_DATETIME_NAIVE:
+        return _EPOCH_NAIVE + timedelta(microseconds=_MICROSECONDS.unpack(payload)[0])
+
+    return msgpack.ExtType(code, payload)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Компактная бинарная сериализация полезной нагрузки события
+
+    UUID упаковываются в 16 байт, datetime с часовым поясом — в Timestamp msgpack
+    (восстанавливается в UTC), вместо строковых представлений, которые использует JSON
+    """
+    return msgpack.packb(obj, default=_default, use_bin_type=True, datetime=True)
+
+
+def loads(data: bytes) -> Any:
+    """Десериализация полезной нагрузки события с восстановлением UUID и datetime"""
+    return msgpack.unpackb(data, ext_hook=_ext_hook, raw=False, strict_map_key=False, timestamp=3)
+
+
+def iter_loads(stream: BinaryIO) -> Iterator[Any]:
+    """Потоковая распаковка объектов, записанных в файл подряд через dumps"""
+    return msgpack.Unpacker(stream, ext_hook=_ext_hook, raw=False, strict_map_key=False, timestamp=3)
+
+
+def register_event_serializer() -> None:
+    """Регистрация сериализатора событий в kombu (повторная регистрация безопасна)"""
+    register(
+        EVENT_SERIALIZER_NAME,
+        dumps,
+        loads,
+        content_type=EVENT_CONTENT_TYPE,
+        content_encoding="binary",
+    )
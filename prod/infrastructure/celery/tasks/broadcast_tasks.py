@@ -0,0 +1,126 @@
+"""
+Рассылка сообщения всем клиентам студии (например, «студия закрыта в пятницу»)
+
+Вместо задачи на каждого клиента: chat_id получателей разрешаются пачками через MGET
+(TelegramNotifier.get_chat_ids), делятся на чанки по BROADCAST_CHUNK_SIZE, и каждый чанк — одна задача Celery,
+отправляющая сообщения параллельно через асинхронный движок доставки процесса
+(одна aiohttp.ClientSession с пулом keep-alive соединений).
+
+С NOTIFICATION_DISPATCHER_ENABLED канал каждого клиента выбирает NotificationDispatcher:
+получатели в Telegram идут теми же чанками (с исходами в общих DeliveryMetrics),
+в остальные каналы — через deliver_notification.
+"""
+
+import logging
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from celery import group, shared_task
+from celery.result import GroupResult
+
+from ....domain.communication_channels.communication_channel_enums import CommunicationChannelsTypesEnum
+from ...config.settings import get_settings
+from ...notifications.async_delivery import get_async_delivery
+from ...notifications.delivery_metrics import DEFERRED, FAILED, REJECTED, SENT
+from ...notifications.notification_dispatcher import NotificationDispatcher
+from ...notifications.rate_limiter import RateLimitExceeded
+from ...notifications.retry_mechanism import retry_later
+from ...notifications.telegram_errors import TelegramApiError
+from ...notifications.telegram_notifier import TELEGRAM_RETRY_POLICY, TelegramNotifier
+from ...redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+def broadcast_to_clients(
+    studio_id: UUID,
+    client_ids: Iterable[UUID | str],
+    text: str,
+    chunk_size: int | None = None,
+    notifier: TelegramNotifier | None = None,
+) -> GroupResult | None:
+    """
+    Постановка рассылки в очередь notifications
+
+    :param studio_id: Студия, от имени которой идёт рассылка (для логов)
+    :param client_ids: Клиенты студии — список получает вызывающий код из своего хранилища
+    :param text: Текст сообщения (HTML-разметка Telegram)
+    :param chunk_size: Получателей в одной задаче; по умолчанию BROADCAST_CHUNK_SIZE
+    :param notifier: Источник chat_id получателей; по умолчанию TelegramNotifier процесса
+    """
+    settings = get_settings()
+    chunk_size = chunk_size or settings.BROADCAST_CHUNK_SIZE
+    notifier = notifier or TelegramNotifier(settings.TELEGRAM_BOT_TOKEN, RedisClient())
+
+    if settings.NOTIFICATION_DISPATCHER_ENABLED:
+        dispatcher = NotificationDispatcher(notifier)
+        recipients = dispatcher.resolve_recipients(client_ids)
+        dispatcher.broadcast(recipients, text)
+        chat_ids = [int(chat_id) for chat_id in recipients.get(CommunicationChannelsTypesEnum.TELEGRAM, [])]
+    else:
+        # Несколько клиентов могут быть привязаны к одному чату: сообщение уходит один раз
+        chat_ids = list(dict.fromkeys(notifier.get_chat_ids(client_ids).values()))
+
+    if not chat_ids:
+        logger.warning(f"⚠️ Рассылка студии {studio_id}: нет получателей в Telegram")
+        return None
+
+    chunks = [chat_ids[start : start + chunk_size] for start in range(0, len(chat_ids), chunk_size)]
+    logger.info(f"📣 Рассылка студии {studio_id}: {len(chat_ids)} получателей, {len(chunks)} задач")
+    return group(send_broadcast_chunk.s(text, chunk) for chunk in chunks).apply_async()
+
+
+@shared_task(bind=True, max_retries=3, queue="notifications")
+def send_broadcast_chunk(self, text: str, chat_ids: List[int]) -> dict:
+    """
+    Отправка сообщения рассылки одному чанку получателей
+
+    Каждому получателю — одна попытка за запуск. Ретрай (через очередь, с экспоненциальной
+    задержкой) повторяет отправку только тем, кому она не удалась из-за сети или ошибки
+    сервера Telegram. Получатели, заблокировавшие бота (403) или с несуществующим
+    чатом (400), пропускаются без повторов. Получатели, для которых не нашлось слота
+    в лимитах Telegram прямо сейчас, не ждут его в воркере, а уходят отдельной задачей к ближайшему свободному слоту
+    """
+    results = get_async_delivery().send_many(
+        ((chat_id, text) for chat_id in chat_ids), max_attempts=1, max_wait=0
+    )
+
+    sent, skipped, failed, deferred, countdown = 0, 0, [], [], 0
+    error: BaseException | None = None
+    for chat_id, result in zip(chat_ids, results):
+        if isinstance(result, RateLimitExceeded):
+            deferred.append(chat_id)
+            countdown = max(countdown, result.countdown)
+        elif isinstance(result, TelegramApiError) and result.error_code in (400, 403):
+            logger.info(f"🚫 Чат {chat_id} недоступен для рассылки: {result.description}")
+            skipped += 1
+        elif isinstance(result, BaseException):
+            logger.warning(f"⚠️ Ошибка при отправке рассылки в чат {chat_id}: {str(result)}")
+            failed.append(chat_id)
+            error = result
+        else:
+            sent += 1
+
+    logger.info(
+        f"📣 Чанк рассылки: отправлено {sent}, пропущено {skipped}, с ошибкой {len(failed)}, "
+        f"отложено {len(deferred)}"
+    )
+
+    if get_settings().NOTIFICATION_DISPATCHER_ENABLED:
+        _record_delivery_metrics({SENT: sent, REJECTED: skipped, FAILED: len(failed), DEFERRED: len(deferred)})
+
+    if deferred:
+        send_broadcast_chunk.apply_async((text, deferred), countdown=countdown)
+
+    if failed and self.request.retries < self.max_retries:
+        raise retry_later(self, error, TELEGRAM_RETRY_POLICY, args=(text, failed))
+
+    return {"sent": sent, "skipped": skipped, "failed": len(failed), "deferred": len(deferred)}
+
+
+def _record_delivery_metrics(outcomes: Dict[str, int]) -> None:
+    """Исходы чанка — в общие метрики доставки диспетчера (канал telegram)"""
+    metrics = NotificationDispatcher(TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient())).metrics
+    for outcome, count in outcomes.items():
+        if count:
+            metrics.record(CommunicationChannelsTypesEnum.TELEGRAM, outcome, count=count)
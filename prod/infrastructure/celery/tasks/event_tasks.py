@@ -1,42 +1,53 @@
 from celery import shared_task
 import logging
-from datetime import datetime
-from uuid import UUID
 
-from ..application.services.event_bus import EventBus
+from ...events.dead_letter_store import get_dead_letter_store
+from ...events.event_deduplicator import EventInProgressError
+from ...events.event_dispatch import dispatch_event_data, get_event_deduplicator
+from ..event_serializer import EVENT_SERIALIZER_NAME
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(queue="events")
-def handle_domain_event(event_data):
+# Очередь не фиксируется: её выбирает route_domain_event по studio_id
+@shared_task(bind=True, max_retries=3, default_retry_delay=10, serializer=EVENT_SERIALIZER_NAME)
+def handle_domain_event(self, event_data):
     """
     Обработка доменных событий, полученных через Celery
 
-    Этот метод запускается в том же процессе, где работает TelegramNotifier,
-    поэтому EventBus имеет доступ ко всем зарегистрированным обработчикам
+    Обработчики уведомлений и напоминаний регистрируются в EventBus процесса воркера
+    сигналами worker_init/worker_process_init (см. celery_app).
+    Событие, которое не удалось обработать после всех ретраев, сохраняется в dead-letter
     """
     logger.info(f"📥 Получено событие через Celery: {event_data['event_type']}")
     logger.debug(f"🧩 Данные события: {event_data}")
 
     try:
-        # Восстановление объекта события из словаря
-        event_class = globals()[event_data["event_type"]]
-
-        # Создание объекта события
-        event_kwargs = event_data["data"].copy()
-        event_kwargs["event_id"] = UUID(event_kwargs["event_id"])
-        event_kwargs["occurred_at"] = datetime.fromisoformat(event_kwargs["occurred_at"])
-
-        event = event_class(**event_kwargs)
-
-        # Публикация события локальному EventBus
-        logger.info(f"🔔 Публикация события локальному EventBus: {event.__class__.__name__}")
-        EventBus.publish(event)
-        logger.info(f"✅ Событие успешно обработано: {event.__class__.__name__}")
-
+        # Восстановление объекта события через реестр типов и публикация локальному EventBus.
+        # Повторы (ретраи, повторная доставка брокером) отсекаются по event_id
+        if dispatch_event_data(event_data):
+            logger.info(f"✅ Событие успешно обработано: {event_data['event_type']}")
+
+    except EventInProgressError as e:
+        # Событие обрабатывает другой воркер: к моменту повтора оно будет обработано
+        # или отметка истечёт (если тот воркер упал)
+        if self.request.retries >= self.max_retries:
+            logger.error(f"❌ {str(e)}: ретраи исчерпаны, событие сохранено в dead-letter")
+            get_dead_letter_store().add(
+                event_data, e, attempts=self.request.retries + 1, source="celery"
+            )
+            return
+        logger.info(f"⏳ {str(e)}, повтор позже")
+        raise self.retry(exc=e, countdown=get_event_deduplicator().processing_ttl_seconds)
     except KeyError as e:
         logger.error(f"❌ Неизвестный тип события: {event_data['event_type']}")
+        # Ретрай не поможет: событие ждёт в dead-letter, пока тип не будет зарегистрирован
+        get_dead_letter_store().add(event_data, e, attempts=self.request.retries + 1, source="celery")
     except Exception as e:
         logger.exception(f"❌ Ошибка при обработке события: {str(e)}")
-        raise
+        if self.request.retries >= self.max_retries:
+            get_dead_letter_store().add(
+                event_data, e, attempts=self.request.retries + 1, source="celery"
+            )
+            return
+        raise self.retry(exc=e)
@@ -1,6 +1,13 @@
 from celery import shared_task
-from ..notifications.telegram_notifier import TelegramNotifier
-from ..redis_client import RedisClient
+from celery.signals import worker_process_shutdown, worker_shutdown
+from ...analytics.analytics_sink import stop_analytics_sink
+from ...config.settings import get_settings
+from ...notifications.notification_channels import ChannelRejectedError
+from ...notifications.notification_dispatcher import NotificationDispatcher
+from ...notifications.rate_limiter import RateLimitExceeded
+from ...notifications.retry_mechanism import retry_later
+from ...notifications.telegram_notifier import TELEGRAM_RETRY_POLICY, TelegramNotifier
+from ...redis_client import RedisClient
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,10 +36,75 @@ def send_telegram_notification(self, event_type: str, event_data: dict):
         raise self.retry(exc=exc)
 
 
-@shared_task(queue="analytics")
-def log_event_analytics(event_type: str, event_data: dict):
+@shared_task(bind=True, max_retries=3, queue="notifications")
+def send_telegram_message(self, chat_id: int, text: str):
     """
-    Асинхронная запись аналитики событий
+    Отправка готового сообщения, отложенного из-за лимитов Telegram или ошибки
+
+    Ответ 429 и исчерпанный лимит — не ошибка: задача ставится заново через
+    retry_after секунд, ретраи при этом не тратятся. Ошибка — одна попытка на запуск,
+    повтор через очередь с экспоненциальной задержкой (retry_later); отказ Telegram
+    (чат не найден, бот заблокирован) не повторяется
     """
-    # TODO: реализация отправки в систему аналитики
-    pass
+    notifier = TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient())
+    try:
+        notifier.send_message(chat_id, text, blocking_retries=False)
+    except RateLimitExceeded as exc:
+        logger.info(f"⏳ Сообщение в чат {chat_id} снова отложено на {exc.countdown}с")
+        send_telegram_message.apply_async((chat_id, text), countdown=exc.countdown)
+    except Exception as exc:
+        if not TelegramNotifier.is_retryable(exc):
+            logger.warning(f"⚠️ Сообщение в чат {chat_id} отклонено Telegram: {exc}")
+            return
+        logger.error(f"❌ Не удалось отправить отложенное сообщение в чат {chat_id}: {exc}")
+        raise retry_later(self, exc, TELEGRAM_RETRY_POLICY)
+
+
+@shared_task(bind=True, max_retries=3, queue="notifications")
+def deliver_notification(
+    self, channel_type: str, recipient: str, text: str, delivery_id: str | None = None
+):
+    """
+    Отправка уведомления в канал клиента (Telegram, VK, WhatsApp)
+
+    Общая очередь всех каналов: лимиты и повторы применяет сам канал, исход
+    записывается в метрики доставки. Лимит канала — перенос без траты ретраев,
+    отказ канала (неверный получатель, запрет сообщений) не повторяется, ошибка —
+    повтор через очередь по политике канала. delivery_id один на все повторы и
+    переносы: по нему канал отсекает повторную доставку (random_id в VK)
+    """
+    dispatcher = NotificationDispatcher(TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient()))
+    try:
+        dispatcher.deliver(channel_type, recipient, text, blocking_retries=False, delivery_id=delivery_id)
+    except RateLimitExceeded as exc:
+        logger.info(f"⏳ Уведомление в {channel_type} отложено на {exc.countdown}с")
+        deliver_notification.apply_async(
+            (channel_type, recipient, text, delivery_id), countdown=exc.countdown
+        )
+    except ChannelRejectedError as exc:
+        logger.warning(f"⚠️ Уведомление в {channel_type} отклонено: {exc}")
+    except Exception as exc:
+        logger.error(f"❌ Не удалось отправить уведомление в {channel_type}: {exc}")
+        raise retry_later(self, exc, dispatcher.retry_policy(channel_type))
+
+
+@shared_task(queue="notifications")
+def flush_telegram_digest(chat_id: int):
+    """
+    Отправка дайджеста чата: накопленные за окно уведомления одним сообщением
+
+    Планируется первым уведомлением окна с countdown=TELEGRAM_DIGEST_WINDOW.
+    С NOTIFICATION_DISPATCHER_ENABLED сообщения дайджеста идут через deliver_notification
+    """
+    notifier = TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient())
+    if get_settings().NOTIFICATION_DISPATCHER_ENABLED:
+        NotificationDispatcher(notifier).flush_digest(chat_id)
+    else:
+        notifier.flush_digest(chat_id)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def flush_event_analytics(**kwargs):
+    """Сброс буфера аналитики при остановке воркера (atexit в дочерних процессах не вызывается)"""
+    stop_analytics_sink()
@@ -0,0 +1,74 @@
+import logging
+from typing import Any, Dict
+
+from celery import group, shared_task
+
+from ...config.settings import get_settings
+from ...notifications.notification_dispatcher import NotificationDispatcher
+from ...notifications.rate_limiter import RateLimitExceeded
+from ...notifications.reminder_scheduler import get_reminder_scheduler
+from ...notifications.retry_mechanism import retry_later
+from ...notifications.telegram_notifier import TELEGRAM_RETRY_POLICY, TelegramNotifier
+from ...redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(queue="notifications")
+def dispatch_due_reminders() -> int:
+    """
+    Тик beat: наступившие напоминания извлекаются пачками и ставятся в очередь notifications
+
+    Возвращает количество поставленных напоминаний
+    """
+    scheduler = get_reminder_scheduler()
+    batch_size = get_settings().REMINDER_BATCH_SIZE
+    dispatched = 0
+
+    while True:
+        reminders = scheduler.pop_due(batch_size)
+        if not reminders:
+            break
+
+        try:
+            group(send_booking_reminder.s(reminder) for reminder in reminders).apply_async()
+        except Exception as e:
+            logger.exception(f"❌ Не удалось поставить напоминания в очередь: {str(e)}")
+            scheduler.restore(reminders)
+            raise
+
+        dispatched += len(reminders)
+        if len(reminders) < batch_size:
+            break
+
+    if dispatched:
+        logger.info(f"⏰ Поставлено напоминаний о бронированиях: {dispatched}")
+    return dispatched
+
+
+@shared_task(bind=True, max_retries=3, queue="notifications")
+def send_booking_reminder(self, reminder: Dict[str, Any]) -> None:
+    """
+    Отправка напоминания клиенту о предстоящем бронировании
+
+    С NOTIFICATION_DISPATCHER_ENABLED напоминание уходит в канал клиента через
+    диспетчер (deliver_notification: лимиты, повторы и метрики канала). Иначе —
+    в Telegram: одна попытка на запуск, повтор через очередь с экспоненциальной
+    задержкой; отказ Telegram (чат не найден, бот заблокирован) не повторяется
+    """
+    try:
+        notifier = TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient())
+        if get_settings().NOTIFICATION_DISPATCHER_ENABLED:
+            NotificationDispatcher(notifier).dispatch_reminder(reminder)
+            return
+        notifier.send_booking_reminder(reminder, blocking_retries=False)
+    except RateLimitExceeded as exc:
+        # Не ошибка, а очередь к лимиту Telegram: новая задача к свободному слоту, ретраи не тратятся
+        logger.info(f"⏳ Напоминание о брони {reminder['booking_id']} отложено на {exc.countdown}с")
+        send_booking_reminder.apply_async((reminder,), countdown=exc.countdown)
+    except Exception as exc:
+        if not TelegramNotifier.is_retryable(exc):
+            logger.warning(f"⚠️ Напоминание о брони {reminder['booking_id']} отклонено Telegram: {exc}")
+            return
+        logger.error(f"❌ Не удалось отправить напоминание о брони {reminder['booking_id']}: {exc}")
+        raise retry_later(self, exc, TELEGRAM_RETRY_POLICY)
@@ -0,0 +1,107 @@
+"""
+Профили воркеров Celery по типу нагрузки очередей
+
+- notifications — I/O (HTTP в Telegram, Redis): пул потоков или green-потоков
+  с высокой степенью параллелизма вместо отдельного процесса на каждый слот;
+- events — очереди events.N по одному слоту, чтобы события студии обрабатывались
+  по порядку; масштабируется числом воркеров, каждый читает свою часть очередей;
+- cpu — вычислительные задачи (например, хеширование паролей): prefork по числу ядер.
+
+Запуск: python -m prod.infrastructure.celery.worker_profiles notifications
+        python -m prod.infrastructure.celery.worker_profiles events --worker 0 --workers 2
+"""
+
+import argparse
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from ..config.settings import get_settings
+from .celery_app import get_celery_app, get_celery_pool
+from .event_routing import all_event_queues, worker_event_queues
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATIONS_QUEUE = "notifications"
+CPU_QUEUE = "cpu"
+
+
+@dataclass(frozen=True)
+class WorkerProfile:
+    """Профиль воркера: какие очереди читать, каким пулом и с каким параллелизмом"""
+
+    name: str
+    queues: Tuple[str, ...]
+    pool: str
+    concurrency: int
+    prefetch_multiplier: int = 1
+
+    def worker_argv(self, queues: List[str] | None = None) -> List[str]:
+        """Аргументы для `celery worker` (app.worker_main)"""
+        return [
+            "worker",
+            f"--hostname={self.name}@%h",
+            f"--pool={self.pool}",
+            f"--concurrency={self.concurrency}",
+            f"--prefetch-multiplier={self.prefetch_multiplier}",
+            f"--queues={','.join(queues or self.queues)}",
+        ]
+
+
+def get_worker_profiles() -> Dict[str, WorkerProfile]:
+    """Профили воркеров по настройкам приложения"""
+    settings = get_settings()
+
+    # threads/gevent не поддерживают жёсткий task_time_limit — для I/O-задач это приемлемо,
+    # их ограничивают таймауты HTTP-запросов
+    return {
+        "notifications": WorkerProfile(
+            name="notifications",
+            queues=(NOTIFICATIONS_QUEUE,),
+            pool=settings.IO_WORKER_POOL,
+            concurrency=settings.NOTIFICATIONS_WORKER_CONCURRENCY,
+        ),
+        "events": WorkerProfile(
+            name="events",
+            queues=tuple(all_event_queues()),
+            pool=settings.IO_WORKER_POOL,
+            concurrency=settings.EVENTS_WORKER_CONCURRENCY,
+        ),
+        "cpu": WorkerProfile(
+            name="cpu",
+            queues=(CPU_QUEUE,),
+            pool=get_celery_pool(),
+            concurrency=settings.CPU_WORKER_CONCURRENCY or os.cpu_count() or 1,
+        ),
+    }
+
+
+def run_worker(profile_name: str, worker_index: int = 0, workers_count: int = 1) -> None:
+    """Запуск воркера с профилем; для events можно взять только часть очередей"""
+    profile = get_worker_profiles()[profile_name]
+
+    queues = None
+    if profile_name == "events":
+        if profile.concurrency > 1:
+            logger.warning(
+                f"⚠️ Воркер событий с concurrency={profile.concurrency}: "
+                f"порядок событий внутри студии не гарантируется"
+            )
+        if workers_count > 1:
+            queues = worker_event_queues(worker_index, workers_count)
+
+    get_celery_app().worker_main(profile.worker_argv(queues))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Запуск воркера Celery по профилю нагрузки")
+    parser.add_argument("profile", choices=["notifications", "events", "cpu"])
+    parser.add_argument("--worker", type=int, default=0, help="Номер воркера событий, с нуля")
+    parser.add_argument("--workers", type=int, default=1, help="Всего воркеров событий")
+    args = parser.parse_args()
+    run_worker(args.profile, args.worker, args.workers)
+
+
+if __name__ == "__main__":
+    main()
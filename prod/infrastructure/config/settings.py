@@ -1,5 +1,6 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -23,9 +24,135 @@ class Settings(BaseSettings):
     # Logging
     LOG_LEVEL: str
 
+    # Транспорт доменных событий: "celery" или "redis_streams"
+    EVENT_TRANSPORT: str = "celery"
+    EVENTS_STREAM_NAME: str = "events:stream"
+    EVENTS_STREAM_GROUP: str = "event-handlers"
+    EVENTS_STREAM_MAXLEN: int = 100_000
+
+    # Локальный буфер событий на время недоступности брокера
+    EVENTS_SPILL_DIR: str = ".event_spill"
+    EVENTS_SPILL_MEMORY_SIZE: int = 10_000
+    EVENTS_SPILL_SEGMENT_BYTES: int = 16 * 1024 * 1024
+
+    # Число очередей событий Celery (events.0 … events.N-1), шардирование по studio_id
+    EVENTS_QUEUE_COUNT: int = 4
+
+    # Профили воркеров Celery: пул для I/O-очередей ("threads", "gevent" или "eventlet")
+    IO_WORKER_POOL: str = "threads"
+    NOTIFICATIONS_WORKER_CONCURRENCY: int = 64
+    # Порядок событий студии сохраняется, только пока каждую очередь events.N читает
+    # один слот: больше 1 — параллельная обработка без гарантии порядка
+    EVENTS_WORKER_CONCURRENCY: int = 1
+    CPU_WORKER_CONCURRENCY: Optional[int] = None  # по умолчанию — число ядер
+
+    # Адрес Telegram Bot API; для нагрузочных тестов — локальный сервер
+    # (python -m prod.benchmarks.telegram_api_server)
+    TELEGRAM_API_URL: str = "https://api.telegram.org"
+
+    # Соединений с Telegram Bot API в пуле процесса: не меньше числа потоков воркера
+    TELEGRAM_HTTP_POOL_SIZE: int = 64
+
+    # Доставка в Telegram: "sync" (requests в потоке обработчика) или "async"
+    # (общая aiohttp.ClientSession, не больше TELEGRAM_MAX_IN_FLIGHT запросов одновременно)
+    TELEGRAM_DELIVERY_MODE: str = "sync"
+    TELEGRAM_MAX_IN_FLIGHT: int = 100
+    TELEGRAM_REQUEST_TIMEOUT: float = 15.0
+
+    # Повтор неудачной отправки уведомления из обработчика события: False — задачей Celery
+    # с countdown (поток не ждёт), True — паузами в том же потоке (запуск без Celery)
+    NOTIFICATION_BLOCKING_RETRIES: bool = False
+    # Задача Celery ждёт слот в лимите канала не дольше этого, дальше — перенос с countdown
+    NOTIFICATION_QUEUED_MAX_WAIT: float = 1.0
+
+    # Лимиты Telegram Bot API, общие для всех воркеров (token bucket в Redis):
+    # сообщений/с на бота (со всплеском до TELEGRAM_GLOBAL_BURST) и на один чат.
+    # Слот ждётся не дольше TELEGRAM_RATE_LIMIT_MAX_WAIT секунд, иначе отправка откладывается
+    TELEGRAM_RATE_LIMIT_ENABLED: bool = True
+    TELEGRAM_GLOBAL_RATE_LIMIT: float = 30.0
+    TELEGRAM_GLOBAL_BURST: int = 1
+    TELEGRAM_CHAT_RATE_LIMIT: float = 1.0
+    TELEGRAM_RATE_LIMIT_MAX_WAIT: float = 30.0
+
+    # Кэш chat_id внутри процесса (LRU с TTL) перед Redis. Изменения привязок приходят
+    # через pub/sub; TTL ограничивает устаревание, если сообщение об изменении потеряно.
+    # Клиенты без привязанного Telegram запоминаются на TELEGRAM_CHAT_ID_NEGATIVE_TTL секунд
+    TELEGRAM_CHAT_ID_CACHE_SIZE: int = 10_000
+    TELEGRAM_CHAT_ID_CACHE_TTL: float = 600.0
+    TELEGRAM_CHAT_ID_NEGATIVE_TTL: float = 60.0
+    TELEGRAM_CHAT_ID_INVALIDATION_ENABLED: bool = True
+
+    # Тексты уведомлений: локаль по умолчанию, часовой пояс (не задан — время брони
+    # выводится в её собственном часовом поясе), JSON с текстами студий
+    NOTIFICATION_LOCALE: str = "ru"
+    NOTIFICATION_TIMEZONE: Optional[str] = None
+    NOTIFICATION_TEMPLATES_PATH: Optional[str] = None
+
+    # Дайджест: уведомления одному чату за TELEGRAM_DIGEST_WINDOW секунд уходят одним
+    # сообщением (0 — дайджест отключён), сброс раньше окна — при TELEGRAM_DIGEST_MAX_MESSAGES.
+    # Срочные типы уведомлений отправляются сразу
+    TELEGRAM_DIGEST_WINDOW: float = 0.0
+    TELEGRAM_DIGEST_MAX_MESSAGES: int = 10
+    TELEGRAM_DIGEST_URGENT_TYPES: List[str] = ["BookingCancelledEvent"]
+
+    # Мультиканальные уведомления: канал клиента выбирается по его CommunicationChannel
+    # в порядке NOTIFICATION_CHANNEL_PRIORITY (нет записей — привязка Telegram по chat_id).
+    # Отправки всех каналов идут через очередь notifications, метрики — в одном хеше Redis
+    NOTIFICATION_DISPATCHER_ENABLED: bool = False
+    NOTIFICATION_CHANNEL_PRIORITY: List[str] = ["telegram", "whatsapp", "vk"]
+
+    # VK: сообщения от имени сообщества (messages.send); канал включён, если задан токен
+    VK_GROUP_TOKEN: Optional[str] = None
+    VK_GROUP_ID: str = "0"
+    VK_API_URL: str = "https://api.vk.com/method"
+    VK_API_VERSION: str = "5.199"
+    VK_HTTP_POOL_SIZE: int = 16
+    VK_RATE_LIMIT: float = 20.0
+    VK_PEER_RATE_LIMIT: float = 1.0
+    VK_RATE_LIMIT_MAX_WAIT: float = 30.0
+
+    # WhatsApp Cloud API; канал включён, если заданы токен и id номера отправителя.
+    # Одному получателю — не чаще раза в ~6 секунд (pair rate limit WhatsApp)
+    WHATSAPP_ACCESS_TOKEN: Optional[str] = None
+    WHATSAPP_PHONE_NUMBER_ID: Optional[str] = None
+    WHATSAPP_API_URL: str = "https://graph.facebook.com/v21.0"
+    WHATSAPP_HTTP_POOL_SIZE: int = 16
+    WHATSAPP_RATE_LIMIT: float = 80.0
+    WHATSAPP_RECIPIENT_RATE_LIMIT: float = 0.15
+    WHATSAPP_RATE_LIMIT_MAX_WAIT: float = 30.0
+
+    # Рассылка всем клиентам студии: получателей в одной задаче Celery
+    BROADCAST_CHUNK_SIZE: int = 500
+
+    # Напоминания о бронированиях: за сколько часов до начала, период тика beat
+    # и сколько напоминаний извлекается из индекса за раз
+    BOOKING_REMINDER_HOURS_BEFORE: int = 24
+    REMINDER_TICK_SECONDS: float = 30.0
+    REMINDER_BATCH_SIZE: int = 500
+
+    # Аналитика событий: обработанные события пишутся в буфер процесса (dispatch_event_data),
+    # каталог файлов и условия сброса буфера (N событий или T секунд)
+    ANALYTICS_ENABLED: bool = True
+    ANALYTICS_DIR: str = ".analytics"
+    ANALYTICS_FLUSH_EVENTS: int = 1000
+    ANALYTICS_FLUSH_SECONDS: float = 5.0
+
+    # Идемпотентная обработка событий
+    EVENTS_DEDUP_TTL_SECONDS: int = 86_400
+    # Время жизни отметки "обрабатывается": после падения воркера событие обработается заново
+    EVENTS_DEDUP_PROCESSING_TTL_SECONDS: int = 300
+    EVENTS_DEDUP_LOCAL_SIZE: int = 100_000
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Настройки приложения, загружаемые при первом обращении
+
+    .env читается не при импорте модуля, а только когда настройки действительно нужны
+    """
+    return Settings()
@@ -0,0 +1,104 @@
+"""
+Повторная публикация событий из dead-letter хранилища
+
+Запуск: python -m prod.infrastructure.events.dead_letter_replay --batch-size 500 --rate 200
+"""
+
+import argparse
+import logging
+import time
+
+from ..celery.event_publisher import EventTransport, create_event_transport
+from ..config.settings import get_settings
+from .dead_letter_store import DeadLetterStore
+
+logger = logging.getLogger(__name__)
+
+
+def replay_dead_letters(
+    store: DeadLetterStore,
+    transport: EventTransport,
+    batch_size: int = 500,
+    rate: float | None = None,
+    limit: int | None = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Отправка событий из dead-letter обратно в транспорт пачками
+
+    - rate — ограничение в событиях в секунду (None — без ограничения);
+    - запись удаляется из хранилища только после успешной отправки;
+    - при ошибке отправки воспроизведение останавливается, неотправленное остаётся в хранилище
+
+    Возвращает количество отправленных событий
+    """
+    replayed = 0
+    started = time.monotonic()
+
+    for batch in store.iter_batches(batch_size, limit):
+        if dry_run:
+            for entry_id, event_data in batch:
+                logger.info(f"🔍 {entry_id.decode()}: {event_data['event_type']} {event_data['event_id']}")
+            replayed += len(batch)
+            continue
+
+        sent_ids = []
+        try:
+            for entry_id, event_data in batch:
+                # Выравнивание по заданной скорости перед каждым событием: пачка
+                # определяет только частоту чтения и удаления, а не всплеск отправок
+                if rate:
+                    ahead = (replayed + len(sent_ids)) / rate - (time.monotonic() - started)
+                    if ahead > 0:
+                        time.sleep(ahead)
+                transport.send(event_data)
+                sent_ids.append(entry_id)
+        finally:
+            store.delete(sent_ids)
+            replayed += len(sent_ids)
+
+        logger.info(f"♻️ Отправлено повторно: {replayed}")
+
+    return replayed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Повторная публикация событий из dead-letter")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=None, help="Событий в секунду")
+    parser.add_argument("--limit", type=int, default=None, help="Максимум событий за запуск")
+    parser.add_argument(
+        "--transport",
+        default=None,
+        choices=["celery", "redis_streams"],
+        help="Транспорт для повторной публикации (по умолчанию EVENT_TRANSPORT)",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Только показать события")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, get_settings().LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    store = DeadLetterStore()
+    logger.info(f"📦 Событий в dead-letter: {store.count()}")
+
+    started = time.monotonic()
+    replayed = replay_dead_letters(
+        store,
+        create_event_transport(args.transport or get_settings().EVENT_TRANSPORT),
+        batch_size=args.batch_size,
+        rate=args.rate,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"✅ Обработано {replayed} событий за {elapsed:.1f} с "
+        f"({replayed / elapsed if elapsed else 0:.0f} событий/с), осталось: {store.count()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import logging
+import traceback
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+import redis
+
+from ..celery.event_serializer import dumps, loads
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+DEAD_LETTER_STREAM = "events:dead_letter"
+
+
+class DeadLetterStore:
+    """
+    Хранилище событий, обработка которых не удалась после всех попыток
+
+    Записи лежат в Redis Stream: порядок поступления сохраняется, а чтение
+    пачками через XRANGE не зависит от размера накопившегося объёма
+    """
+
+    def __init__(self, redis_connection: redis.Redis | None = None, stream: str = DEAD_LETTER_STREAM):
+        self.redis = redis_connection or create_redis_connection(decode_responses=False)
+        self.stream = stream
+
+    def add(
+        self, event_data: Dict[str, Any], error: BaseException, attempts: int, source: str
+    ) -> bytes:
+        """Сохранение события вместе с исключением и количеством попыток"""
+        entry_id = self.redis.xadd(
+            self.stream,
+            {
+                "payload": dumps(event_data),
+                "event_type": str(event_data.get("event_type")),
+                "event_id": str(event_data.get("event_id")),
+                "error_type": type(error).__name__,
+                "error": str(error),
+                "traceback": "".join(traceback.format_exception(error)),
+                "attempts": attempts,
+                "source": source,
+                "failed_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+        logger.error(
+            f"☠️ Событие {event_data.get('event_id')} ({event_data.get('event_type')}) "
+            f"помещено в dead-letter после {attempts} попыток: {error}"
+        )
+        return entry_id
+
+    def count(self) -> int:
+        return self.redis.xlen(self.stream)
+
+    def iter_batches(
+        self, batch_size: int, limit: int | None = None
+    ) -> Iterator[List[Tuple[bytes, Dict[str, Any]]]]:
+        """
+        Чтение записей пачками от старых к новым
+
+        Каждая запись — (entry_id, event_data). Курсор двигается по id, поэтому
+        удаление уже прочитанных записей во время обхода безопасно
+        """
+        start = "-"
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            count = batch_size if remaining is None else min(batch_size, remaining)
+            entries = self.redis.xrange(self.stream, min=start, max="+", count=count)
+            if not entries:
+                return
+
+            yield [(entry_id, loads(fields[b"payload"])) for entry_id, fields in entries]
+
+            if remaining is not None:
+                remaining -= len(entries)
+            # Исключающая граница: продолжаем после последней прочитанной записи
+            start = b"(" + entries[-1][0]
+
+    def delete(self, entry_ids: List[bytes]) -> int:
+        """Удаление записей (после успешной повторной публикации)"""
+        if not entry_ids:
+            return 0
+        return self.redis.xdel(self.stream, *entry_ids)
+
+
+_dead_letter_store: DeadLetterStore | None = None
+
+
+def get_dead_letter_store() -> DeadLetterStore:
+    """Хранилище dead-letter процесса (создаётся при первом обращении)"""
+    global _dead_letter_store
+    if _dead_letter_store is None:
+        _dead_letter_store = DeadLetterStore()
+    return _dead_letter_store
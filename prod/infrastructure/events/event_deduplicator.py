@@ -0,0 +1,108 @@
+import logging
+import threading
+from collections import OrderedDict
+from uuid import UUID
+
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_PROCESSING = "processing"
+_DONE = "done"
+
+
+class EventInProgressError(Exception):
+    """Событие сейчас обрабатывает другой вызов: повтор нужно отложить, а не отбросить"""
+
+
+class EventDeduplicator:
+    """
+    Защита от повторной обработки одного и того же события (ключ — event_id)
+
+    Повторы после ретраев Celery и повторной доставки брокером отсекаются в два уровня:
+    - ограниченный LRU внутри процесса — повтор стоит одного локального поиска;
+    - SET NX с TTL в Redis — общая отметка для всех воркеров
+
+    Отметка ставится в два шага: claim — "processing" с коротким TTL, complete — "done"
+    на ttl_seconds. Если воркер упал посреди обработки, отметка истекает через
+    processing_ttl_seconds, и повторная доставка обработает событие заново
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        ttl_seconds: int | None = None,
+        processing_ttl_seconds: int | None = None,
+        local_capacity: int | None = None,
+        key_prefix: str = "events:processed:",
+    ):
+        self.redis_client = redis_client
+        self.ttl_seconds = ttl_seconds or get_settings().EVENTS_DEDUP_TTL_SECONDS
+        self.processing_ttl_seconds = (
+            processing_ttl_seconds or get_settings().EVENTS_DEDUP_PROCESSING_TTL_SECONDS
+        )
+        self.local_capacity = local_capacity or get_settings().EVENTS_DEDUP_LOCAL_SIZE
+        self.key_prefix = key_prefix
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str) -> None:
+        with self._lock:
+            self._seen[key] = None
+            self._seen.move_to_end(key)
+            if len(self._seen) > self.local_capacity:
+                self._seen.popitem(last=False)
+
+    def claim(self, event_id: UUID | str) -> bool:
+        """
+        Захват события на обработку
+
+        True — событие ещё не обрабатывалось и теперь закреплено за текущим вызовом
+        (после обработки нужно вызвать complete), False — событие уже обработано.
+        EventInProgressError — событие обрабатывается другим вызовом прямо сейчас
+        """
+        key = str(event_id)
+
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return False
+
+        acquired = self.redis_client.set_nx(
+            f"{self.key_prefix}{key}", _PROCESSING, self.processing_ttl_seconds
+        )
+
+        if acquired is None:
+            # Redis недоступен: лучше возможный дубль, чем потерянное событие
+            logger.warning(f"⚠️ Не удалось проверить повтор события {key}, обрабатываем")
+            return True
+
+        if acquired:
+            return True
+
+        state = self.redis_client.get(f"{self.key_prefix}{key}")
+        if state == _PROCESSING:
+            raise EventInProgressError(f"Событие {key} уже обрабатывается")
+        if state == _DONE:
+            self._remember(key)
+            return False
+
+        # Отметка истекла между SET NX и GET или Redis не ответил: событие никто
+        # не обработал, поэтому повтор лучше потери
+        logger.warning(f"⚠️ Отметка события {key} исчезла до проверки, обрабатываем")
+        return True
+
+    def complete(self, event_id: UUID | str) -> None:
+        """Отметка успешно обработанного события: повторы отсекаются в течение ttl_seconds"""
+        key = str(event_id)
+        self.redis_client.setex(f"{self.key_prefix}{key}", self.ttl_seconds, _DONE)
+        self._remember(key)
+
+    def release(self, event_id: UUID | str) -> None:
+        """Снятие отметки, чтобы ретрай после ошибки смог обработать событие заново"""
+        key = str(event_id)
+
+        with self._lock:
+            self._seen.pop(key, None)
+
+        self.redis_client.delete(f"{self.key_prefix}{key}")
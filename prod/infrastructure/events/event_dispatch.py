@@ -0,0 +1,105 @@
+import logging
+from typing import Any, Dict
+
+from ...application.services.event_bus import EventBus
+from ...application.services.event_registry import EventRegistry
+from ..analytics.analytics_sink import get_analytics_sink
+from ..config.settings import get_settings
+from .event_deduplicator import EventDeduplicator
+
+logger = logging.getLogger(__name__)
+
+_deduplicator: EventDeduplicator | None = None
+
+
+def configure_event_deduplicator(deduplicator: EventDeduplicator) -> None:
+    """Явная установка дедупликатора событий (например, с другим Redis-клиентом)"""
+    global _deduplicator
+    _deduplicator = deduplicator
+
+
+def get_event_deduplicator() -> EventDeduplicator:
+    """Дедупликатор событий процесса; по умолчанию создаётся поверх RedisClient"""
+    global _deduplicator
+    if _deduplicator is None:
+        from ..redis_client import RedisClient
+
+        _deduplicator = EventDeduplicator(RedisClient())
+    return _deduplicator
+
+
+def decode_event_data(event_data: Dict[str, Any]):
+    """
+    Восстановление объекта события из сообщения транспорта
+
+    KeyError — если тип события не зарегистрирован в EventRegistry
+    """
+    decoder = EventRegistry.get_decoder(event_data["event_type"])
+    event_kwargs = event_data["data"]
+
+    # Строки вместо UUID приходят только из JSON-сообщений,
+    # поставленных в очередь до перехода на бинарный сериализатор
+    if isinstance(event_kwargs["event_id"], str):
+        return decoder.from_legacy_json(event_kwargs)
+    return decoder(event_kwargs)
+
+
+def dispatch_event_data(event_data: Dict[str, Any]) -> bool:
+    """
+    Восстановление события и публикация его локальному EventBus
+
+    Повторно доставленные события (тот же event_id) пропускаются.
+    Возвращает False, если событие оказалось повтором; EventInProgressError —
+    событие сейчас обрабатывает другой воркер, доставку нужно повторить позже.
+
+    Событие отмечается обработанным только после публикации: если процесс упал
+    раньше, повторная доставка обработает его заново. Исключения обработчиков
+    EventBus перехватывает сам, поэтому для них гарантия — не более одного раза:
+    обработчик, которому нужны повторы, ставит свою работу в очередь (как отправка
+    уведомлений через задачи Celery)
+    """
+    event_id = event_data["event_id"]
+    deduplicator = get_event_deduplicator()
+
+    if not deduplicator.claim(event_id):
+        logger.info(f"♻️ Повтор события {event_id} пропущен: {event_data['event_type']}")
+        return False
+
+    try:
+        event = decode_event_data(event_data)
+
+        logger.info(f"🔔 Публикация события локальному EventBus: {event.__class__.__name__}")
+        EventBus.publish(event)
+    except Exception:
+        # Отметка снимается, чтобы ретрай смог обработать событие
+        deduplicator.release(event_id)
+        raise
+
+    deduplicator.complete(event_id)
+
+    if get_settings().ANALYTICS_ENABLED:
+        record_event_analytics(event)
+    return True
+
+
+def record_event_analytics(event) -> None:
+    """
+    Запись обработанного события в буфер аналитики процесса (одно добавление в список)
+
+    Данные собираются из восстановленного события, поэтому и сообщения старого
+    JSON-формата попадают в аналитику с UUID и datetime. Сбой записи на диск
+    не влияет на обработку события: ошибка только логируется
+    """
+    event_type = event.__class__.__name__
+    try:
+        get_analytics_sink().record(
+            event_type,
+            {
+                "event_type": event_type,
+                "event_id": event.event_id,
+                "occurred_at": event.occurred_at,
+                "data": event.__dict__,
+            },
+        )
+    except Exception as e:
+        logger.warning(f"⚠️ Аналитика события {event.event_id} не записана: {str(e)}")
@@ -0,0 +1,261 @@
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+
+import redis
+from redis.exceptions import ResponseError
+
+from ..celery.event_serializer import dumps, loads
+from ..config.settings import get_settings
+from ..redis_client import create_redis_connection
+from .dead_letter_store import DeadLetterStore, get_dead_letter_store
+from .event_deduplicator import EventInProgressError
+from .event_dispatch import dispatch_event_data
+
+logger = logging.getLogger(__name__)
+
+# Поле записи потока, в котором лежит сериализованное событие
+_PAYLOAD_FIELD = b"payload"
+
+
+class RedisStreamsEventTransport:
+    """
+    Транспорт доменных событий поверх Redis Streams
+
+    Одна запись потока — одно событие; без идентификаторов задач, result backend
+    и прочих накладных расходов Celery
+    """
+
+    def __init__(
+        self,
+        redis_connection: redis.Redis | None = None,
+        stream: str | None = None,
+        maxlen: int | None = None,
+    ):
+        self.redis = redis_connection or create_redis_connection(decode_responses=False)
+        self.stream = stream or get_settings().EVENTS_STREAM_NAME
+        self.maxlen = maxlen or get_settings().EVENTS_STREAM_MAXLEN
+
+    def is_available(self) -> bool:
+        """Проверка доступности Redis"""
+        try:
+            return bool(self.redis.ping())
+        except redis.RedisError:
+            return False
+
+    def send(self, event_data: Dict[str, Any]) -> None:
+        """Добавление события в поток (длина потока ограничивается приблизительно)"""
+        self.redis.xadd(
+            self.stream,
+            {_PAYLOAD_FIELD: dumps(event_data)},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+
+
+class RedisStreamsEventConsumer:
+    """
+    Потребитель событий из Redis Streams в составе группы потребителей
+
+    - читает события пачками через XREADGROUP;
+    - подтверждает всю пачку одним XACK;
+    - периодически забирает через XAUTOCLAIM записи, зависшие у упавших потребителей;
+    - записи, доставленные больше max_deliveries раз, переносятся в dead-letter
+    """
+
+    def __init__(
+        self,
+        redis_connection: redis.Redis | None = None,
+        stream: str | None = None,
+        group: str | None = None,
+        consumer: str | None = None,
+        batch_size: int = 100,
+        block_ms: int = 1000,  # должно быть меньше socket_timeout подключения
+        claim_idle_ms: int = 60_000,
+        max_deliveries: int = 5,
+        dead_letter_store: DeadLetterStore | None = None,
+    ):
+        self.redis = redis_connection or create_redis_connection(decode_responses=False)
+        self.stream = stream or get_settings().EVENTS_STREAM_NAME
+        self.group = group or get_settings().EVENTS_STREAM_GROUP
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.dead_letter_store = dead_letter_store or get_dead_letter_store()
+        self._stop_event = threading.Event()
+
+    def ensure_group(self) -> None:
+        """Создание группы потребителей (и самого потока), если их ещё нет"""
+        try:
+            self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            logger.info(f"✅ Создана группа потребителей {self.group} для потока {self.stream}")
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run_forever(self) -> None:
+        """Основной цикл чтения событий до вызова stop()"""
+        self.ensure_group()
+        logger.info(f"🚀 Потребитель {self.consumer} читает поток {self.stream}")
+
+        # Сначала забираем то, что осталось неподтверждённым после прошлых запусков
+        self.reclaim_pending()
+        reclaim_interval = self.claim_idle_ms / 1000
+        last_reclaim = time.monotonic()
+
+        while not self._stop_event.is_set():
+            try:
+                self.process_batch()
+                if time.monotonic() - last_reclaim >= reclaim_interval:
+                    self.reclaim_pending()
+                    last_reclaim = time.monotonic()
+            except redis.RedisError as e:
+                logger.error(f"❌ Ошибка Redis в потребителе событий: {str(e)}")
+                self._stop_event.wait(1)
+
+        logger.info(f"🛑 Потребитель {self.consumer} остановлен")
+
+    def process_batch(self) -> int:
+        """Чтение и обработка одной пачки новых событий, возвращает число прочитанных записей"""
+        response = self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=self.batch_size,
+            block=self.block_ms,
+        )
+        if not response:
+            return 0
+
+        _, entries = response[0]
+        self._handle_entries(entries)
+        return len(entries)
+
+    def reclaim_pending(self) -> int:
+        """Перехват записей, которые другие потребители не подтвердили за claim_idle_ms"""
+        reclaimed = 0
+        start_id = "0-0"
+
+        while True:
+            next_id, entries, _ = self.redis.xautoclaim(
+                self.stream,
+                self.group,
+                self.consumer,
+                min_idle_time=self.claim_idle_ms,
+                start_id=start_id,
+                count=self.batch_size,
+            )
+            if entries:
+                reclaimed += len(entries)
+                self._handle_entries(self._drop_exhausted(entries))
+
+            if next_id in (b"0-0", "0-0"):
+                break
+            start_id = next_id
+
+        if reclaimed:
+            logger.warning(f"♻️ Перехвачено зависших событий: {reclaimed}")
+        return reclaimed
+
+    def _drop_exhausted(self, entries: List[Tuple[bytes, dict]]) -> List[Tuple[bytes, dict]]:
+        """Подтверждение записей, исчерпавших лимит доставок; возвращает остальные"""
+        pending = self.redis.xpending_range(
+            self.stream,
+            self.group,
+            min=entries[0][0],
+            max=entries[-1][0],
+            count=len(entries),
+            consumername=self.consumer,
+        )
+        deliveries = {item["message_id"]: item["times_delivered"] for item in pending}
+
+        exhausted = [
+            (entry_id, fields)
+            for entry_id, fields in entries
+            if deliveries.get(entry_id, 0) > self.max_deliveries
+        ]
+        if not exhausted:
+            return entries
+
+        for entry_id, fields in exhausted:
+            if fields:
+                attempts = deliveries[entry_id] - 1
+                error = RuntimeError(f"Превышен лимит доставок из потока {self.stream}")
+                self.dead_letter_store.add(
+                    loads(fields[_PAYLOAD_FIELD]), error, attempts, source="redis_streams"
+                )
+
+        exhausted_ids = {entry_id for entry_id, _ in exhausted}
+        self.redis.xack(self.stream, self.group, *exhausted_ids)
+        return [entry for entry in entries if entry[0] not in exhausted_ids]
+
+    def _handle_entries(self, entries: List[Tuple[bytes, dict]]) -> None:
+        """Обработка записей и подтверждение успешно обработанных одним XACK"""
+        processed = []
+
+        for entry_id, fields in entries:
+            # Записи, удалённые из потока (обрезка по MAXLEN), приходят без полей
+            if not fields:
+                processed.append(entry_id)
+                continue
+
+            try:
+                dispatch_event_data(loads(fields[_PAYLOAD_FIELD]))
+                processed.append(entry_id)
+            except EventInProgressError as e:
+                # Запись остаётся в ожидающих: её перехватят, когда отметка обработки снимется
+                logger.info(f"⏳ {str(e)}, запись {entry_id} будет перехвачена позже")
+            except KeyError as e:
+                logger.error(f"❌ Неизвестный тип события в записи {entry_id}: {str(e)}")
+                self.dead_letter_store.add(
+                    loads(fields[_PAYLOAD_FIELD]), e, attempts=1, source="redis_streams"
+                )
+                processed.append(entry_id)
+            except Exception as e:
+                # Запись остаётся в списке ожидающих и будет перехвачена повторно
+                logger.exception(f"❌ Ошибка при обработке события {entry_id}: {str(e)}")
+
+        if processed:
+            self.redis.xack(self.stream, self.group, *processed)
+
+
+def main() -> None:
+    """Запуск потребителя событий из Redis Streams как отдельного процесса"""
+    from ..notifications.event_handlers import register_notification_handlers
+
+    parser = argparse.ArgumentParser(description="Потребитель доменных событий из Redis Streams")
+    parser.add_argument("--consumer", default=None, help="Имя потребителя в группе")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--claim-idle-ms", type=int, default=60_000)
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, get_settings().LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    # Регистрация обработчиков событий в локальном EventBus этого процесса
+    register_notification_handlers()
+
+    consumer = RedisStreamsEventConsumer(
+        consumer=args.consumer,
+        batch_size=args.batch_size,
+        claim_idle_ms=args.claim_idle_ms,
+    )
+    try:
+        consumer.run_forever()
+    except KeyboardInterrupt:
+        consumer.stop()
+
+
+if __name__ == "__main__":
+    main()
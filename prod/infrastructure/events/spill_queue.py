@@ -0,0 +1,235 @@
+import atexit
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from ..celery.event_serializer import dumps, loads
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Запись сегмента: длина (4 байта big-endian) + событие в формате event-msgpack
+_RECORD_HEADER = struct.Struct(">I")
+_SEGMENT_SUFFIX = ".seg"
+
+
+class EventSpillQueue:
+    """
+    Локальный буфер событий на время недоступности брокера
+
+    - события складываются в ограниченную очередь в памяти и отправляются фоновым потоком;
+    - когда очередь заполнена, события дописываются в сегменты на диске (append-only);
+    - после восстановления брокера сначала отправляется очередь в памяти, затем сегменты;
+    - пока на диске есть хвост, новые события тоже пишутся на диск — порядок сохраняется.
+
+    Если процесс упадёт посреди сегмента, часть его событий будет отправлена повторно;
+    такие повторы отсекает дедупликация по event_id на стороне потребителя
+    """
+
+    def __init__(
+        self,
+        transport,
+        spill_dir: str | None = None,
+        max_memory_events: int | None = None,
+        segment_max_bytes: int | None = None,
+        retry_interval: float = 1.0,
+        max_retry_interval: float = 30.0,
+        fsync: bool = True,
+    ):
+        self.transport = transport
+        self.spill_dir = Path(spill_dir or get_settings().EVENTS_SPILL_DIR)
+        self.segment_max_bytes = segment_max_bytes or get_settings().EVENTS_SPILL_SEGMENT_BYTES
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.fsync = fsync
+
+        self.max_memory_events = max_memory_events or get_settings().EVENTS_SPILL_MEMORY_SIZE
+
+        # Событие остаётся в голове очереди, пока не будет отправлено
+        self._memory: deque = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+
+        self._writer = None
+        self._writer_path: Path | None = None
+        # Позиция, до которой уже отправлен самый старый сегмент
+        self._replay_offset = 0
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        self._segments: List[Path] = sorted(self.spill_dir.glob(f"*{_SEGMENT_SUFFIX}"))
+        if self._segments:
+            logger.warning(f"📼 Найдены неотправленные сегменты событий: {len(self._segments)}")
+
+    # region Публичный интерфейс
+
+    @property
+    def has_backlog(self) -> bool:
+        """Есть ли неотправленные события (новые события нужно ставить за ними)"""
+        return bool(self._memory) or bool(self._segments)
+
+    def put(self, event_data: Dict[str, Any]) -> None:
+        """Постановка события в буфер; не блокирует вызывающий код"""
+        with self._lock:
+            if not self._segments:
+                if len(self._memory) < self.max_memory_events:
+                    self._memory.append(event_data)
+                    self._not_empty.notify()
+                    return
+                logger.warning("⚠️ Очередь событий в памяти заполнена, запись на диск")
+            self._append_to_disk(event_data)
+
+    def start(self) -> None:
+        """Запуск фонового потока отправки"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="event-spill-queue", daemon=True)
+        self._thread.start()
+        if not self._atexit_registered:
+            atexit.register(self.stop)
+            self._atexit_registered = True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Остановка потока; неотправленные события из памяти сбрасываются на диск
+
+        Если поток не завершился за timeout (завис в отправке), сброс пропускается:
+        поток ещё работает с очередью и сегментами. Повторный stop() попробует снова
+        """
+        self._stop_event.set()
+        with self._lock:
+            self._not_empty.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.error(
+                    f"❌ Поток отправки событий не остановился за {timeout:.1f} с, "
+                    f"события в памяти не сохранены на диск: {len(self._memory)}"
+                )
+                return
+
+        with self._lock:
+            flushed = len(self._memory)
+            if flushed:
+                # События в памяти старше сегментов на диске: их сегмент должен идти первым
+                first_name = self._segments[0].stem if self._segments else str(time.time_ns())
+                self._open_new_segment(name=f"{int(first_name) - 1:020d}", first=True)
+                while self._memory:
+                    self._append_to_disk(self._memory.popleft(), rotate=False)
+            self._close_writer()
+
+        if flushed:
+            logger.warning(f"📼 Событий из памяти сохранено на диск: {flushed}")
+
+    # endregion
+
+    # region Диск
+
+    def _append_to_disk(self, event_data: Dict[str, Any], rotate: bool = True) -> None:
+        """Дописывание события в текущий сегмент (вызывается под self._lock)"""
+        if self._writer is None or (rotate and self._writer.tell() >= self.segment_max_bytes):
+            self._open_new_segment()
+
+        payload = dumps(event_data)
+        self._writer.write(_RECORD_HEADER.pack(len(payload)) + payload)
+        self._writer.flush()
+        if self.fsync:
+            os.fsync(self._writer.fileno())
+
+    def _open_new_segment(self, name: str | None = None, first: bool = False) -> None:
+        """Открытие нового сегмента; имена — монотонное время, порядок отправки по имени"""
+        self._close_writer()
+        self._writer_path = self.spill_dir / f"{name or f'{time.time_ns():020d}'}{_SEGMENT_SUFFIX}"
+        self._writer = open(self._writer_path, "ab")
+        if first:
+            self._segments.insert(0, self._writer_path)
+        else:
+            self._segments.append(self._writer_path)
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._writer_path = None
+
+    @staticmethod
+    def _read_records(path: Path, offset: int) -> Iterator[tuple[int, Dict[str, Any]]]:
+        """Чтение записей сегмента начиная с offset; отдаёт (offset после записи, событие)"""
+        with open(path, "rb") as segment:
+            segment.seek(offset)
+            while True:
+                header = segment.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    return
+                (length,) = _RECORD_HEADER.unpack(header)
+                payload = segment.read(length)
+                if len(payload) < length:
+                    # Недописанная запись после аварийного завершения
+                    logger.warning(f"⚠️ Обрезанная запись в сегменте {path.name}, пропуск")
+                    return
+                yield segment.tell(), loads(payload)
+
+    # endregion
+
+    # region Фоновая отправка
+
+    def _send_until_success(self, event_data: Dict[str, Any]) -> bool:
+        """Отправка с нарастающей паузой, пока брокер не ответит; False — при остановке"""
+        delay = self.retry_interval
+        while not self._stop_event.is_set():
+            try:
+                self.transport.send(event_data)
+                return True
+            except Exception as e:
+                logger.warning(f"⚠️ Брокер недоступен, повтор через {delay:.1f} с: {str(e)}")
+                self._stop_event.wait(delay)
+                delay = min(delay * 2, self.max_retry_interval)
+        return False
+
+    def _replay_oldest_segment(self) -> None:
+        with self._lock:
+            path = self._segments[0]
+            # Текущий сегмент закрывается: новые события пойдут в следующий
+            if path == self._writer_path:
+                self._close_writer()
+
+        sent = 0
+        for offset, event_data in self._read_records(path, self._replay_offset):
+            if not self._send_until_success(event_data):
+                return
+            self._replay_offset = offset
+            sent += 1
+
+        with self._lock:
+            self._segments.pop(0)
+            self._replay_offset = 0
+        path.unlink(missing_ok=True)
+        logger.info(f"📤 Сегмент {path.name} отправлен в брокер: {sent} событий")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            with self._lock:
+                if not self._memory and not self._segments:
+                    self._not_empty.wait(timeout=0.5)
+                    continue
+                event_data = self._memory[0] if self._memory else None
+
+            # Очередь в памяти старше сегментов на диске, поэтому сегменты — только после неё
+            if event_data is None:
+                self._replay_oldest_segment()
+                continue
+
+            if self._send_until_success(event_data):
+                with self._lock:
+                    self._memory.popleft()
+            # Иначе — остановка: событие остаётся в очереди и будет сохранено в stop()
+
+    # endregion
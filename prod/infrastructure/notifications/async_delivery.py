@@ -0,0 +1,286 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterable, List, Tuple
+
+import aiohttp
+
+from ..config.settings import get_settings
+from ..redis_client import create_async_redis_connection
+from .rate_limiter import RateLimitExceeded, TelegramRateLimiter
+from .retry_mechanism import RetryPolicy
+from .telegram_api import telegram_bot_id, telegram_send_message_url
+from .telegram_errors import TelegramApiError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTelegramDelivery:
+    """
+    Асинхронная доставка сообщений в Telegram с ограниченным параллелизмом
+
+    Event loop работает в фоновом потоке процесса; все отправки идут через один
+    aiohttp.ClientSession с пулом keep-alive соединений. Одновременно в полёте не больше
+    max_in_flight запросов (семафор), паузы между повторами не занимают ни поток,
+    ни слот семафора. С rate_limiter каждая попытка сначала резервирует слот в общих
+    для всех воркеров лимитах Telegram и ждёт его без запроса к API.
+
+    Ответ 429 приостанавливает всю полосу бота на retry_after секунд: в этом процессе
+    и, через rate_limiter, во всех воркерах.
+
+    Синхронный интерфейс для остального кода:
+    - submit() — не блокирует (обработчики EventBus), возвращает concurrent.futures.Future;
+    - send() / send_many() — ждут результат (задачи Celery, которым нужен ретрай)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        rate_limiter: TelegramRateLimiter | None = None,
+        max_in_flight: int | None = None,
+        timeout: float | None = None,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 10.0,
+    ):
+        settings = get_settings()
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.max_in_flight = max_in_flight or settings.TELEGRAM_MAX_IN_FLIGHT
+        self.timeout = timeout or settings.TELEGRAM_REQUEST_TIMEOUT
+        self.retry_policy = RetryPolicy(max_attempts, base_delay, max_delay)
+        self.max_wait = settings.TELEGRAM_RATE_LIMIT_MAX_WAIT
+        # Время (time.monotonic), до которого отправки процесса приостановлены после 429
+        self._resume_at = 0.0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock = threading.Lock()
+
+    # region Жизненный цикл
+
+    def start(self) -> None:
+        """Запуск event loop в фоновом потоке (повторный вызов ничего не делает)"""
+        with self._lock:
+            if self._loop is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=loop.run_forever, name="telegram-delivery", daemon=True)
+            self._thread.start()
+            # Сессия и семафор создаются внутри работающего loop, к которому они привязаны
+            asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+            self._loop = loop
+            atexit.register(self.stop)
+
+        logger.info(f"🚀 Асинхронная доставка в Telegram запущена (до {self.max_in_flight} запросов)")
+
+    async def _open(self) -> None:
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+            timeout=aiohttp.ClientTimeout(total=self.timeout, connect=3.05),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+    async def _close(self) -> None:
+        await self._session.close()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.redis.aclose()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Закрытие HTTP-клиента и остановка event loop"""
+        with self._lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+
+            try:
+                asyncio.run_coroutine_threadsafe(self._close(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"⚠️ Ошибка при закрытии HTTP-клиента Telegram: {str(e)}")
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout)
+            loop.close()
+
+    # endregion
+
+    # region Синхронный интерфейс
+
+    def submit(
+        self, chat_id: int, text: str, max_attempts: int | None = None, max_wait: float | None = None
+    ) -> Future:
+        """Постановка отправки без ожидания результата"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(
+            self.send_message(chat_id, text, max_attempts, max_wait), self._loop
+        )
+
+    def send(
+        self,
+        chat_id: int,
+        text: str,
+        timeout: float | None = None,
+        max_attempts: int | None = None,
+        max_wait: float | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Отправка с ожиданием ответа; ошибка последней попытки пробрасывается
+
+        max_attempts=1 и короткий max_wait — для задач Celery, которые повторяют
+        и откладывают отправку через очередь, а не ждут в слоте воркера
+        """
+        return self.submit(chat_id, text, max_attempts, max_wait).result(timeout)
+
+    def send_many(
+        self,
+        messages: Iterable[Tuple[int, str]],
+        timeout: float | None = None,
+        max_attempts: int | None = None,
+        max_wait: float | None = None,
+    ) -> List[Dict[str, Any] | BaseException]:
+        """
+        Параллельная отправка нескольких сообщений
+
+        Результаты — в порядке messages: ответ Telegram или исключение последней попытки.
+        max_wait передаётся в send_message: при max_wait=0 занятые лимитом получатели
+        сразу получают RateLimitExceeded вместо ожидания слота
+        """
+        self.start()
+
+        async def gather() -> list:
+            return await asyncio.gather(
+                *(self.send_message(chat_id, text, max_attempts, max_wait) for chat_id, text in messages),
+                return_exceptions=True,
+            )
+
+        return asyncio.run_coroutine_threadsafe(gather(), self._loop).result(timeout)
+
+    # endregion
+
+    # region Асинхронная отправка
+
+    async def send_message(
+        self, chat_id: int, text: str, max_attempts: int | None = None, max_wait: float | None = None
+    ) -> Dict[str, Any]:
+        """
+        Отправка сообщения с повторами при сетевых ошибках, 429 и 5xx
+
+        Если свободный слот лимита или retry_after из ответа 429 дальше max_wait
+        (по умолчанию TELEGRAM_RATE_LIMIT_MAX_WAIT), поднимается RateLimitExceeded:
+        отправку откладывает вызывающий код (например, задача Celery с countdown)
+        """
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "parse_mode": "HTML",
+            "disable_web_page_preview": True,
+        }
+        max_attempts = max_attempts or self.retry_policy.max_attempts
+
+        for attempt in range(1, max_attempts + 1):
+            await self._wait_for_slot(chat_id, max_wait)
+            try:
+                async with self._semaphore:
+                    async with self._session.post(self.base_url, json=payload) as response:
+                        return await self._parse_response(response)
+            except TelegramApiError as e:
+                if e.retry_after is not None:
+                    await self._pause_lane(e.retry_after, attempt == max_attempts)
+                    continue
+                if not e.retryable or attempt == max_attempts:
+                    raise
+                error: Exception = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == max_attempts:
+                    raise
+                error = e
+
+            # Экспоненциальная задержка с jitter; ожидание не держит слот семафора
+            delay = self.retry_policy.delay(attempt)
+            logger.warning(
+                f"Attempt {attempt}/{max_attempts} failed. "
+                f"Retrying in {delay:.2f}s. Error: {str(error)}"
+            )
+            await asyncio.sleep(delay)
+
+    async def _pause_lane(self, retry_after: float, last_attempt: bool) -> None:
+        """
+        429: пауза ровно на retry_after вместо экспоненциальной задержки
+
+        Следующая попытка дождётся конца паузы в _wait_for_slot; длинная пауза
+        (или 429 на последней попытке) передаётся вызывающему коду как RateLimitExceeded
+        """
+        self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.pause_async(retry_after)
+        if last_attempt or retry_after > self.max_wait:
+            raise RateLimitExceeded(retry_after)
+
+    async def _wait_for_slot(self, chat_id: int, max_wait: float | None = None) -> None:
+        max_wait = self.max_wait if max_wait is None else max_wait
+        paused = self._resume_at - time.monotonic()
+        if paused > max_wait:
+            raise RateLimitExceeded(paused)
+        if paused > 0:
+            await asyncio.sleep(paused)
+        if self.rate_limiter is None:
+            return
+        reservation = await self.rate_limiter.reserve_async(chat_id, max_wait)
+        if not reservation.granted:
+            raise RateLimitExceeded(reservation.delay)
+        if reservation.delay > 0:
+            await asyncio.sleep(reservation.delay)
+
+    @staticmethod
+    async def _parse_response(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        body = await response.text()
+        try:
+            result = json.loads(body)
+        except ValueError:
+            result = {}
+
+        if response.ok and result.get("ok"):
+            return result
+
+        raise TelegramApiError(
+            result.get("error_code", response.status),
+            result.get("description", body),
+            result.get("parameters"),
+        )
+
+    # endregion
+
+
+_delivery: AsyncTelegramDelivery | None = None
+_delivery_pid: int | None = None
+_delivery_lock = threading.Lock()
+
+
+def get_async_delivery() -> AsyncTelegramDelivery:
+    """
+    Движок доставки процесса (создаётся при первом обращении)
+
+    После fork (prefork-воркеры Celery) поток event loop родителя не существует,
+    поэтому в дочернем процессе создаётся свой движок
+    """
+    global _delivery, _delivery_pid
+    with _delivery_lock:
+        if _delivery is None or _delivery_pid != os.getpid():
+            settings = get_settings()
+            rate_limiter = None
+            if settings.TELEGRAM_RATE_LIMIT_ENABLED:
+                rate_limiter = TelegramRateLimiter(
+                    telegram_bot_id(settings.TELEGRAM_BOT_TOKEN), create_async_redis_connection()
+                )
+            _delivery = AsyncTelegramDelivery(
+                telegram_send_message_url(settings.TELEGRAM_BOT_TOKEN), rate_limiter
+            )
+            _delivery_pid = os.getpid()
+    return _delivery
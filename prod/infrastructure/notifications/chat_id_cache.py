@@ -0,0 +1,178 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+import redis
+
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Канал, в который публикуется user_id при изменении привязки Telegram ("*" — сбросить всё)
+CHAT_ID_INVALIDATION_CHANNEL = "telegram:chat_id:invalidate"
+INVALIDATE_ALL = "*"
+
+
+class ChatIdCache:
+    """
+    Кэш chat_id внутри процесса перед Redis (ограниченный LRU с TTL)
+
+    chat_id клиента почти не меняется, поэтому повторные уведомления «горячим»
+    клиентам не ходят в Redis. Клиенты без привязанного Telegram тоже запоминаются
+    (на более короткий negative_ttl_seconds), чтобы их события не повторяли промах в Redis.
+    Устаревание ограничено двумя механизмами:
+    - TTL записи (на случай потерянного сообщения об изменении);
+    - подписка на CHAT_ID_INVALIDATION_CHANNEL (listen): изменённая привязка
+      (и запомненное отсутствие привязки) удаляется из кэша всех процессов сразу.
+
+    Инвалидация может прийти, пока значение читается из Redis: вызывающий код берёт
+    generation() до чтения и передаёт его в put_many/put_unlinked — значения ключей,
+    инвалидированных после этого, в кэш не попадают
+    """
+
+    def __init__(
+        self,
+        capacity: int | None = None,
+        ttl_seconds: float | None = None,
+        negative_ttl_seconds: float | None = None,
+    ):
+        settings = get_settings()
+        self.capacity = capacity or settings.TELEGRAM_CHAT_ID_CACHE_SIZE
+        self.ttl_seconds = ttl_seconds or settings.TELEGRAM_CHAT_ID_CACHE_TTL
+        self.negative_ttl_seconds = negative_ttl_seconds or settings.TELEGRAM_CHAT_ID_NEGATIVE_TTL
+        # user_id → (chat_id или None — Telegram не привязан, момент устаревания по time.monotonic)
+        self._entries: OrderedDict[str, Tuple[int | None, float]] = OrderedDict()
+        # Счётчик инвалидаций и поколение последней инвалидации каждого user_id (не больше capacity).
+        # Прочитанное раньше _stale_before не кэшируется: был clear или поколение ключа вытеснено
+        self._generation = 0
+        self._invalidated: OrderedDict[str, int] = OrderedDict()
+        self._stale_before = 0
+        self._lock = threading.Lock()
+        self._listener: threading.Thread | None = None
+
+    # region Кэш
+
+    def get_many(self, user_ids: Iterable[str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        (найденные {user_id: chat_id}, user_id без актуальной записи в кэше)
+
+        Пользователи с запомненным отсутствием привязки не попадают ни в один из списков
+        """
+        now = time.monotonic()
+        found: Dict[str, int] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._entries.get(user_id)
+                if entry is None or entry[1] <= now:
+                    missing.append(user_id)
+                    continue
+                self._entries.move_to_end(user_id)
+                if entry[0] is not None:
+                    found[user_id] = entry[0]
+
+        return found, missing
+
+    def generation(self) -> int:
+        """Текущее поколение кэша: берётся до чтения из Redis и передаётся в put_many/put_unlinked"""
+        with self._lock:
+            return self._generation
+
+    def put_many(self, chat_ids: Dict[str, int], generation: int | None = None) -> None:
+        self._put(chat_ids.items(), self.ttl_seconds, generation)
+
+    def put_unlinked(self, user_ids: Iterable[str], generation: int | None = None) -> None:
+        """Запоминание пользователей без привязанного Telegram на negative_ttl_seconds"""
+        self._put(((user_id, None) for user_id in user_ids), self.negative_ttl_seconds, generation)
+
+    def _put(
+        self, entries: Iterable[Tuple[str, int | None]], ttl_seconds: float, generation: int | None
+    ) -> None:
+        expires_at = time.monotonic() + ttl_seconds
+        with self._lock:
+            for user_id, chat_id in entries:
+                if generation is not None and self._changed_since(user_id, generation):
+                    continue
+                self._entries[user_id] = (chat_id, expires_at)
+                self._entries.move_to_end(user_id)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def _changed_since(self, user_id: str, generation: int) -> bool:
+        return generation < self._stale_before or self._invalidated.get(user_id, 0) > generation
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+            self._invalidated[user_id] = self._generation
+            self._invalidated.move_to_end(user_id)
+            while len(self._invalidated) > self.capacity:
+                _, generation = self._invalidated.popitem(last=False)
+                self._stale_before = max(self._stale_before, generation)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._invalidated.clear()
+            self._stale_before = self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # endregion
+
+    # region Инвалидация через pub/sub
+
+    def listen(self, redis_connection: redis.Redis, channel: str = CHAT_ID_INVALIDATION_CHANNEL) -> None:
+        """
+        Подписка на изменения привязок в фоновом потоке (повторный вызов ничего не делает)
+
+        Не обращается к Redis в вызывающем потоке: недоступный Redis не мешает создать
+        TelegramNotifier, подписка повторяется в фоне, а до неё устаревание ограничивает TTL
+        """
+        if self._listener is not None and self._listener.is_alive():
+            return
+
+        self._listener = threading.Thread(
+            target=self._listen, args=(redis_connection, channel), name="chat-id-cache-listener", daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self, redis_connection: redis.Redis, channel: str) -> None:
+        pubsub = None
+        while True:
+            try:
+                if pubsub is None:
+                    pubsub = redis_connection.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(**{channel: self._on_message})
+                    logger.info(f"📡 Кэш chat_id подписан на изменения привязок ({channel})")
+                pubsub.get_message(timeout=1.0)
+            except redis.RedisError as e:
+                if pubsub is not None and not pubsub.subscribed:
+                    pubsub.close()
+                    pubsub = None
+                self._on_listener_error(e)
+
+    def _on_message(self, message: dict) -> None:
+        user_id = message["data"]
+        if isinstance(user_id, bytes):
+            user_id = user_id.decode()
+
+        if user_id == INVALIDATE_ALL:
+            self.clear()
+        else:
+            self.invalidate(user_id)
+
+    def _on_listener_error(self, error: Exception) -> None:
+        # Пока подписка восстанавливается, сообщения об изменениях теряются:
+        # кэш сбрасывается, чтобы не отдавать устаревшие chat_id
+        logger.warning(f"⚠️ Подписка кэша chat_id недоступна, кэш сброшен, повтор через 1с: {str(error)}")
+        self.clear()
+        time.sleep(1.0)
+
+    # endregion
@@ -0,0 +1,60 @@
+import json
+import logging
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+import redis
+
+from ...domain.communication_channels.communication_channel_entity import CommunicationChannel
+from ...domain.communication_channels.communication_channel_enums import CommunicationChannelsTypesEnum
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+def communication_channels_key(user_id: UUID | str) -> str:
+    return f"notifications:channels:{user_id}"
+
+
+class RedisCommunicationChannelRepository:
+    """
+    CommunicationChannel пользователей в Redis: хеш на пользователя, поле — тип канала
+
+    У пользователя не больше одной записи каждого типа; повторное сохранение заменяет её
+    """
+
+    def __init__(self, redis_connection: redis.Redis | None = None):
+        self.redis = redis_connection or create_redis_connection()
+
+    def find_by_user_id(self, user_id: UUID | str) -> List[CommunicationChannel]:
+        channels = []
+        for channel_type, data in self.redis.hgetall(communication_channels_key(user_id)).items():
+            try:
+                channels.append(self._load(user_id, channel_type, json.loads(data)))
+            except (ValueError, KeyError) as e:
+                logger.error(f"❌ Некорректная запись канала {channel_type} пользователя {user_id}: {str(e)}")
+        return channels
+
+    def save(self, channel: CommunicationChannel) -> None:
+        data = {
+            "id": str(channel.id),
+            "created_at": channel.created_at.isoformat(),
+            "value": channel.value,
+            "username": channel.username,
+        }
+        self.redis.hset(communication_channels_key(channel.user_id), channel.type.value, json.dumps(data))
+
+    def delete(self, user_id: UUID | str, channel_type: CommunicationChannelsTypesEnum) -> None:
+        self.redis.hdel(communication_channels_key(user_id), channel_type.value)
+
+    @staticmethod
+    def _load(user_id: UUID | str, channel_type: str, data: dict) -> CommunicationChannel:
+        return CommunicationChannel(
+            id=UUID(data["id"]),
+            user_id=UUID(str(user_id)),
+            type=CommunicationChannelsTypesEnum(channel_type),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            value=data.get("value"),
+            username=data.get("username"),
+        )
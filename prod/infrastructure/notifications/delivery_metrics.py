@@ -0,0 +1,59 @@
+import logging
+import threading
+from typing import Dict
+
+import redis
+
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+DELIVERY_METRICS_KEY = "notifications:metrics"
+
+# Исходы отправки уведомления
+SENT = "sent"
+DEFERRED = "deferred"
+REJECTED = "rejected"
+FAILED = "failed"
+NO_CHANNEL = "no_channel"
+
+
+class DeliveryMetrics:
+    """
+    Счётчики доставки уведомлений всех каналов в одном хеше Redis
+
+    Поля — "<канал>:<исход>" и "<канал>:seconds" (суммарное время отправок), общие для
+    всех воркеров: redis-cli HGETALL notifications:metrics. Ошибка записи метрик
+    не влияет на отправку
+    """
+
+    def __init__(self, redis_connection: redis.Redis | None = None, key: str = DELIVERY_METRICS_KEY):
+        self._redis_connection = redis_connection
+        self.key = key
+        self._lock = threading.Lock()
+
+    @property
+    def redis(self) -> redis.Redis:
+        # Подключение создаётся при первой записи, а не при импорте обработчиков
+        with self._lock:
+            if self._redis_connection is None:
+                self._redis_connection = create_redis_connection()
+            return self._redis_connection
+
+    def record(self, channel: str, outcome: str, seconds: float = 0.0, count: int = 1) -> None:
+        try:
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.hincrby(self.key, f"{channel}:{outcome}", count)
+            if seconds:
+                pipeline.hincrbyfloat(self.key, f"{channel}:seconds", seconds)
+            pipeline.execute()
+        except redis.RedisError as e:
+            logger.debug(f"Метрики доставки не записаны: {str(e)}")
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """{канал: {исход: значение}}"""
+        metrics: Dict[str, Dict[str, float]] = {}
+        for field, value in self.redis.hgetall(self.key).items():
+            channel, _, name = field.partition(":")
+            metrics.setdefault(channel, {})[name] = float(value)
+        return metrics
@@ -0,0 +1,29 @@
+import logging
+
+from ..config.settings import get_settings
+from ..redis_client import RedisClient
+from .notification_dispatcher import NotificationDispatcher
+from .reminder_scheduler import get_reminder_scheduler
+from .telegram_notifier import TelegramNotifier
+
+logger = logging.getLogger(__name__)
+
+
+def register_notification_handlers() -> TelegramNotifier:
+    """
+    Подписка уведомлений и планировщика напоминаний на доменные события в EventBus процесса
+
+    Нужна в каждом процессе, который обрабатывает события: main, потребитель Redis Streams
+    и воркеры Celery (сигналы в celery_app). Повторный вызов подписок не дублирует
+    """
+    notifier = TelegramNotifier(get_settings().TELEGRAM_BOT_TOKEN, RedisClient())
+
+    # Мультиканальные уведомления: Telegram становится одним из каналов диспетчера
+    if get_settings().NOTIFICATION_DISPATCHER_ENABLED:
+        NotificationDispatcher(notifier)
+
+    # Индекс напоминаний обновляется событиями подтверждения, переноса и отмены
+    get_reminder_scheduler().register_event_handlers()
+
+    logger.info("✅ Обработчики уведомлений и напоминаний зарегистрированы")
+    return notifier
@@ -0,0 +1,17 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_http_session(pool_maxsize: int = 10) -> requests.Session:
+    """
+    Сессия requests с пулом keep-alive соединений
+
+    pool_maxsize — сколько соединений к одному хосту переиспользуется одновременно;
+    должен быть не меньше числа потоков, отправляющих через сессию, иначе лишние
+    соединения закрываются после каждого запроса
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,288 @@
+"""
+Каналы уведомлений: Telegram, VK, WhatsApp
+
+У каждого канала свой пул соединений, свой лимит отправок (RateLimiter в Redis)
+и своя политика повторов. Тексты шаблонов размечены HTML для Telegram;
+остальные каналы переводят разметку в свой формат.
+"""
+
+import html
+import logging
+import random
+import re
+from typing import Any, Dict
+from uuid import UUID
+
+import requests
+
+from ...domain.communication_channels.communication_channel_enums import CommunicationChannelsTypesEnum
+from ..config.settings import get_settings
+from .http_session import create_http_session
+from .rate_limiter import RateLimitExceeded, RateLimiter
+from .retry_mechanism import RetryPolicy, with_retry
+from .telegram_errors import TelegramApiError
+from .telegram_notifier import TELEGRAM_RETRY_POLICY
+
+logger = logging.getLogger(__name__)
+
+_TAG = re.compile(r"<[^>]+>")
+
+
+def html_to_plain_text(text: str) -> str:
+    return html.unescape(_TAG.sub("", text))
+
+
+def html_to_whatsapp(text: str) -> str:
+    """<b> → *жирный*, <i> → _курсив_, остальные теги удаляются"""
+    text = re.sub(r"</?(b|strong)>", "*", text)
+    text = re.sub(r"</?(i|em)>", "_", text)
+    return html_to_plain_text(text)
+
+
+class ChannelApiError(Exception):
+    """Ошибка API канала, после которой повтор может помочь (перегрузка, ошибка сервера)"""
+
+    def __init__(self, channel: str, error_code: int, description: str):
+        self.channel = channel
+        self.error_code = error_code
+        self.description = description
+        super().__init__(f"{channel} API error {error_code}: {description}")
+
+
+class ChannelRejectedError(ChannelApiError):
+    """Канал отклонил сообщение (неверный получатель, запрет сообщений): повтор не поможет"""
+
+
+class NotificationChannel:
+    """
+    Канал доставки уведомлений; recipient — CommunicationChannel.value получателя
+
+    blocking_retries=False — одна попытка: повторы выполняет задача Celery через очередь.
+    delivery_id — один идентификатор на все попытки отправки уведомления (и повторы
+    через очередь); каналы с идемпотентной отправкой отсекают по нему повторную доставку
+    """
+
+    type: CommunicationChannelsTypesEnum
+    retry_policy: RetryPolicy
+
+    def send(
+        self, recipient: str, text: str, blocking_retries: bool = True, delivery_id: str | None = None
+    ) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class TelegramChannel(NotificationChannel):
+    """
+    Telegram через TelegramNotifier: его пул соединений, лимиты, повторы и режим доставки
+    """
+
+    type = CommunicationChannelsTypesEnum.TELEGRAM
+
+    def __init__(self, notifier, retry_policy: RetryPolicy | None = None):
+        self.notifier = notifier
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def send(
+        self, recipient: str, text: str, blocking_retries: bool = True, delivery_id: str | None = None
+    ) -> Dict[str, Any]:
+        try:
+            return self.notifier.send_message(int(recipient), text, blocking_retries)
+        except TelegramApiError as e:
+            if e.retryable:
+                raise
+            raise ChannelRejectedError("Telegram", e.error_code, e.description) from e
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            if 400 <= status < 500:
+                raise ChannelRejectedError("Telegram", status, e.response.text) from e
+            raise
+
+
+class HttpNotificationChannel(NotificationChannel):
+    """
+    Канал поверх HTTP API: собственная сессия requests, лимит и with_retry по retry_policy
+
+    Каждая попытка сначала ждёт слот в лимите канала (без повторов в потоке — не дольше
+    NOTIFICATION_QUEUED_MAX_WAIT); 429 и перегрузка превращаются в RateLimitExceeded
+    и не повторяются здесь: отправку переносит задача Celery
+    """
+
+    name: str
+    retry_policy = RetryPolicy()
+
+    def __init__(self, rate_limiter: RateLimiter, pool_size: int, retry_policy: RetryPolicy | None = None):
+        self.rate_limiter = rate_limiter
+        self.session = create_http_session(pool_size)
+        self.retry_policy = retry_policy or self.retry_policy
+        self.queued_max_wait = get_settings().NOTIFICATION_QUEUED_MAX_WAIT
+        self._send = with_retry(
+            **self.retry_policy._asdict(),
+            exceptions=(ChannelApiError, requests.RequestException),
+            no_retry_exceptions=(RateLimitExceeded, ChannelRejectedError),
+        )(self._send_once)
+
+    def _deliver(self, blocking_retries: bool, *args: Any) -> Dict[str, Any]:
+        if blocking_retries:
+            return self._send(*args)
+        return self._send_once(*args, max_wait=self.queued_max_wait)
+
+    def _send_once(self, recipient: str, text: str, *args: Any, max_wait: float | None = None) -> Dict[str, Any]:
+        self.rate_limiter.wait(recipient, max_wait)
+        logger.info(f"📤 Отправка сообщения в {self.name}: {recipient}")
+        return self._post(recipient, text, *args)
+
+    def _post(self, recipient: str, text: str, *args: Any) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _pause_lane(self, retry_after: float) -> None:
+        """Перегрузка: пауза отправок канала во всех воркерах и перенос этой отправки"""
+        self.rate_limiter.pause(retry_after)
+        raise RateLimitExceeded(retry_after, self.name)
+
+
+class VkChannel(HttpNotificationChannel):
+    """
+    VK: сообщения от имени сообщества (messages.send)
+
+    recipient — id пользователя VK, разрешившего сообщения сообщества
+    """
+
+    type = CommunicationChannelsTypesEnum.VK
+    name = "VK"
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=5.0)
+
+    # Коды ошибок VK API: 6 — слишком много запросов в секунду,
+    # 9 — слишком много однотипных действий, 10 — внутренняя ошибка сервера
+    _FLOOD_ERRORS = frozenset({6, 9})
+    _SERVER_ERRORS = frozenset({10})
+
+    def __init__(self, access_token: str, group_id: str | None = None):
+        settings = get_settings()
+        self.access_token = access_token
+        self.api_url = settings.VK_API_URL.rstrip("/")
+        self.api_version = settings.VK_API_VERSION
+        rate_limiter = RateLimiter(
+            group_id or settings.VK_GROUP_ID,
+            settings.VK_RATE_LIMIT,
+            settings.VK_PEER_RATE_LIMIT,
+            max_delay=settings.VK_RATE_LIMIT_MAX_WAIT,
+            key_prefix="vk:rate",
+            channel=self.name,
+        )
+        super().__init__(rate_limiter, settings.VK_HTTP_POOL_SIZE)
+
+    def send(
+        self, recipient: str, text: str, blocking_retries: bool = True, delivery_id: str | None = None
+    ) -> Dict[str, Any]:
+        # random_id один на все попытки, в том числе повторы задачи через очередь:
+        # VK не доставит повторно уже принятое сообщение
+        random_id = UUID(delivery_id).int & 0x7FFFFFFF if delivery_id else random.getrandbits(31)
+        return self._deliver(blocking_retries, recipient, html_to_plain_text(text), random_id)
+
+    def _post(self, recipient: str, text: str, random_id: int) -> Dict[str, Any]:
+        response = self.session.post(
+            f"{self.api_url}/messages.send",
+            data={
+                "peer_id": recipient,
+                "message": text,
+                "random_id": random_id,
+                "access_token": self.access_token,
+                "v": self.api_version,
+            },
+            timeout=(3.05, 15),
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        error = result.get("error")
+        if error is None:
+            return result
+
+        code, description = error.get("error_code", 0), error.get("error_msg", "")
+        if code in self._FLOOD_ERRORS:
+            self._pause_lane(1.0)
+        if code in self._SERVER_ERRORS:
+            raise ChannelApiError(self.name, code, description)
+        raise ChannelRejectedError(self.name, code, description)
+
+
+class WhatsAppChannel(HttpNotificationChannel):
+    """
+    WhatsApp Cloud API: текстовое сообщение с номера WHATSAPP_PHONE_NUMBER_ID
+
+    recipient — номер телефона в международном формате. Вне 24-часового окна после
+    сообщения клиента WhatsApp принимает только одобренные шаблоны: такой отказ
+    приходит как ChannelRejectedError
+    """
+
+    type = CommunicationChannelsTypesEnum.WHATSAPP
+    name = "WhatsApp"
+    retry_policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)
+
+    # Коды ошибок Cloud API: 4, 80007, 130429 — лимит запросов приложения, аккаунта
+    # или номера; 131056 — слишком много сообщений одному получателю
+    _FLOOD_ERRORS = frozenset({4, 80007, 130429})
+    _PAIR_RATE_ERROR = 131056
+
+    def __init__(self, access_token: str, phone_number_id: str):
+        settings = get_settings()
+        self.url = f"{settings.WHATSAPP_API_URL.rstrip('/')}/{phone_number_id}/messages"
+        rate_limiter = RateLimiter(
+            phone_number_id,
+            settings.WHATSAPP_RATE_LIMIT,
+            settings.WHATSAPP_RECIPIENT_RATE_LIMIT,
+            max_delay=settings.WHATSAPP_RATE_LIMIT_MAX_WAIT,
+            key_prefix="whatsapp:rate",
+            channel=self.name,
+        )
+        super().__init__(rate_limiter, settings.WHATSAPP_HTTP_POOL_SIZE)
+        self.session.headers["Authorization"] = f"Bearer {access_token}"
+
+    def send(
+        self, recipient: str, text: str, blocking_retries: bool = True, delivery_id: str | None = None
+    ) -> Dict[str, Any]:
+        return self._deliver(blocking_retries, recipient, html_to_whatsapp(text))
+
+    def _post(self, recipient: str, text: str) -> Dict[str, Any]:
+        response = self.session.post(
+            self.url,
+            json={
+                "messaging_product": "whatsapp",
+                "to": recipient,
+                "type": "text",
+                "text": {"body": text},
+            },
+            timeout=(3.05, 15),
+        )
+        if response.ok:
+            return response.json()
+
+        try:
+            error = response.json().get("error") or {}
+        except ValueError:
+            error = {}
+        code, description = error.get("code", response.status_code), error.get("message", response.text)
+
+        if code == self._PAIR_RATE_ERROR:
+            # Лимит одного получателя: остальные отправки канала не приостанавливаются
+            raise RateLimitExceeded(1 / self.rate_limiter.chat_rate, self.name)
+        if response.status_code == 429 or code in self._FLOOD_ERRORS:
+            self._pause_lane(1.0)
+        if response.status_code >= 500:
+            raise ChannelApiError(self.name, code, description)
+        raise ChannelRejectedError(self.name, code, description)
+
+
+def create_notification_channels(telegram_notifier) -> Dict[CommunicationChannelsTypesEnum, NotificationChannel]:
+    """Каналы, для которых заданы учётные данные; Telegram доступен всегда"""
+    settings = get_settings()
+    channels: Dict[CommunicationChannelsTypesEnum, NotificationChannel] = {
+        CommunicationChannelsTypesEnum.TELEGRAM: TelegramChannel(telegram_notifier, TELEGRAM_RETRY_POLICY),
+    }
+    if settings.VK_GROUP_TOKEN:
+        channels[CommunicationChannelsTypesEnum.VK] = VkChannel(settings.VK_GROUP_TOKEN)
+    if settings.WHATSAPP_ACCESS_TOKEN and settings.WHATSAPP_PHONE_NUMBER_ID:
+        channels[CommunicationChannelsTypesEnum.WHATSAPP] = WhatsAppChannel(
+            settings.WHATSAPP_ACCESS_TOKEN, settings.WHATSAPP_PHONE_NUMBER_ID
+        )
+    return channels
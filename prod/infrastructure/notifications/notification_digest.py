@@ -0,0 +1,124 @@
+"""
+Дайджест уведомлений: сообщения одному чату за короткое окно уходят одним сообщением
+
+Клиент, у которого за несколько секунд подтвердилась, перенеслась и оплатилась бронь,
+получает одно сообщение вместо трёх, и лимит Telegram на чат (1 сообщение/с) не тратится
+на каждое событие. Срочные типы (TELEGRAM_DIGEST_URGENT_TYPES, например отмена)
+отправляются сразу, мимо дайджеста.
+
+Накопленные тексты хранятся в Redis, поэтому события одного чата могут обрабатывать
+разные воркеры. Первое сообщение окна планирует сброс (задача Celery с countdown);
+сброс забирает весь список атомарно.
+"""
+
+import logging
+from typing import List, NamedTuple
+
+import redis
+
+from ..config.settings import get_settings
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+DIGEST_KEY_PREFIX = "telegram:digest"
+
+# Разделитель уведомлений в одном сообщении
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+# Ограничение Telegram на длину текста сообщения
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Добавление текста в дайджест чата. KEYS[1] — список текстов, KEYS[2] — маркер
+# запланированного сброса; ARGV[1] — текст, ARGV[2] — TTL маркера, ARGV[3] — TTL списка (мс).
+# Маркер живёт дольше окна: если задача сброса потеряна, после его истечения
+# следующее сообщение запланирует сброс заново, и накопленное не зависнет.
+# Возвращает {длина списка, 1 — сброс нужно запланировать}
+_ADD_SCRIPT = """
+local size = redis.call('RPUSH', KEYS[1], ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+local schedule = redis.call('SET', KEYS[2], '1', 'NX', 'PX', ARGV[2])
+return {size, schedule and 1 or 0}
+"""
+
+# Все накопленные тексты с удалением списка и маркера
+_DRAIN_SCRIPT = """
+local texts = redis.call('LRANGE', KEYS[1], 0, -1)
+redis.call('DEL', KEYS[1], KEYS[2])
+return texts
+"""
+
+
+class DigestEntry(NamedTuple):
+    """Результат добавления: размер дайджеста и нужно ли планировать его сброс"""
+
+    size: int
+    schedule_flush: bool
+
+
+class NotificationDigest:
+    """Накопление уведомлений по chat_id в Redis и сборка их в сообщения"""
+
+    def __init__(
+        self,
+        redis_connection: redis.Redis | None = None,
+        window_seconds: float | None = None,
+        max_messages: int | None = None,
+        key_prefix: str = DIGEST_KEY_PREFIX,
+    ):
+        settings = get_settings()
+        self.redis = redis_connection or create_redis_connection()
+        self.window_seconds = window_seconds or settings.TELEGRAM_DIGEST_WINDOW
+        self.max_messages = max_messages or settings.TELEGRAM_DIGEST_MAX_MESSAGES
+        self.urgent_types = frozenset(settings.TELEGRAM_DIGEST_URGENT_TYPES)
+        self.key_prefix = key_prefix
+        self._add = self.redis.register_script(_ADD_SCRIPT)
+        self._drain = self.redis.register_script(_DRAIN_SCRIPT)
+
+    def _keys(self, chat_id: int) -> List[str]:
+        key = f"{self.key_prefix}:{chat_id}"
+        return [key, f"{key}:scheduled"]
+
+    def is_urgent(self, notification_type: str) -> bool:
+        return notification_type in self.urgent_types
+
+    def add(self, chat_id: int, text: str) -> DigestEntry | None:
+        """
+        Добавление уведомления в дайджест чата
+
+        None — Redis недоступен: уведомление нужно отправить сразу, а не потерять
+        """
+        window_ms = int(self.window_seconds * 1000)
+        try:
+            size, schedule = self._add(
+                keys=self._keys(chat_id), args=[text, window_ms * 2 + 60_000, window_ms + 3_600_000]
+            )
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Дайджест чата {chat_id} недоступен, уведомление отправляется сразу: {str(e)}")
+            return None
+        return DigestEntry(int(size), bool(int(schedule)))
+
+    def drain(self, chat_id: int) -> List[str]:
+        """Накопленные тексты чата (дайджест при этом очищается)"""
+        return list(self._drain(keys=self._keys(chat_id)))
+
+    @staticmethod
+    def combine(texts: List[str]) -> List[str]:
+        """
+        Сборка текстов в сообщения не длиннее TELEGRAM_MESSAGE_LIMIT
+
+        Тексты не разрезаются (HTML-разметка каждого остаётся целой): не поместившийся
+        текст начинает следующее сообщение
+        """
+        messages: List[str] = []
+        current = ""
+        for text in texts:
+            candidate = f"{current}{DIGEST_SEPARATOR}{text}" if current else text
+            if current and len(candidate) > TELEGRAM_MESSAGE_LIMIT:
+                messages.append(current)
+                current = text
+            else:
+                current = candidate
+        if current:
+            messages.append(current)
+        return messages
@@ -0,0 +1,261 @@
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+from uuid import UUID, uuid4
+
+import redis
+
+from ...application.services.event_bus import EventBus
+from ...domain.bookings.booking.booking_events import BookingCancelledEvent, BookingConfirmedEvent
+from ...domain.communication_channels.communication_channel_enums import CommunicationChannelsTypesEnum
+from ..config.settings import get_settings
+from .communication_channel_repository import RedisCommunicationChannelRepository
+from .delivery_metrics import DEFERRED, FAILED, NO_CHANNEL, REJECTED, SENT, DeliveryMetrics
+from .notification_channels import ChannelRejectedError, create_notification_channels
+from .notification_templates import BOOKING_CANCELLED, BOOKING_CONFIRMED, BOOKING_REMINDER
+from .rate_limiter import RateLimitExceeded
+from .reminder_scheduler import reminder_template_values
+from .retry_mechanism import RetryPolicy
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """
+    Мультиканальные уведомления: канал клиента выбирается по его CommunicationChannel
+
+    Обработчики событий, напоминания и дайджесты только выбирают канал и готовят текст;
+    отправка всех каналов идёт через одну очередь Celery (deliver_notification), где канал
+    применяет свои лимиты и повторы, а исход попадает в общие DeliveryMetrics.
+    Рассылки выбирают каналы здесь же (resolve_recipients), но Telegram-получателей
+    отправляют чанками через общий лимитер Telegram и пишут исходы в те же метрики.
+    Включается настройкой NOTIFICATION_DISPATCHER_ENABLED: TelegramNotifier тогда
+    не подписывается на события сам и работает как канал Telegram
+    """
+
+    _instance = None
+
+    def __new__(cls, telegram_notifier, channel_repository=None):
+        if cls._instance is None:
+            cls._instance = super(NotificationDispatcher, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self, telegram_notifier, channel_repository=None):
+        if self._initialized:
+            return
+
+        settings = get_settings()
+        self.telegram_notifier = telegram_notifier
+        self.templates = telegram_notifier.templates
+        self.channel_repository = channel_repository or RedisCommunicationChannelRepository()
+        self.channels = create_notification_channels(telegram_notifier)
+        self.priority = [CommunicationChannelsTypesEnum(name) for name in settings.NOTIFICATION_CHANNEL_PRIORITY]
+        self.metrics = DeliveryMetrics()
+
+        self._register_event_handlers()
+        self._initialized = True
+        logger.info(f"✅ Диспетчер уведомлений: каналы {', '.join(self.channels)}")
+
+    def _register_event_handlers(self) -> None:
+        EventBus.subscribe(BookingConfirmedEvent, self._handle_booking_confirmed)
+        EventBus.subscribe(BookingCancelledEvent, self._handle_booking_cancelled)
+
+    # region Выбор канала
+
+    def resolve_recipient(self, user_id: UUID | str) -> Tuple[CommunicationChannelsTypesEnum, str] | None:
+        """
+        (канал, адрес получателя) по NOTIFICATION_CHANNEL_PRIORITY среди каналов клиента
+
+        Клиент без записей CommunicationChannel получает уведомления в привязанный Telegram
+        """
+        recipient = self._preferred_channel(user_id)
+        if recipient is not None:
+            return recipient
+
+        chat_id = self.telegram_notifier.get_chat_ids([user_id]).get(str(user_id))
+        if chat_id:
+            return CommunicationChannelsTypesEnum.TELEGRAM, str(chat_id)
+        return None
+
+    def resolve_recipients(
+        self, user_ids: Iterable[UUID | str]
+    ) -> Dict[CommunicationChannelsTypesEnum, List[str]]:
+        """
+        Адреса получателей рассылки по каналам (без повторов); выбор канала — как в resolve_recipient
+
+        chat_id клиентов без своих каналов запрашиваются пачками (get_chat_ids), а не по одному
+        """
+        recipients: Dict[CommunicationChannelsTypesEnum, Dict[str, None]] = {}
+        telegram_fallback: List[UUID | str] = []
+        for user_id in user_ids:
+            recipient = self._preferred_channel(user_id)
+            if recipient is None:
+                telegram_fallback.append(user_id)
+            else:
+                recipients.setdefault(recipient[0], {})[recipient[1]] = None
+
+        chat_ids = self.telegram_notifier.get_chat_ids(telegram_fallback)
+        for chat_id in chat_ids.values():
+            recipients.setdefault(CommunicationChannelsTypesEnum.TELEGRAM, {})[str(chat_id)] = None
+        if len(chat_ids) < len(telegram_fallback):
+            self.metrics.record("none", NO_CHANNEL, count=len(telegram_fallback) - len(chat_ids))
+
+        return {channel_type: list(addresses) for channel_type, addresses in recipients.items()}
+
+    def _preferred_channel(self, user_id: UUID | str) -> Tuple[CommunicationChannelsTypesEnum, str] | None:
+        """Первый по приоритету настроенный канал из записей CommunicationChannel клиента"""
+        try:
+            records = {
+                channel.type: channel.value
+                for channel in self.channel_repository.find_by_user_id(user_id)
+                if channel.value
+            }
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Каналы пользователя {user_id} недоступны, используется Telegram: {str(e)}")
+            return None
+
+        for channel_type in self.priority:
+            if channel_type in records and channel_type in self.channels:
+                return channel_type, records[channel_type]
+        return None
+
+    # endregion
+
+    # region Отправка
+
+    def dispatch(
+        self,
+        user_id: UUID | str,
+        notification_type: str,
+        values: Mapping[str, Any],
+        studio_id: UUID | str | None = None,
+    ) -> None:
+        """Выбор канала, подготовка текста и постановка отправки в очередь"""
+        recipient = self.resolve_recipient(user_id)
+        if recipient is None:
+            logger.debug(f"Уведомление {notification_type} пропущено: у пользователя {user_id} нет каналов")
+            self.metrics.record("none", NO_CHANNEL)
+            return
+
+        channel_type, address = recipient
+        text = self.templates.render(notification_type, values, studio_id=studio_id)
+
+        # Дайджест — механизм Telegram: несрочные уведомления копятся в нём, как и без диспетчера
+        digest = self.telegram_notifier.digest
+        if channel_type == CommunicationChannelsTypesEnum.TELEGRAM and digest is not None:
+            if not digest.is_urgent(notification_type) and self.telegram_notifier.add_to_digest(int(address), text):
+                return
+
+        self._enqueue(channel_type, address, text)
+
+    def dispatch_reminder(self, reminder: Dict[str, Any]) -> None:
+        """Напоминание о брони (данные ReminderScheduler) в канал клиента"""
+        self.dispatch(
+            reminder["client_id"],
+            BOOKING_REMINDER,
+            reminder_template_values(reminder),
+            studio_id=reminder["studio_id"],
+        )
+
+    def flush_digest(self, chat_id: int) -> None:
+        """Сообщения дайджеста чата — в общую очередь доставки, как остальные уведомления Telegram"""
+        messages, count = self.telegram_notifier.drain_digest(chat_id)
+        for message in messages:
+            self._enqueue(CommunicationChannelsTypesEnum.TELEGRAM, str(chat_id), message)
+        if messages:
+            logger.info(f"🗂️ Дайджест ({count}) чата {chat_id} поставлен в очередь доставки")
+
+    def broadcast(self, recipients: Mapping[CommunicationChannelsTypesEnum, List[str]], text: str) -> None:
+        """Рассылка в каналы, кроме Telegram (его отправляют чанки рассылки): задача на получателя"""
+        for channel_type, addresses in recipients.items():
+            if channel_type == CommunicationChannelsTypesEnum.TELEGRAM:
+                continue
+            for address in addresses:
+                self._enqueue(channel_type, address, text)
+
+    def _enqueue(self, channel_type: CommunicationChannelsTypesEnum, recipient: str, text: str) -> None:
+        # Модуль задач сам импортирует диспетчер
+        from ..celery.celery_app import get_celery_app
+        from ..celery.tasks.notifications_tasks import deliver_notification
+
+        # Один идентификатор на все повторы и переносы задачи
+        delivery_id = uuid4().hex
+        try:
+            get_celery_app()
+            deliver_notification.apply_async((channel_type.value, recipient, text, delivery_id))
+        except Exception as e:
+            logger.error(f"❌ Очередь уведомлений недоступна, отправка в {channel_type} сразу: {str(e)}")
+            try:
+                self.deliver(channel_type.value, recipient, text, delivery_id=delivery_id)
+            except Exception as error:
+                logger.error(f"❌ Не удалось отправить уведомление в {channel_type}: {str(error)}")
+
+    def retry_policy(self, channel_type: str) -> RetryPolicy:
+        """Политика повторов канала (для задачи, повторяющей отправку через очередь)"""
+        channel = self.channels.get(CommunicationChannelsTypesEnum(channel_type))
+        return channel.retry_policy if channel is not None else RetryPolicy()
+
+    def deliver(
+        self,
+        channel_type: str,
+        recipient: str,
+        text: str,
+        blocking_retries: bool = True,
+        delivery_id: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Отправка в канал (задача deliver_notification) с записью исхода в метрики
+
+        Исключения пробрасываются: RateLimitExceeded — отправку нужно перенести,
+        ChannelRejectedError — повтор не поможет, остальные — повторить
+        """
+        channel = self.channels.get(CommunicationChannelsTypesEnum(channel_type))
+        if channel is None:
+            self.metrics.record(channel_type, REJECTED)
+            raise ChannelRejectedError(channel_type, 0, "канал не настроен")
+
+        started = time.perf_counter()
+        try:
+            result = channel.send(recipient, text, blocking_retries, delivery_id)
+        except RateLimitExceeded:
+            self.metrics.record(channel_type, DEFERRED)
+            raise
+        except ChannelRejectedError:
+            self.metrics.record(channel_type, REJECTED, time.perf_counter() - started)
+            raise
+        except Exception:
+            self.metrics.record(channel_type, FAILED, time.perf_counter() - started)
+            raise
+
+        self.metrics.record(channel_type, SENT, time.perf_counter() - started)
+        return result
+
+    # endregion
+
+    # region Обработчики событий
+
+    def _handle_booking_confirmed(self, event: BookingConfirmedEvent) -> None:
+        logger.info(f"🔔 Уведомление о подтверждении бронирования: {event.booking_id}")
+        self.dispatch(
+            event.client_id,
+            BOOKING_CONFIRMED,
+            {
+                "booking_id": event.booking_id,
+                "studio_id": event.studio_id,
+                "start": event.time_range_start,
+                "end": event.time_range_end,
+            },
+            studio_id=event.studio_id,
+        )
+
+    def _handle_booking_cancelled(self, event: BookingCancelledEvent) -> None:
+        logger.info(f"🔔 Уведомление об отмене бронирования: {event.booking_id}")
+        self.dispatch(
+            event.client_id,
+            BOOKING_CANCELLED,
+            {"booking_id": event.booking_id, "studio_id": event.studio_id, "reason": event.reason},
+            studio_id=event.studio_id,
+        )
+
+    # endregion
@@ -0,0 +1,266 @@
+"""
+Шаблоны уведомлений по (тип события, локаль)
+
+Шаблоны — строки str.format с именованными полями. Поля-даты форматируются
+спецификатором: {start:date}, {start:time}, {start:datetime} — в локали получателя
+и в его часовом поясе, если он задан (иначе — в часовом поясе самой брони).
+
+Тексты по умолчанию ниже; студии переопределяют их без изменения кода через JSON
+(NOTIFICATION_TEMPLATES_PATH):
+
+    {
+        "templates": {"BookingConfirmedEvent": {"ru": "..."}},
+        "studios": {"<studio_id>": {"BookingCancelledEvent": {"ru": "..."}}}
+    }
+"""
+
+import json
+import logging
+import string
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Mapping, Tuple
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+BOOKING_CONFIRMED = "BookingConfirmedEvent"
+BOOKING_CANCELLED = "BookingCancelledEvent"
+BOOKING_REMINDER = "BookingReminder"
+
+# Поля, доступные шаблону каждого типа; остальные имена (и обращения к атрибутам
+# вида {booking_id.__class__}) отклоняются при компиляции
+TEMPLATE_FIELDS: Dict[str, FrozenSet[str]] = {
+    BOOKING_CONFIRMED: frozenset({"booking_id", "studio_id", "start", "end"}),
+    BOOKING_REMINDER: frozenset({"booking_id", "studio_id", "start", "end"}),
+    BOOKING_CANCELLED: frozenset({"booking_id", "studio_id", "reason"}),
+}
+
+# Поля-даты каждого типа: спецификаторы date / time / datetime допустимы только у них
+TEMPLATE_DATETIME_FIELDS: Dict[str, FrozenSet[str]] = {
+    BOOKING_CONFIRMED: frozenset({"start", "end"}),
+    BOOKING_REMINDER: frozenset({"start", "end"}),
+    BOOKING_CANCELLED: frozenset(),
+}
+
+# Локаль встроенных шаблонов, на которую падает поиск, если текста для локали нет
+FALLBACK_LOCALE = "ru"
+
+DEFAULT_TEMPLATES: Dict[Tuple[str, str], str] = {
+    (BOOKING_CONFIRMED, "ru"): (
+        "✅ <b>Бронирование подтверждено!</b>\n\n"
+        "🆔 Бронь: {booking_id}\n"
+        "🎵 Студия: {studio_id}\n"
+        "📅 Дата: {start:date}\n"
+        "⏰ Время: {start:time} - {end:time}\n\n"
+        "Для управления бронированием используйте команду /bookings"
+    ),
+    (BOOKING_CONFIRMED, "en"): (
+        "✅ <b>Booking confirmed!</b>\n\n"
+        "🆔 Booking: {booking_id}\n"
+        "🎵 Studio: {studio_id}\n"
+        "📅 Date: {start:date}\n"
+        "⏰ Time: {start:time} - {end:time}\n\n"
+        "Use /bookings to manage your bookings"
+    ),
+    (BOOKING_REMINDER, "ru"): (
+        "⏰ <b>Напоминание о бронировании</b>\n\n"
+        "🆔 Бронь: {booking_id}\n"
+        "🎵 Студия: {studio_id}\n"
+        "📅 Дата: {start:date}\n"
+        "⏰ Время: {start:time} - {end:time}\n\n"
+        "Для управления бронированием используйте команду /bookings"
+    ),
+    (BOOKING_REMINDER, "en"): (
+        "⏰ <b>Booking reminder</b>\n\n"
+        "🆔 Booking: {booking_id}\n"
+        "🎵 Studio: {studio_id}\n"
+        "📅 Date: {start:date}\n"
+        "⏰ Time: {start:time} - {end:time}\n\n"
+        "Use /bookings to manage your bookings"
+    ),
+    (BOOKING_CANCELLED, "ru"): (
+        "❌ <b>Бронирование отменено</b>\n\n"
+        "🆔 Бронь: {booking_id}\n"
+        "❗ Причина: {reason}\n\n"
+        "Для повторного бронирования используйте /book_new"
+    ),
+    (BOOKING_CANCELLED, "en"): (
+        "❌ <b>Booking cancelled</b>\n\n"
+        "🆔 Booking: {booking_id}\n"
+        "❗ Reason: {reason}\n\n"
+        "Use /book_new to book again"
+    ),
+}
+
+# strftime-форматы по локали для спецификаторов date / time / datetime
+_DATETIME_FORMATS: Dict[str, Dict[str, str]] = {
+    "ru": {"date": "%d.%m.%Y", "time": "%H:%M", "datetime": "%d.%m.%Y %H:%M"},
+    "en": {"date": "%m/%d/%Y", "time": "%H:%M", "datetime": "%m/%d/%Y %H:%M"},
+}
+
+
+class DateTimeFormatter:
+    """
+    Форматирование дат в локали получателя
+
+    timezone=None — время выводится в часовом поясе самого значения (брони);
+    с заданным часовым поясом значение переводится в него. Результаты кэшируются:
+    рассылка одной брони тысячам получателей и повторные события с теми же
+    временами не вызывают astimezone/strftime заново
+    """
+
+    def __init__(self, timezone: str | None, locale: str):
+        self.zone = ZoneInfo(timezone) if timezone else None
+        self.formats = _DATETIME_FORMATS.get(locale, _DATETIME_FORMATS["ru"])
+        self.format = lru_cache(maxsize=4096)(self._format)
+
+    def _format(self, value: datetime, spec: str) -> str:
+        if self.zone is not None and value.tzinfo is not None:
+            value = value.astimezone(self.zone)
+        return value.strftime(self.formats[spec])
+
+
+@lru_cache(maxsize=None)
+def get_datetime_formatter(timezone: str | None, locale: str) -> DateTimeFormatter:
+    """Один форматтер на (часовой пояс, локаль) на процесс"""
+    return DateTimeFormatter(timezone, locale)
+
+
+class _LocalizedDateTime:
+    """Дата для шаблона: {start:date} вызывает __format__ со спецификатором "date" """
+
+    __slots__ = ("value", "formatter")
+
+    def __init__(self, value: datetime, formatter: DateTimeFormatter):
+        self.value = value
+        self.formatter = formatter
+
+    def __format__(self, spec: str) -> str:
+        return self.formatter.format(self.value, spec or "datetime")
+
+
+class NotificationTemplate:
+    """Шаблон, проверенный один раз при загрузке: известные поля и спецификаторы дат"""
+
+    __slots__ = ("source",)
+
+    def __init__(self, source: str, fields: FrozenSet[str], datetime_fields: FrozenSet[str] = frozenset()):
+        for _, name, spec, conversion in string.Formatter().parse(source):
+            if name is None:
+                continue
+            if name not in fields:
+                raise ValueError(f"неизвестное поле шаблона: {{{name}}}")
+            if conversion or (spec and (name not in datetime_fields or spec not in _DATETIME_FORMATS["ru"])):
+                raise ValueError(f"неподдерживаемый формат поля {{{name}}}: {spec or conversion}")
+        self.source = source
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        return self.source.format_map(values)
+
+
+class TemplateRegistry:
+    """
+    Реестр шаблонов уведомлений
+
+    Поиск шаблона: переопределение студии → шаблон локали → шаблон локали по умолчанию →
+    встроенный шаблон FALLBACK_LOCALE. Часовой пояс по умолчанию проверяется при создании:
+    опечатка в NOTIFICATION_TIMEZONE останавливает запуск, а не первую отправку
+    """
+
+    def __init__(
+        self,
+        overrides_path: str | None = None,
+        default_locale: str | None = None,
+        default_timezone: str | None = None,
+    ):
+        settings = get_settings()
+        self.default_locale = default_locale or settings.NOTIFICATION_LOCALE
+        self.default_timezone = default_timezone or settings.NOTIFICATION_TIMEZONE
+        try:
+            get_datetime_formatter(self.default_timezone, self.default_locale)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"Неизвестный часовой пояс уведомлений: {self.default_timezone!r}") from e
+        self._templates: Dict[Tuple[str, str], NotificationTemplate] = {
+            key: NotificationTemplate(source, TEMPLATE_FIELDS[key[0]], TEMPLATE_DATETIME_FIELDS[key[0]])
+            for key, source in DEFAULT_TEMPLATES.items()
+        }
+        self._studio_templates: Dict[Tuple[str, str, str], NotificationTemplate] = {}
+
+        overrides_path = overrides_path or settings.NOTIFICATION_TEMPLATES_PATH
+        if overrides_path:
+            try:
+                self.load_overrides(overrides_path)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Шаблоны {overrides_path} не загружены, используются стандартные: {str(e)}")
+
+        missing = [
+            event_type for event_type in TEMPLATE_FIELDS if (event_type, self.default_locale) not in self._templates
+        ]
+        if missing:
+            logger.warning(
+                f"⚠️ Нет шаблонов локали {self.default_locale} для {', '.join(missing)}: "
+                f"используются шаблоны {FALLBACK_LOCALE}"
+            )
+
+    def load_overrides(self, path: str) -> None:
+        """Загрузка текстов студий из JSON; некорректный шаблон пропускается с ошибкой в логе"""
+        overrides = json.loads(Path(path).read_text(encoding="utf-8"))
+
+        for event_type, sources in overrides.get("templates", {}).items():
+            for locale, source in sources.items():
+                self._add(self._templates, (event_type, locale), source)
+
+        for studio_id, templates in overrides.get("studios", {}).items():
+            for event_type, sources in templates.items():
+                for locale, source in sources.items():
+                    self._add(self._studio_templates, (event_type, locale, str(studio_id)), source)
+
+        logger.info(f"📝 Загружены шаблоны уведомлений: {path}")
+
+    @staticmethod
+    def _add(templates: dict, key: tuple, source: str) -> None:
+        event_type = key[0]
+        try:
+            if event_type not in TEMPLATE_FIELDS:
+                raise ValueError(f"неизвестный тип уведомления {event_type}")
+            templates[key] = NotificationTemplate(
+                source, TEMPLATE_FIELDS[event_type], TEMPLATE_DATETIME_FIELDS[event_type]
+            )
+        except ValueError as e:
+            logger.error(f"❌ Шаблон {key} пропущен: {str(e)}")
+
+    def get(
+        self, event_type: str, locale: str | None = None, studio_id: UUID | str | None = None
+    ) -> NotificationTemplate:
+        locale = locale or self.default_locale
+        if studio_id is not None:
+            template = self._studio_templates.get((event_type, locale, str(studio_id)))
+            if template is not None:
+                return template
+        return (
+            self._templates.get((event_type, locale))
+            or self._templates.get((event_type, self.default_locale))
+            or self._templates[(event_type, FALLBACK_LOCALE)]
+        )
+
+    def render(
+        self,
+        event_type: str,
+        values: Mapping[str, Any],
+        locale: str | None = None,
+        timezone: str | None = None,
+        studio_id: UUID | str | None = None,
+    ) -> str:
+        """Текст уведомления; datetime-значения форматируются в timezone и locale"""
+        locale = locale or self.default_locale
+        formatter = get_datetime_formatter(timezone or self.default_timezone, locale)
+        context = {
+            name: _LocalizedDateTime(value, formatter) if isinstance(value, datetime) else value
+            for name, value in values.items()
+        }
+        return self.get(event_type, locale, studio_id).render(context)
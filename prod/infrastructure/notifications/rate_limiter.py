@@ -0,0 +1,211 @@
+import logging
+import math
+import time
+from typing import List, NamedTuple
+
+import redis
+
+from ..config.settings import get_settings
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_KEY_PREFIX = "telegram:rate"
+
+# Резервирование слота отправки сразу во всех бакетах (GCRA — token bucket, в котором
+# хранится одно число на бакет: теоретическое время следующей отправки, TAT).
+# KEYS — бакеты; ARGV[1] — максимальное ожидание, далее пары (интервал, допуск) по бакетам.
+# Время берётся у Redis, поэтому расхождение часов воркеров не влияет на лимит.
+# Возвращает {1, задержка} при резервировании или {0, задержка}, если ждать дольше ARGV[1]
+_RESERVE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local max_delay = tonumber(ARGV[1])
+
+local send_at = now
+local tats = {}
+for i, key in ipairs(KEYS) do
+    tats[i] = tonumber(redis.call('GET', key)) or now
+    local allowed_at = tats[i] - tonumber(ARGV[i * 2 + 1])
+    if allowed_at > send_at then
+        send_at = allowed_at
+    end
+end
+
+local delay = send_at - now
+if delay > max_delay then
+    return {0, tostring(delay)}
+end
+
+for i, key in ipairs(KEYS) do
+    local tat = math.max(tats[i], send_at) + tonumber(ARGV[i * 2])
+    redis.call('SET', key, tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+end
+return {1, tostring(delay)}
+"""
+
+# Пауза всей полосы бота после 429: TAT глобального бакета сдвигается так, чтобы первый
+# свободный слот у всех воркеров был не раньше now + ARGV[1]. ARGV[2] — допуск бакета
+_PAUSE_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tat = now + tonumber(ARGV[1]) + tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', KEYS[1])) or now
+if tat > current then
+    redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now) * 1000) + 1000)
+end
+"""
+
+
+class Reservation(NamedTuple):
+    """Результат резервирования: granted=False — слот дальше max_delay и не занят"""
+
+    granted: bool
+    delay: float
+
+
+class RateLimitExceeded(Exception):
+    """Ближайший свободный слот отправки дальше допустимого ожидания"""
+
+    def __init__(self, retry_after: float, channel: str = "Telegram"):
+        self.retry_after = retry_after
+        super().__init__(f"Лимит отправок в {channel} исчерпан, следующий слот через {retry_after:.1f}с")
+
+    @property
+    def countdown(self) -> int:
+        """Задержка для повторного запуска задачи Celery, целых секунд"""
+        return math.ceil(self.retry_after)
+
+
+class RateLimiter:
+    """
+    Общий для всех воркеров лимит отправок в канал уведомлений (token bucket в Redis)
+
+    - глобальный бакет отправителя (бота, сообщества, номера): global_rate сообщений/с,
+      всплеск до global_burst;
+    - бакет каждого получателя: chat_rate сообщений/с без всплеска.
+
+    Отправка не «пробует и получает 429», а заранее резервирует слот: reserve()
+    возвращает, сколько подождать до отправки, и эта очередь общая для всех процессов.
+    Работает и с redis.Redis (reserve), и с redis.asyncio.Redis (reserve_async)
+    """
+
+    def __init__(
+        self,
+        sender_id: str,
+        global_rate: float,
+        chat_rate: float,
+        redis_connection=None,
+        global_burst: int = 1,
+        max_delay: float = 30.0,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+        channel: str = "Telegram",
+    ):
+        self.redis = redis_connection or create_redis_connection()
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.chat_rate = chat_rate
+        self.max_delay = max_delay
+        self.channel = channel
+        self.global_key = f"{key_prefix}:{sender_id}:global"
+        self.chat_key_prefix = f"{key_prefix}:{sender_id}:chat"
+        self._reserve = self.redis.register_script(_RESERVE_SCRIPT)
+        self._pause = self.redis.register_script(_PAUSE_SCRIPT)
+
+    @property
+    def _global_tolerance(self) -> float:
+        return (self.global_burst - 1) / self.global_rate
+
+    def _keys_and_args(self, chat_id: int, max_delay: float | None) -> tuple[List[str], list]:
+        keys = [self.global_key, f"{self.chat_key_prefix}:{chat_id}"]
+        args = [
+            self.max_delay if max_delay is None else max_delay,
+            1 / self.global_rate,
+            self._global_tolerance,
+            1 / self.chat_rate,
+            0,
+        ]
+        return keys, args
+
+    @staticmethod
+    def _reservation(result: list) -> Reservation:
+        granted, delay = result
+        return Reservation(bool(int(granted)), max(float(delay), 0.0))
+
+    def _unlimited(self, error: Exception) -> Reservation:
+        # Недоступность Redis не должна останавливать уведомления: отправка идёт без лимита
+        logger.warning(f"⚠️ Лимит отправок в {self.channel} не применён, Redis недоступен: {str(error)}")
+        return Reservation(True, 0.0)
+
+    def reserve(self, chat_id: int, max_delay: float | None = None) -> Reservation:
+        """Резервирование слота отправки в чат; delay — сколько ждать до отправки"""
+        keys, args = self._keys_and_args(chat_id, max_delay)
+        try:
+            return self._reservation(self._reserve(keys=keys, args=args))
+        except redis.RedisError as e:
+            return self._unlimited(e)
+
+    async def reserve_async(self, chat_id: int, max_delay: float | None = None) -> Reservation:
+        """То же через redis.asyncio-подключение (для асинхронного движка доставки)"""
+        keys, args = self._keys_and_args(chat_id, max_delay)
+        try:
+            return self._reservation(await self._reserve(keys=keys, args=args))
+        except redis.RedisError as e:
+            return self._unlimited(e)
+
+    def pause(self, seconds: float) -> None:
+        """Пауза отправок во всех воркерах (канал ответил 429 с retry_after)"""
+        try:
+            self._pause(keys=[self.global_key], args=[seconds, self._global_tolerance])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Не удалось приостановить отправку в {self.channel}: {str(e)}")
+            return
+        logger.warning(f"⏸️ Отправка в {self.channel} приостановлена на {seconds:.0f}с (429)")
+
+    async def pause_async(self, seconds: float) -> None:
+        """То же через redis.asyncio-подключение"""
+        try:
+            await self._pause(keys=[self.global_key], args=[seconds, self._global_tolerance])
+        except redis.RedisError as e:
+            logger.warning(f"⚠️ Не удалось приостановить отправку в {self.channel}: {str(e)}")
+            return
+        logger.warning(f"⏸️ Отправка в {self.channel} приостановлена на {seconds:.0f}с (429)")
+
+    def wait(self, chat_id: int, max_delay: float | None = None) -> None:
+        """
+        Блокирующее ожидание слота (синхронная отправка)
+
+        Если слот дальше max_delay, поднимается RateLimitExceeded с retry_after
+        """
+        reservation = self.reserve(chat_id, max_delay)
+        if not reservation.granted:
+            raise RateLimitExceeded(reservation.delay, self.channel)
+        if reservation.delay > 0:
+            logger.debug(f"⏳ Ожидание слота отправки в {self.channel} ({chat_id}): {reservation.delay:.2f}с")
+            time.sleep(reservation.delay)
+
+
+class TelegramRateLimiter(RateLimiter):
+    """Лимиты Telegram Bot API: по умолчанию — из настроек TELEGRAM_*"""
+
+    def __init__(
+        self,
+        bot_id: str,
+        redis_connection=None,
+        global_rate: float | None = None,
+        global_burst: int | None = None,
+        chat_rate: float | None = None,
+        max_delay: float | None = None,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+    ):
+        settings = get_settings()
+        super().__init__(
+            bot_id,
+            global_rate or settings.TELEGRAM_GLOBAL_RATE_LIMIT,
+            chat_rate or settings.TELEGRAM_CHAT_RATE_LIMIT,
+            redis_connection=redis_connection,
+            global_burst=global_burst or settings.TELEGRAM_GLOBAL_BURST,
+            max_delay=max_delay or settings.TELEGRAM_RATE_LIMIT_MAX_WAIT,
+            key_prefix=key_prefix,
+        )
+
@@ -0,0 +1,172 @@
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from uuid import UUID
+
+import redis
+
+from ...application.services.event_bus import EventBus
+from ...domain.bookings.booking.booking_events import (
+    BookingCancelledEvent,
+    BookingCompletedEvent,
+    BookingConfirmedEvent,
+    BookingRescheduledEvent,
+)
+from ..config.settings import get_settings
+from ..redis_client import create_redis_connection
+
+logger = logging.getLogger(__name__)
+
+REMINDERS_DUE_KEY = "reminders:due"
+REMINDERS_PAYLOAD_KEY = "reminders:payload"
+
+# Атомарное извлечение наступивших напоминаний: параллельные тики beat (или несколько
+# планировщиков) не получат одно напоминание дважды
+_POP_DUE_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids == 0 then
+    return {}
+end
+redis.call('ZREM', KEYS[1], unpack(ids))
+local payloads = redis.call('HMGET', KEYS[2], unpack(ids))
+redis.call('HDEL', KEYS[2], unpack(ids))
+return payloads
+"""
+
+
+class ReminderScheduler:
+    """
+    Индекс предстоящих напоминаний о бронированиях
+
+    - ZSET reminders:due: booking_id → время отправки напоминания (unix timestamp);
+    - HASH reminders:payload: booking_id → данные для текста напоминания (JSON).
+
+    Индекс обновляется доменными событиями: подтверждение и перенос ставят напоминание
+    (перенос сдвигает существующее), отмена и завершение снимают его.
+    Тик beat забирает только наступившие напоминания — O(log N + batch), без обхода всех броней
+    """
+
+    def __init__(
+        self,
+        redis_connection: redis.Redis | None = None,
+        hours_before: int | None = None,
+        due_key: str = REMINDERS_DUE_KEY,
+        payload_key: str = REMINDERS_PAYLOAD_KEY,
+    ):
+        self.redis = redis_connection or create_redis_connection()
+        self.hours_before = hours_before or get_settings().BOOKING_REMINDER_HOURS_BEFORE
+        self.due_key = due_key
+        self.payload_key = payload_key
+        self._pop_due = self.redis.register_script(_POP_DUE_SCRIPT)
+        self._subscribed = False
+
+    def register_event_handlers(self) -> None:
+        """Подписка на события бронирований в локальном EventBus (повторный вызов ничего не делает)"""
+        if self._subscribed:
+            return
+        self._subscribed = True
+        EventBus.subscribe(BookingConfirmedEvent, self._handle_booking_scheduled)
+        EventBus.subscribe(BookingRescheduledEvent, self._handle_booking_scheduled)
+        EventBus.subscribe(BookingCancelledEvent, self._handle_booking_closed)
+        EventBus.subscribe(BookingCompletedEvent, self._handle_booking_closed)
+
+    # region Индекс
+
+    def schedule(
+        self,
+        booking_id: UUID,
+        studio_id: UUID,
+        client_id: UUID,
+        time_range_start: datetime,
+        time_range_end: datetime,
+    ) -> None:
+        """Постановка (или перенос) напоминания за hours_before часов до начала брони"""
+        if time_range_start <= datetime.now(timezone.utc):
+            self.cancel(booking_id)
+            return
+
+        # Если до начала меньше hours_before часов, напоминание уйдёт на ближайшем тике
+        due_at = time_range_start - timedelta(hours=self.hours_before)
+        payload = {
+            "booking_id": str(booking_id),
+            "studio_id": str(studio_id),
+            "client_id": str(client_id),
+            "time_range_start": time_range_start.isoformat(),
+            "time_range_end": time_range_end.isoformat(),
+        }
+
+        pipeline = self.redis.pipeline()
+        pipeline.hset(self.payload_key, str(booking_id), json.dumps(payload))
+        pipeline.zadd(self.due_key, {str(booking_id): due_at.timestamp()})
+        pipeline.execute()
+        logger.debug(f"⏰ Напоминание о брони {booking_id} запланировано на {due_at.isoformat()}")
+
+    def cancel(self, booking_id: UUID) -> None:
+        """Снятие напоминания (если оно было)"""
+        pipeline = self.redis.pipeline()
+        pipeline.zrem(self.due_key, str(booking_id))
+        pipeline.hdel(self.payload_key, str(booking_id))
+        pipeline.execute()
+
+    def pop_due(self, limit: int, now: float | None = None) -> List[Dict[str, Any]]:
+        """Извлечение не более limit наступивших напоминаний (они удаляются из индекса)"""
+        payloads = self._pop_due(
+            keys=[self.due_key, self.payload_key], args=[now or time.time(), limit]
+        )
+        return [json.loads(payload) for payload in payloads if payload]
+
+    def restore(self, reminders: List[Dict[str, Any]]) -> None:
+        """Возврат извлечённых напоминаний в индекс (если их не удалось поставить в очередь)"""
+        for reminder in reminders:
+            self.schedule(
+                reminder["booking_id"],
+                reminder["studio_id"],
+                reminder["client_id"],
+                datetime.fromisoformat(reminder["time_range_start"]),
+                datetime.fromisoformat(reminder["time_range_end"]),
+            )
+
+    def count(self) -> int:
+        return self.redis.zcard(self.due_key)
+
+    # endregion
+
+    # region Обработчики событий
+
+    def _handle_booking_scheduled(self, event) -> None:
+        self.schedule(
+            event.booking_id,
+            event.studio_id,
+            event.client_id,
+            event.time_range_start,
+            event.time_range_end,
+        )
+
+    def _handle_booking_closed(self, event) -> None:
+        self.cancel(event.booking_id)
+        logger.debug(f"⏰ Напоминание о брони {event.booking_id} снято")
+
+    # endregion
+
+
+def reminder_template_values(reminder: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля шаблона напоминания из данных, извлечённых pop_due"""
+    return {
+        "booking_id": reminder["booking_id"],
+        "studio_id": reminder["studio_id"],
+        "start": datetime.fromisoformat(reminder["time_range_start"]),
+        "end": datetime.fromisoformat(reminder["time_range_end"]),
+    }
+
+
+_reminder_scheduler: ReminderScheduler | None = None
+
+
+def get_reminder_scheduler() -> ReminderScheduler:
+    """Планировщик напоминаний процесса (создаётся при первом обращении)"""
+    global _reminder_scheduler
+    if _reminder_scheduler is None:
+        _reminder_scheduler = ReminderScheduler()
+    return _reminder_scheduler
@@ -2,44 +2,73 @@ import time
 import random
 import functools
 import logging
-from typing import Callable, Any, Type
+from typing import Callable, Any, NamedTuple, Type
 
 logger = logging.getLogger(__name__)
 
 
+class RetryPolicy(NamedTuple):
+    """
+    Экспоненциальная задержка с jitter между попытками
+
+    Одна политика для обоих способов повтора: with_retry ждёт в потоке,
+    retry_later ставит задачу Celery в очередь заново с той же задержкой
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 10.0
+
+    def delay(self, attempt: int) -> float:
+        """Пауза после неудачной попытки номер attempt (с 1), секунд"""
+        return min(self.base_delay * (2 ** (attempt - 1)) + random.uniform(0, 1), self.max_delay)
+
+
 def with_retry(
     max_attempts: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 10.0,
     exceptions: tuple[Type[Exception], ...] = (Exception,),
+    no_retry_exceptions: tuple[Type[Exception], ...] = (),
+    retry_if: Callable[[BaseException], bool] | None = None,
 ) -> Callable:
     """
     Декоратор для реализации экспоненциальной задержки при повторных попытках
 
+    Повторы блокируют поток на время паузы: для вызовов внутри процесса. В задачах
+    Celery слот воркера освобождает retry_later
+
     Параметры:
     - max_attempts: максимальное количество попыток
     - base_delay: начальная задержка в секундах
     - max_delay: максимальная задержка в секундах
     - exceptions: типы исключений для перехвата
+    - no_retry_exceptions: исключения, которые пробрасываются сразу, без повторов
+    - retry_if: предикат перехваченного исключения; False — пробрасывается сразу
+      (например, ответ API, который повтор не изменит)
     """
+    policy = RetryPolicy(max_attempts, base_delay, max_delay)
 
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             last_exception = None
 
-            for attempt in range(max_attempts):
+            for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
+                except no_retry_exceptions:
+                    raise
                 except exceptions as e:
+                    if retry_if is not None and not retry_if(e):
+                        raise
                     last_exception = e
-                    if attempt == max_attempts - 1:
+                    if attempt == max_attempts:
                         break
 
-                    # Экспоненциальная задержка с jitter
-                    delay = min(base_delay * (2**attempt) + random.uniform(0, 1), max_delay)
+                    delay = policy.delay(attempt)
                     logger.warning(
-                        f"Attempt {attempt + 1}/{max_attempts} failed. "
+                        f"Attempt {attempt}/{max_attempts} failed. "
                         f"Retrying in {delay:.2f}s. Error: {str(e)}"
                     )
                     time.sleep(delay)
@@ -49,3 +78,22 @@ def with_retry(
         return wrapper
 
     return decorator
+
+
+def retry_later(task, exc: Exception, policy: RetryPolicy = RetryPolicy(), **options: Any) -> Exception:
+    """
+    Неблокирующий повтор задачи Celery: задача ставится в очередь заново с countdown
+
+    Пауза — та же экспонента с jitter, что у with_retry, но ждёт брокер, а не воркер:
+    слот освобождается сразу. Число попыток ограничивает max_retries задачи, после
+    его исчерпания пробрасывается exc. options передаются в task.retry (например, args).
+    Использование: raise retry_later(self, exc)
+    """
+    attempt = task.request.retries + 1
+    countdown = policy.delay(attempt)
+    attempts = "∞" if task.max_retries is None else task.max_retries + 1
+    logger.warning(
+        f"Attempt {attempt}/{attempts} failed. "
+        f"Re-enqueued in {countdown:.2f}s. Error: {str(exc)}"
+    )
+    return task.retry(exc=exc, countdown=countdown, **options)
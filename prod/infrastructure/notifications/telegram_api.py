@@ -0,0 +1,12 @@
+from ..config.settings import get_settings
+
+
+def telegram_send_message_url(bot_token: str, api_url: str | None = None) -> str:
+    """URL sendMessage; по умолчанию — TELEGRAM_API_URL из настроек"""
+    api_url = (api_url or get_settings().TELEGRAM_API_URL).rstrip("/")
+    return f"{api_url}/bot{bot_token}/sendMessage"
+
+
+def telegram_bot_id(bot_token: str) -> str:
+    """Числовой id бота — часть токена до двоеточия (сам токен в ключи Redis не попадает)"""
+    return bot_token.split(":", 1)[0]
@@ -0,0 +1,22 @@
+from typing import Any, Dict
+
+
+class TelegramApiError(Exception):
+    """Ответ Telegram Bot API с ok=false или HTTP-ошибкой"""
+
+    def __init__(self, error_code: int, description: str, parameters: Dict[str, Any] | None = None):
+        self.error_code = error_code
+        self.description = description
+        self.parameters = parameters or {}
+        super().__init__(f"Telegram API error {error_code}: {description}")
+
+    @property
+    def retryable(self) -> bool:
+        """Повтор имеет смысл при перегрузке (429) и ошибках сервера Telegram"""
+        return self.error_code == 429 or self.error_code >= 500
+
+    @property
+    def retry_after(self) -> float | None:
+        """Пауза, которую Telegram требует после 429 (parameters.retry_after), секунд"""
+        retry_after = self.parameters.get("retry_after")
+        return float(retry_after) if retry_after is not None else None
@@ -1,13 +1,42 @@
 import logging
+import math
 import requests
-from typing import Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Iterable, List, Tuple
+from uuid import UUID
 
-from ...domain.bookings.booking_events import BookingConfirmedEvent, BookingCancelledEvent
+from ...domain.bookings.booking.booking_events import BookingConfirmedEvent, BookingCancelledEvent
 from ...application.services.event_bus import EventBus
-from .retry_mechanism import with_retry
+from ..config.settings import get_settings
+from ..redis_client import create_redis_connection
+from .async_delivery import get_async_delivery
+from .chat_id_cache import CHAT_ID_INVALIDATION_CHANNEL, ChatIdCache
+from .notification_templates import (
+    BOOKING_CANCELLED,
+    BOOKING_CONFIRMED,
+    BOOKING_REMINDER,
+    TemplateRegistry,
+)
+from .http_session import create_http_session
+from .notification_digest import NotificationDigest
+from .rate_limiter import RateLimitExceeded, TelegramRateLimiter
+from .reminder_scheduler import reminder_template_values
+from .retry_mechanism import RetryPolicy, with_retry
+from .telegram_api import telegram_bot_id, telegram_send_message_url
+from .telegram_errors import TelegramApiError
 
 logger = logging.getLogger(__name__)
 
+# Ключей в одном MGET: ограничивает размер ответа и время блокировки Redis
+CHAT_ID_MGET_BATCH_SIZE = 1000
+
+# Повторы отправки: в потоке (with_retry) и через очередь Celery (retry_later)
+TELEGRAM_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0)
+
+
+def chat_id_key(user_id: UUID | str) -> str:
+    return f"telegram:chat_id:{user_id}"
+
 
 class TelegramNotifier:
     """
@@ -16,13 +45,13 @@ class TelegramNotifier:
 
     _instance = None
 
-    def __new__(cls, bot_token: str, redis_client):
+    def __new__(cls, bot_token: str, redis_client, pool_size: int | None = None):
         if cls._instance is None:
             cls._instance = super(TelegramNotifier, cls).__new__(cls)
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self, bot_token: str, redis_client):
+    def __init__(self, bot_token: str, redis_client, pool_size: int | None = None):
         if self._initialized:
             return
 
@@ -30,13 +59,46 @@ class TelegramNotifier:
 
         self.bot_token = bot_token
         self.redis_client = redis_client
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        self.base_url = telegram_send_message_url(self.bot_token)
+
+        # Общий пул keep-alive соединений: TCP/TLS-соединение с api.telegram.org
+        # переиспользуется между сообщениями, ретраями и задачами Celery в этом процессе
+        self.session = create_http_session(pool_size or get_settings().TELEGRAM_HTTP_POOL_SIZE)
+
+        # "sync" — отправка в потоке обработчика; "async" — через AsyncTelegramDelivery
+        self.delivery_mode = get_settings().TELEGRAM_DELIVERY_MODE
+        # Перенос неудачных async-отправок публикует задачу в брокер: не в потоке event loop
+        self._reschedule_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="telegram-reschedule")
+        # Повтор неудачной отправки из обработчика: паузой в потоке или задачей с countdown
+        self.blocking_retries = get_settings().NOTIFICATION_BLOCKING_RETRIES
+        # Ожидание слота в лимите без повторов в потоке: дальше — перенос через очередь
+        self.queued_max_wait = get_settings().NOTIFICATION_QUEUED_MAX_WAIT
+
+        # Общие для всех воркеров лимиты Telegram; в режиме async их применяет движок доставки
+        self.rate_limiter = None
+        if get_settings().TELEGRAM_RATE_LIMIT_ENABLED:
+            self.rate_limiter = TelegramRateLimiter(telegram_bot_id(self.bot_token))
+
+        # Несрочные уведомления одному чату за окно дайджеста уходят одним сообщением
+        self.digest = None
+        if get_settings().TELEGRAM_DIGEST_WINDOW > 0:
+            self.digest = NotificationDigest()
+
+        # Шаблоны компилируются один раз при старте
+        self.templates = TemplateRegistry()
+
+        # chat_id «горячих» клиентов берутся из памяти процесса, без запроса к Redis
+        self.chat_id_cache = ChatIdCache()
+        if get_settings().TELEGRAM_CHAT_ID_INVALIDATION_ENABLED:
+            self.chat_id_cache.listen(create_redis_connection())
 
         # Проверка валидности токена (БАЗОВЫЙ МИНИМУМ, ПХХПХП TODO: ДОБАВИТЬ ДОПОЛНИТЕЛЬНЫЕ ПРОВЕРКИ)
         if not bot_token or len(bot_token) < 10:
             logger.warning("⚠️ Telegram бот токен выглядит некорректно")
 
-        self._register_event_handlers()
+        # С диспетчером каналов события обрабатывает он, а Telegram — один из каналов
+        if not get_settings().NOTIFICATION_DISPATCHER_ENABLED:
+            self._register_event_handlers()
         self._initialized = True
         logger.info("✅ TelegramNotifier успешно инициализирован")
 
@@ -49,21 +111,74 @@ class TelegramNotifier:
 
         logger.debug("✅ Обработчики событий зарегистрированы")
 
+    def get_chat_ids(self, user_ids: Iterable[UUID | str]) -> Dict[str, int]:
+        """
+        chat_id нескольких пользователей: сначала кэш процесса, для остальных —
+        один MGET на каждые CHAT_ID_MGET_BATCH_SIZE ключей
+
+        Возвращает {user_id: chat_id} только для пользователей с привязанным Telegram
+        """
+        return self._lookup_chat_ids(user_ids)[0]
+
+    def _lookup_chat_ids(self, user_ids: Iterable[UUID | str]) -> Tuple[Dict[str, int], List[str]]:
+        """(найденные chat_id, пользователи, у которых отсутствие привязки обнаружено сейчас в Redis)"""
+        chat_ids, missing = self.chat_id_cache.get_many(dict.fromkeys(map(str, user_ids)))
+        unlinked: List[str] = []
+
+        for start in range(0, len(missing), CHAT_ID_MGET_BATCH_SIZE):
+            batch = missing[start : start + CHAT_ID_MGET_BATCH_SIZE]
+            # Привязки, изменённые во время MGET, не кэшируются: прочитанное могло устареть
+            generation = self.chat_id_cache.generation()
+            values = self.redis_client.mget([chat_id_key(user_id) for user_id in batch])
+            if values is None:
+                # Redis недоступен: промахи не запоминаются, иначе клиенты «потеряют» Telegram
+                continue
+
+            found = {user_id: int(value) for user_id, value in zip(batch, values) if value}
+            not_found = [user_id for user_id in batch if user_id not in found]
+            self.chat_id_cache.put_many(found, generation)
+            self.chat_id_cache.put_unlinked(not_found, generation)
+            chat_ids.update(found)
+            unlinked.extend(not_found)
+
+        logger.debug(f"🔍 Найдено chat_id: {len(chat_ids)}, запрошено из Redis: {len(missing)}")
+        return chat_ids, unlinked
+
+    def link_chat(self, user_id: UUID | str, chat_id: int) -> None:
+        """
+        Привязка Telegram-чата к пользователю
+
+        Кэши всех процессов узнают о ней сразу, в том числе запомненное «Telegram не привязан»
+        """
+        user_id = str(user_id)
+        self.redis_client.set(chat_id_key(user_id), str(chat_id))
+        self.chat_id_cache.invalidate(user_id)
+        self.redis_client.publish(CHAT_ID_INVALIDATION_CHANNEL, user_id)
+        logger.info(f"🔗 Telegram-чат привязан к пользователю {user_id}")
+
     def _get_cached_chat_id(self, user_id: str) -> int | None:
-        """Получение chat_id из Redis-кэша"""
-        logger.debug(f"🔍 Поиск chat_id для пользователя: {user_id}")
-        cached = self.redis_client.get(f"telegram:chat_id:{user_id}")
+        """
+        chat_id одного пользователя
 
-        if cached:
-            logger.debug(f"✅ Найден кэшированный chat_id: {cached}")
-            return int(cached)
+        Отсутствие привязки логируется, только когда оно обнаружено в Redis: повторные
+        события клиента без Telegram берут ответ из негативного кэша и не шумят в логах
+        """
+        chat_ids, unlinked = self._lookup_chat_ids([user_id])
 
-        logger.warning(f"❌ Chat ID не найден в кэше для пользователя: {user_id}")
-        return None
+        if unlinked:
+            logger.warning(f"❌ Chat ID не найден в кэше для пользователя: {user_id}")
+            # Голый SET не сбрасывает запомненное «Telegram не привязан» в кэшах процессов
+            logger.info(
+                f"💡 Совет: привяжите чат через TelegramNotifier.link_chat или выполните "
+                f'redis-cli SET "{chat_id_key(user_id)}" ваш_chat_id && '
+                f"redis-cli PUBLISH {CHAT_ID_INVALIDATION_CHANNEL} {user_id}"
+            )
+        return chat_ids.get(str(user_id))
 
-    @with_retry(max_attempts=3, base_delay=1.0, max_delay=10.0)
-    def _send_telegram_message(self, chat_id: int, text: str) -> Dict[str, Any]:
-        """Отправка сообщения в Telegram с retry-механизмом"""
+    def _send_telegram_message_once(
+        self, chat_id: int, text: str, max_wait: float | None = None
+    ) -> Dict[str, Any]:
+        """Одна попытка отправки сообщения в Telegram; слот лимита ждётся не дольше max_wait"""
         logger.info(f"📤 Отправка сообщения в Telegram чат {chat_id}")
         logger.debug(f"📝 Текст сообщения: {text}")
 
@@ -74,11 +189,16 @@ class TelegramNotifier:
             "disable_web_page_preview": True,
         }
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(chat_id, max_wait)
+
         try:
             logger.debug(f"📡 Отправка запроса в Telegram API: {payload}")
-            response = requests.post(
+            response = self.session.post(
                 self.base_url, json=payload, timeout=(3.05, 15)  # connect timeout, read timeout
             )
+            if response.status_code == 429:
+                self._pause_lane(response)
             response.raise_for_status()
             result = response.json()
 
@@ -91,6 +211,8 @@ class TelegramNotifier:
                 logger.error(f"❌ Ошибка Telegram API: {error_msg}")
                 raise Exception(f"Telegram API error: {error_msg}")
 
+        except RateLimitExceeded:
+            raise
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Ошибка сети при отправке в Telegram: {str(e)}")
             if hasattr(e, "response") and e.response is not None:
@@ -100,6 +222,182 @@ class TelegramNotifier:
             logger.exception(f"❌ Неожиданная ошибка при отправке сообщения: {str(e)}")
             raise
 
+    # Отправка с повторами в потоке: для вызовов вне задач Celery. Отказ Telegram
+    # (чат не найден, бот заблокирован) пробрасывается сразу; is_retryable объявлен ниже
+    _send_telegram_message = with_retry(
+        **TELEGRAM_RETRY_POLICY._asdict(),
+        no_retry_exceptions=(RateLimitExceeded,),
+        retry_if=lambda error: TelegramNotifier.is_retryable(error),
+    )(_send_telegram_message_once)
+
+    def _pause_lane(self, response: requests.Response) -> None:
+        """
+        429: отправки бота приостанавливаются во всех воркерах на retry_after секунд
+
+        Поток не ждёт паузу: RateLimitExceeded проходит мимо with_retry, и вызывающий код
+        переносит отправку (задача Celery с countdown)
+        """
+        try:
+            parameters = response.json().get("parameters") or {}
+        except ValueError:
+            parameters = {}
+        retry_after = float(parameters.get("retry_after", 1))
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.pause(retry_after)
+        raise RateLimitExceeded(retry_after)
+
+    def send_message(self, chat_id: int, text: str, blocking_retries: bool = True) -> Dict[str, Any]:
+        """
+        Отправка с ожиданием ответа
+
+        RateLimitExceeded означает, что отправку нужно повторить через retry_after.
+        blocking_retries=False — одна попытка, а слот лимита ждётся не дольше
+        NOTIFICATION_QUEUED_MAX_WAIT: задача Celery повторяет и откладывает отправку
+        через очередь (retry_later, countdown) и не держит слот воркера на время паузы
+        """
+        if self.delivery_mode == "async":
+            if blocking_retries:
+                return get_async_delivery().send(chat_id, text)
+            return get_async_delivery().send(chat_id, text, max_attempts=1, max_wait=self.queued_max_wait)
+        if blocking_retries:
+            return self._send_telegram_message(chat_id, text)
+        return self._send_telegram_message_once(chat_id, text, self.queued_max_wait)
+
+    def _deliver(self, chat_id: int, text: str, description: str, notification_type: str) -> None:
+        """
+        Уведомление из обработчика события: в дайджест чата или, для срочных типов
+        и без дайджеста, отправка сразу
+        """
+        if self.digest is not None and not self.digest.is_urgent(notification_type):
+            if self.add_to_digest(chat_id, text):
+                return
+        self._send_now(chat_id, text, description)
+
+    def add_to_digest(self, chat_id: int, text: str) -> bool:
+        """
+        Добавление уведомления в дайджест чата (и планирование его сброса)
+
+        False — дайджест отключён или недоступен, уведомление нужно отправить сразу
+        """
+        if self.digest is None:
+            return False
+        entry = self.digest.add(chat_id, text)
+        if entry is None:
+            return False
+
+        if entry.schedule_flush:
+            self._schedule_digest_flush(chat_id, self.digest.window_seconds)
+        elif entry.size == self.digest.max_messages:
+            self._schedule_digest_flush(chat_id, 0)
+        logger.debug(f"🗂️ Уведомление добавлено в дайджест чата {chat_id} ({entry.size})")
+        return True
+
+    def _schedule_digest_flush(self, chat_id: int, countdown: float) -> None:
+        # Модуль задач сам импортирует TelegramNotifier
+        from ..celery.celery_app import get_celery_app
+        from ..celery.tasks.notifications_tasks import flush_telegram_digest
+
+        try:
+            get_celery_app()
+            flush_telegram_digest.apply_async((chat_id,), countdown=countdown)
+        except Exception as e:
+            logger.error(f"❌ Не удалось запланировать дайджест чата {chat_id}, отправка сразу: {str(e)}")
+            # Синхронный вызов задачи: сброс идёт тем же путём (через диспетчер, если он включён)
+            flush_telegram_digest(chat_id)
+
+    def drain_digest(self, chat_id: int) -> Tuple[List[str], int]:
+        """(сообщения дайджеста чата, сколько уведомлений в них собрано); дайджест очищается"""
+        # Дайджест мог быть отключён после планирования сброса: накопленное всё равно отправляется
+        digest = self.digest or NotificationDigest()
+        texts = digest.drain(chat_id)
+        if not texts:
+            return [], 0
+        return digest.combine(texts), len(texts)
+
+    def flush_digest(self, chat_id: int) -> None:
+        """Отправка накопленных уведомлений чата (задача Celery по окончании окна)"""
+        messages, count = self.drain_digest(chat_id)
+        for message in messages:
+            self._send_now(chat_id, message, f"дайджест ({count}) в чат {chat_id}")
+
+    def _send_now(self, chat_id: int, text: str, description: str) -> None:
+        """
+        Отправка уведомления; ошибки только логируются
+
+        В режиме async обработчик не ждёт ответа Telegram: EventBus и задача Celery
+        освобождаются сразу, а результат логируется по завершении отправки
+        """
+        if self.delivery_mode == "async":
+            future = get_async_delivery().submit(chat_id, text)
+            future.add_done_callback(lambda done: self._on_async_delivered(done, chat_id, text, description))
+            return
+
+        try:
+            self.send_message(chat_id, text, self.blocking_retries)
+        except Exception as e:
+            self._on_delivered(e, chat_id, text, description, retry_in_queue=not self.blocking_retries)
+        else:
+            self._on_delivered(None, chat_id, text, description)
+
+    def _on_async_delivered(self, future: Future, chat_id: int, text: str, description: str) -> None:
+        """
+        Колбэк async-отправки; выполняется в потоке event loop доставки
+
+        Перенос отправки — публикация в брокер с его повторами при сбоях — уходит в отдельный
+        поток, чтобы медленный брокер не останавливал остальные отправки в event loop
+        """
+        error = future.exception()
+        if error is None:
+            self._on_delivered(None, chat_id, text, description)
+        else:
+            self._reschedule_executor.submit(self._on_delivered, error, chat_id, text, description)
+
+    def _on_delivered(
+        self,
+        error: BaseException | None,
+        chat_id: int,
+        text: str,
+        description: str,
+        retry_in_queue: bool = False,
+    ) -> None:
+        if error is None:
+            logger.info(f"✅ Уведомление {description} отправлено")
+        elif isinstance(error, RateLimitExceeded):
+            self._reschedule(chat_id, text, error.countdown, description)
+        elif retry_in_queue and self.is_retryable(error):
+            # Повтор — задачей send_telegram_message: поток обработчика не ждёт паузу
+            self._reschedule(chat_id, text, math.ceil(TELEGRAM_RETRY_POLICY.delay(1)), description)
+        else:
+            logger.error(f"❌ Не удалось отправить уведомление {description}: {str(error)}")
+
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """
+        Имеет ли смысл повторять отправку после ошибки
+
+        Чат не найден (400), бот заблокирован (403): повтор результата не изменит
+        """
+        if isinstance(error, TelegramApiError):
+            return error.retryable
+        if isinstance(error, requests.HTTPError) and error.response is not None:
+            return error.response.status_code == 429 or error.response.status_code >= 500
+        return True
+
+    @staticmethod
+    def _reschedule(chat_id: int, text: str, countdown: int, description: str) -> None:
+        """Перенос отправки в задачу Celery с countdown: обработчик события не ждёт паузу"""
+        # Модуль задач сам импортирует TelegramNotifier
+        from ..celery.celery_app import get_celery_app
+        from ..celery.tasks.notifications_tasks import send_telegram_message
+
+        try:
+            get_celery_app()
+            send_telegram_message.apply_async((chat_id, text), countdown=countdown)
+            logger.info(f"⏳ Уведомление {description} отложено на {countdown}с")
+        except Exception as e:
+            logger.error(f"❌ Не удалось отложить уведомление {description}: {str(e)}")
+
     def _handle_booking_confirmed(self, event: BookingConfirmedEvent) -> None:
         """Обработка события подтверждения бронирования"""
         logger.info(f"🔔 Получено событие подтверждения бронирования: {event.booking_id}")
@@ -108,29 +406,40 @@ class TelegramNotifier:
         chat_id = self._get_cached_chat_id(str(event.client_id))
 
         if not chat_id:
-            logger.error(
-                f"❌ Не удалось отправить уведомление: chat_id не найден для клиента {event.client_id}"
-            )
-            logger.info(
-                '💡 Совет: Добавьте chat_id в Redis: redis-cli SET "telegram:chat_id:{client_id}" ваш_chat_id'
-            )
+            logger.debug(f"Уведомление о подтверждении пропущено: у клиента {event.client_id} нет chat_id")
             return
 
-        message = (
-            f"✅ <b>Бронирование подтверждено!</b>\n\n"
-            f"🆔 Бронь: {event.booking_id}\n"
-            f"🎵 Студия: {event.studio_id}\n"
-            f"📅 Дата: {event.time_range_start.strftime('%d.%m.%Y')}\n"
-            f"⏰ Время: {event.time_range_start.strftime('%H:%M')} - "
-            f"{event.time_range_end.strftime('%H:%M')}\n\n"
-            f"Для управления бронированием используйте команду /bookings"
+        message = self.templates.render(
+            BOOKING_CONFIRMED,
+            {
+                "booking_id": event.booking_id,
+                "studio_id": event.studio_id,
+                "start": event.time_range_start,
+                "end": event.time_range_end,
+            },
+            studio_id=event.studio_id,
         )
 
-        try:
-            self._send_telegram_message(chat_id, message)
-            logger.info(f"✅ Уведомление о подтверждении отправлено клиенту {event.client_id}")
-        except Exception as e:
-            logger.error(f"❌ Не удалось отправить уведомление: {str(e)}")
+        self._deliver(chat_id, message, f"о подтверждении клиенту {event.client_id}", BOOKING_CONFIRMED)
+
+    def send_booking_reminder(self, reminder: Dict[str, Any], blocking_retries: bool = True) -> None:
+        """
+        Напоминание о предстоящем бронировании (данные из ReminderScheduler)
+
+        Ошибка отправки пробрасывается: повтор выполняет вызывающая задача Celery
+        """
+        chat_id = self._get_cached_chat_id(reminder["client_id"])
+
+        if not chat_id:
+            logger.debug(f"Напоминание пропущено: у клиента {reminder['client_id']} нет chat_id")
+            return
+
+        message = self.templates.render(
+            BOOKING_REMINDER, reminder_template_values(reminder), studio_id=reminder["studio_id"]
+        )
+
+        self.send_message(chat_id, message, blocking_retries)
+        logger.info(f"✅ Напоминание о брони {reminder['booking_id']} отправлено клиенту")
 
     def _handle_booking_cancelled(self, event: BookingCancelledEvent) -> None:
         """Обработка события отмены бронирования"""
@@ -139,20 +448,13 @@ class TelegramNotifier:
         chat_id = self._get_cached_chat_id(str(event.client_id))
 
         if not chat_id:
-            logger.error(
-                f"❌ Не удалось отправить уведомление об отмене: chat_id не найден для клиента {event.client_id}"
-            )
+            logger.debug(f"Уведомление об отмене пропущено: у клиента {event.client_id} нет chat_id")
             return
 
-        message = (
-            f"❌ <b>Бронирование отменено</b>\n\n"
-            f"🆔 Бронь: {event.booking_id}\n"
-            f"❗ Причина: {event.reason}\n\n"
-            f"Для повторного бронирования используйте /book_new"
+        message = self.templates.render(
+            BOOKING_CANCELLED,
+            {"booking_id": event.booking_id, "studio_id": event.studio_id, "reason": event.reason},
+            studio_id=event.studio_id,
         )
 
-        try:
-            self._send_telegram_message(chat_id, message)
-            logger.info(f"✅ Уведомление об отмене отправлено клиенту {event.client_id}")
-        except Exception as e:
-            logger.error(f"❌ Не удалось отправить уведомление об отмене: {str(e)}")
+        self._deliver(chat_id, message, f"об отмене клиенту {event.client_id}", BOOKING_CANCELLED)
@@ -1,13 +1,49 @@
 import redis
+import redis.asyncio
 from redis.exceptions import ConnectionError, TimeoutError
 import logging
 import time
+from typing import List
 
-from ..config.settings import settings
+from .config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 
+def create_redis_connection(decode_responses: bool = True) -> redis.Redis:
+    """
+    Создание подключения к Redis по настройкам приложения
+
+    decode_responses=False нужен для бинарных данных (например, потоков событий)
+    """
+    settings = get_settings()
+    return redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+        socket_timeout=2,
+        socket_connect_timeout=2,
+        retry_on_timeout=True,
+        decode_responses=decode_responses,
+    )
+
+
+def create_async_redis_connection(decode_responses: bool = True) -> redis.asyncio.Redis:
+    """Подключение redis.asyncio с теми же настройками (для кода в event loop)"""
+    settings = get_settings()
+    return redis.asyncio.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD,
+        socket_timeout=2,
+        socket_connect_timeout=2,
+        retry_on_timeout=True,
+        decode_responses=decode_responses,
+    )
+
+
 class RedisClient:
     """
     Redis-клиент с повторными попытками подключения
@@ -25,6 +61,7 @@ class RedisClient:
         if self._initialized:
             return
 
+        settings = get_settings()
         max_retries = 3
         retry_delay = 2
 
@@ -35,16 +72,7 @@ class RedisClient:
                     f"Параметры подключения: host={settings.REDIS_HOST}, port={settings.REDIS_PORT}, db={settings.REDIS_DB}"
                 )
 
-                self.client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD,
-                    socket_timeout=2,
-                    socket_connect_timeout=2,
-                    retry_on_timeout=True,
-                    decode_responses=True,
-                )
+                self.client = create_redis_connection()
 
                 # Проверка соединения
                 self.client.ping()
@@ -81,6 +109,34 @@ class RedisClient:
             logger.exception(f"❌ Неожиданная ошибка в GET операции: {str(e)}")
             return None
 
+    def mget(self, keys: List[str]) -> List[str | None] | None:
+        """
+        Значения нескольких ключей за один запрос
+
+        None (а не список из None) — Redis недоступен: «ключа нет» и «не удалось
+        проверить» вызывающий код должен различать, например, для негативного кэша
+        """
+        try:
+            logger.debug(f"🔍 MGET из Redis: {len(keys)} ключей")
+            return self.client.mget(keys)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"❌ Ошибка при MGET операции: {str(e)}")
+            return None
+        except Exception as e:
+            logger.exception(f"❌ Неожиданная ошибка в MGET операции: {str(e)}")
+            return None
+
+    def set(self, key: str, value: str) -> bool:
+        try:
+            logger.debug(f"💾 SET в Redis: {key} = {value}")
+            return bool(self.client.set(key, value))
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"❌ Ошибка при SET операции: {str(e)}")
+            return False
+        except Exception as e:
+            logger.exception(f"❌ Неожиданная ошибка в SET операции: {str(e)}")
+            return False
+
     def setex(self, key: str, seconds: int, value: str) -> bool:
         try:
             logger.debug(f"💾 SETEX в Redis: {key} = {value} (TTL: {seconds} сек)")
@@ -93,3 +149,43 @@ class RedisClient:
         except Exception as e:
             logger.exception(f"❌ Неожиданная ошибка в SETEX операции: {str(e)}")
             return False
+
+    def set_nx(self, key: str, value: str, seconds: int) -> bool | None:
+        """
+        SET NX с TTL: True — ключ установлен, False — ключ уже существовал,
+        None — Redis недоступен (решение остаётся за вызывающим кодом)
+        """
+        try:
+            logger.debug(f"💾 SET NX в Redis: {key} = {value} (TTL: {seconds} сек)")
+            result = self.client.set(key, value, nx=True, ex=seconds)
+            logger.debug(f"✅ SET NX результат: {result}")
+            return bool(result)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"❌ Ошибка при SET NX операции: {str(e)}")
+            return None
+        except Exception as e:
+            logger.exception(f"❌ Неожиданная ошибка в SET NX операции: {str(e)}")
+            return None
+
+    def delete(self, *keys: str) -> int:
+        try:
+            logger.debug(f"🗑️ DEL в Redis: {keys}")
+            return self.client.delete(*keys)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"❌ Ошибка при DEL операции: {str(e)}")
+            return 0
+        except Exception as e:
+            logger.exception(f"❌ Неожиданная ошибка в DEL операции: {str(e)}")
+            return 0
+
+    def publish(self, channel: str, message: str) -> int:
+        """Публикация в pub/sub-канал; возвращает число получателей (0 при ошибке)"""
+        try:
+            logger.debug(f"📢 PUBLISH в Redis: {channel} = {message}")
+            return self.client.publish(channel, message)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"❌ Ошибка при PUBLISH операции: {str(e)}")
+            return 0
+        except Exception as e:
+            logger.exception(f"❌ Неожиданная ошибка в PUBLISH операции: {str(e)}")
+            return 0
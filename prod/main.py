@@ -1,5 +1,5 @@
 import logging
-from .config.settings import settings
+from .infrastructure.config.settings import get_settings
 
 from uuid import uuid4, UUID
 from datetime import datetime, timezone
@@ -7,11 +7,11 @@ from .domain.bookings.booking import Booking
 from .domain.bookings.value_objects.booking_time_range_vo import BookingTimeRange
 from .domain.bookings.booking_enums import BookingServicesTypesEnum
 from .infrastructure.redis_client import RedisClient
-from .infrastructure.notifications.telegram_notifier import TelegramNotifier
+from .infrastructure.notifications.event_handlers import register_notification_handlers
 
 # Настройка логирования
 logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
+    level=getattr(logging, get_settings().LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     datefmt="%Y-%m-%d %H:%M:%S",
 )
@@ -22,15 +22,14 @@ def init_notification_system():
     """Инициализация системы уведомлений при старте приложения"""
     try:
         logger.info("🚀 Инициализация системы уведомлений...")
-        logger.debug(f"TELEGRAM_BOT_TOKEN начинается с: {settings.TELEGRAM_BOT_TOKEN[:5]}...")
+        logger.debug(f"TELEGRAM_BOT_TOKEN начинается с: {get_settings().TELEGRAM_BOT_TOKEN[:5]}...")
 
         # Инициализация Redis
         redis_client = RedisClient()
         logger.info("✅ Redis клиент инициализирован")
 
-        # Инициализация Telegram Notifier
-        notifier = TelegramNotifier(settings.TELEGRAM_BOT_TOKEN, redis_client)
-        logger.info("✅ Telegram Notifier инициализирован")
+        # Telegram Notifier, диспетчер каналов и планировщик напоминаний в EventBus
+        notifier = register_notification_handlers()
 
         logger.info("✅ Система уведомлений успешно инициализирована")
         logger.info("🔧 Система запущена и ожидает событий...")